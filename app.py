@@ -1,225 +1,365 @@
 import streamlit as st
-import pandas as pd
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-import requests
-import json
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from datetime import datetime
 import time
+# gspread, oauth2client e requests são importados só quando usados (ver connect_google / infra/configuracao.py / infra/premios.py)
 
 # --- 1. CONFIGURAÇÃO DA PÁGINA (Deve ser a primeira linha) ---
 st.set_page_config(page_title="Oráculo Master Pro", page_icon="🔮", layout="wide")
 
 # --- 2. IMPORTS DOS MÓDULOS ---
 try:
-    # Motores Matemáticos (Back-end)
-    from motores.base import MotorBase
-    from motores.mega_sena import MotorMegaSena
-    from motores.lotofacil import MotorLotofacil
-    
-    # Importação Segura dos Novos Motores (Evita crash se arquivo não existir)
-    try: from motores.quina import MotorQuina
-    except ImportError: MotorQuina = None
-    try: from motores.dia_de_sorte import MotorDiaDeSorte
-    except ImportError: MotorDiaDeSorte = None
-    try: from motores.dupla_sena import MotorDuplaSena
-    except ImportError: MotorDuplaSena = None
+    # Motores Matemáticos (Back-end): o registro importa cada motor na primeira vez que é usado
+    from motores.registro import classe_motor, obter_motor
+    from motores.matriz import parse_jogos_texto
     
     # Interface Visual (Front-end)
-    from interface.dashboard_cards import CSS_ESTILO, gerar_html_card, gerar_ticket_visual
+    from interface.dashboard_cards import (CSS_ESTILO, gerar_html_card, gerar_html_card_degradado, gerar_html_idade,
+                                           gerar_ticket_visual)
+    
+    # Persistência (Sheets ou SQLite local) e serviços de dados
+    from infra.armazenamento import MODOS_EXCLUSAO, ArmazenamentoSheets, ArmazenamentoSQLite
+    from infra.carregador import carregar_cards
+    from infra.conferencia import conferir
+    from infra.configuracao import CarregadorConfig
+    from infra.fila_gravacao import FilaGravacao
+    from infra.premios import ClientePremios
+    from infra.snapshots import MAX_IDADE as MAX_IDADE_SNAPSHOT, PASTA_PADRAO as PASTA_SNAPSHOTS, LeitorSnapshots
+    from infra import rastreio
 
 except ImportError as e:
     st.error(f"❌ Erro Crítico de Importação: {e}")
     st.stop()
 
+# --- RASTREIO DESTA EXECUÇÃO (fases, chamadas e bytes; ver infra/rastreio.py) ---
+def config_rastreio():
+    """[rastreio] nos secrets: log = true (ou um caminho) grava cada execução em JSON-lines."""
+    try: return dict(st.secrets.get("rastreio", {}))
+    except: return {}
+
+RASTREIO = rastreio.Rastreio(rotulo=getattr(get_script_run_ctx(), "session_id", ""))
+rastreio.ativar(RASTREIO)
+
 # --- 3. INFRAESTRUTURA ---
 
 def get_config_url():
     try: return st.secrets["setup"]["url_config_json"]
-    except: st.error("⚠️ Configuração 'url_config_json' não encontrada nos secrets."); st.stop()
+    except: return None  # sem URL: só o config_loterias.json do repositório
+
+@st.cache_resource
+def carregador_config():
+    """Um carregador por processo: responde com a config em disco e atualiza a remota em segundo plano."""
+    return CarregadorConfig(get_config_url())
 
-@st.cache_data(ttl=600)
+@rastreio.rastreado("load_config")
 def load_config():
-    try:
-        response = requests.get(get_config_url())
-        if response.status_code == 200: return json.loads(response.text)
-        return None
+    """Config validada (ConfigApp) sem esperar a rede; ver infra/configuracao.py"""
+    try: return carregador_config().atual()
     except: return None
 
 CONFIG_GLOBAL = load_config()
-if not CONFIG_GLOBAL: st.stop()
+if not CONFIG_GLOBAL:
+    st.error(f"⚠️ Configuração das loterias indisponível: {carregador_config().ultimo_erro}")
+    st.stop()
 
+@rastreio.rastreado("connect_google")
 @st.cache_resource
 def connect_google():
     try:
+        import gspread
+        from oauth2client.service_account import ServiceAccountCredentials
         scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
         creds = ServiceAccountCredentials.from_json_keyfile_dict(dict(st.secrets["gcp_service_account"]), scope)
-        return gspread.authorize(creds).open_by_key(CONFIG_GLOBAL["spreadsheet_id"])
+        return gspread.authorize(creds).open_by_key(CONFIG_GLOBAL.spreadsheet_id)
     except Exception as e:
         st.error(f"Erro Google Sheets: {e}")
         return None
 
-# --- NOVO: BUSCADOR DE API PÚBLICA ---
-@st.cache_data(ttl=3600)
-def buscar_premio_api(nome_loteria):
-    """Busca o valor atualizado na API Pública (se configurada)"""
+@st.cache_resource
+def conectar_armazenamento():
+    """Backend de dados: [armazenamento] tipo = "sqlite" nos secrets usa o arquivo local, senão Sheets."""
+    try: cfg_arm = dict(st.secrets.get("armazenamento", {}))
+    except: cfg_arm = {}
+    if cfg_arm.get("tipo") == "sqlite":
+        return ArmazenamentoSQLite(cfg_arm.get("caminho"))
+    conn = connect_google()
+    return ArmazenamentoSheets(conn) if conn else None
+
+@st.cache_resource
+def fila_de_gravacao(_armazem):
+    """Uma fila (e uma thread de envio) por processo, compartilhada entre as sessões."""
+    return FilaGravacao(_armazem)
+
+# --- BUSCADOR DE API PÚBLICA (sessão keep-alive + stale-while-revalidate, ver infra/premios.py) ---
+@st.cache_resource
+def cliente_premios():
+    """Um cliente por processo; None se a API não estiver configurada nos secrets."""
     try:
         if "api" not in st.secrets: return None
-        url_base = st.secrets["api"]["url_base"]
-        
-        slugs = {
-            "Mega Sena": "megasena", "Lotofácil": "lotofacil", "Quina": "quina",
-            "Lotomania": "lotomania", "Timemania": "timemania", 
-            "Dupla Sena": "duplasena", "Dia de Sorte": "diadesorte"
-        }
-        slug = slugs.get(nome_loteria)
-        if not slug: return None
-        
-        resp = requests.get(f"{url_base}/{slug}", timeout=4)
-        if resp.status_code == 200:
-            d = resp.json()
-            # Tenta pegar estimativa ou acumulado
-            val = d.get("valorEstimadoProximoConcurso", 0)
-            if val == 0: val = d.get("valorAcumuladoProximoConcurso", 0)
-            return val
-    except: pass
-    return None
-
-# --- 4. FACTORY & CRUD ---
-
-def obter_motor(nome, df, cfg):
-    n = nome.lower()
-    if "mega" in n: return MotorMegaSena(df, cfg)
-    elif "facil" in n or "fácil" in n: return MotorLotofacil(df, cfg)
-    elif "quina" in n and MotorQuina: return MotorQuina(df, cfg)
-    elif "dia" in n and "sorte" in n and MotorDiaDeSorte: return MotorDiaDeSorte(df, cfg)
-    elif "dupla" in n and MotorDuplaSena: return MotorDuplaSena(df, cfg)
-    else: return MotorBase(df, cfg)
-
-def get_data(conn, tab):
-    try:
-        ws = conn.worksheet(tab)
-        data = ws.get_all_values()
-        if len(data) < 2: return None
-        return pd.DataFrame(data[1:], columns=data[0])
+        return ClientePremios(st.secrets["api"]["url_base"])
     except: return None
 
-def save_row(conn, tab, row):
+# --- SNAPSHOTS PRÉ-CALCULADOS (publicados por ferramentas/precomputar.py, ver infra/snapshots.py) ---
+@st.cache_resource
+def leitor_snapshots():
+    """Um leitor por processo: cada sessão só faz um stat por loteria para saber se há versão nova."""
+    try: pasta = st.secrets.get("snapshots", {}).get("pasta", PASTA_SNAPSHOTS)
+    except: pasta = PASTA_SNAPSHOTS
+    return LeitorSnapshots(pasta)
+
+def max_idade_snapshot():
+    """[snapshots] max_idade (segundos) nos secrets: snapshot sem conferência há mais que isso é ignorado."""
+    try: return float(st.secrets.get("snapshots", {}).get("max_idade", MAX_IDADE_SNAPSHOT))
+    except: return MAX_IDADE_SNAPSHOT
+
+@st.cache_resource(max_entries=64)
+def card_de_snapshot(nome, versao, premio, _snap, _cfg):
+    """Card de um snapshot com o prêmio ao vivo; um cálculo por (versão, prêmio), compartilhado entre sessões."""
+    return gerar_html_card(nome, _snap.motor(classe_motor(nome, _cfg), _cfg), premio)
+
+@rastreio.rastreado("buscar_premio_api")
+def buscar_premio_api(nome_loteria, esperar=True):
+    """Busca o valor atualizado na API Pública (se configurada); vencido, volta o último e renova em segundo plano"""
     try:
-        try: ws = conn.worksheet(tab)
-        except: ws = conn.add_worksheet(title=tab, rows=1000, cols=10); ws.append_row(["Data", "Concurso Alvo", "Dezenas", "Estratégia", "Acertos", "Status"])
-        ws.append_row(row)
-        return True, "✅ Sucesso!"
-    except Exception as e: return False, str(e)
+        cliente = cliente_premios()
+        return cliente.obter(nome_loteria, esperar=esperar) if cliente else None
+    except: return None
+
+# --- 4. CRUD (a factory obter_motor fica em motores/registro.py) ---
+
+METODOS_RASTREADOS = ("get_stats", "analisar_sinal", "gerar_palpite", "gerar_lote")
+
+def montar_motor(nome, df, cfg, snap=None):
+    """obter_motor (ou o motor do snapshot, direto da matriz) com construção e métodos no rastreio."""
+    if snap is not None:
+        with rastreio.span("motor_snapshot", loteria=nome, versao=snap.versao):
+            motor = snap.motor(classe_motor(nome, cfg), cfg)
+    else:
+        with rastreio.span("obter_motor", loteria=nome):
+            motor = obter_motor(nome, df, cfg)
+    return rastreio.instrumentar(motor, METODOS_RASTREADOS, "motor")
 
-def delete_rows(conn, tab, mode, val):
+@rastreio.rastreado("get_data", medir=True)
+def get_data(armazem, tab):
+    try: return armazem.ler(tab)
+    except: return None
+
+@rastreio.rastreado("get_historico", medir=True)
+def get_historico(armazem, tab):
+    """Histórico da loteria (no Sheets, via cache local com sincronização incremental)."""
+    try: return armazem.ler_historico(tab)
+    except: return None
+
+def delete_rows(armazem, tab, mode, val):
     try:
-        ws = conn.worksheet(tab)
-        data = ws.get_all_values()
-        if len(data) < 2: return False, "Vazio"
-        header, rows = data[0], data[1:]
-        df = pd.DataFrame(rows, columns=header)
-        orig = len(df)
-        if mode == "Limpar Tudo": df = df.iloc[0:0]
-        elif mode == "Últimos N": df = df.iloc[:-int(val)]
-        elif mode == "Por Concurso": df = df[df['Concurso Alvo'] != str(val)]
-        ws.clear(); ws.append_row(header)
-        if not df.empty: ws.update('A2', df.values.tolist())
-        return True, f"{orig - len(df)} apagados."
+        n = armazem.apagar(tab, mode, val)
+        return True, f"{n} apagados."
     except Exception as e: return False, str(e)
 
+def conferir_palpites(armazem, tab, motor):
+    try: return conferir(armazem, tab, motor)
+    except Exception as e: return False, str(e), {}
+
 # --- 5. INTERFACE PRINCIPAL ---
 
-conn = connect_google()
-if not conn: st.stop()
+# cProfile só na execução seguinte ao clique em "Perfilar" (ver fim do script); config e conexões acima são cache_resource
+PERFIL = rastreio.Perfil().iniciar() if st.session_state.pop('perfilar', False) else None
 
-st.markdown(CSS_ESTILO, unsafe_allow_html=True)
+def encerrar_execucao():
+    """Fecha o rastreio, desliga o cProfile e grava o log desta execução; devolve o relatório do perfil."""
+    RASTREIO.finalizar()
+    relatorio = PERFIL.parar() if PERFIL else None
+    cfg_rastreio = config_rastreio()
+    if cfg_rastreio.get("log"):
+        destino = cfg_rastreio["log"] if isinstance(cfg_rastreio["log"], str) else None
+        try: RASTREIO.gravar_jsonl(destino)
+        except: pass
+    return relatorio
+
+try:
+    armazem = conectar_armazenamento()
+    if not armazem: st.stop()
+    fila = fila_de_gravacao(armazem)
+
+    st.markdown(CSS_ESTILO, unsafe_allow_html=True)
+
+    # SIDEBAR STATUS
+    with st.sidebar:
+        st.header("🔌 Conectividade")
+        st.markdown(f"<div style='padding:10px; border-radius:8px; background:#dcfce7; border:1px solid #86efac; color:#166534; margin-bottom:10px'><b>🐙 GitHub:</b> ONLINE ✅</div>", unsafe_allow_html=True)
+        status_go = "CONECTADO ✅" if armazem else "ERRO ❌"
+        color_go = "#dbeafe" if armazem else "#fee2e2"
+        st.markdown(f"<div style='padding:10px; border-radius:8px; background:{color_go}; border:1px solid #93c5fd; color:#1e40af;'><b>📊 {armazem.nome}:</b> {status_go}</div>", unsafe_allow_html=True)
+        resumo_fila = fila.resumo()
+        if resumo_fila["erro"]: st.caption(f"💾 Fila: {resumo_fila['pendentes']} pendentes ⚠️ {resumo_fila['erro']}")
+        else: st.caption(f"💾 Fila: {resumo_fila['pendentes']} pendentes • {resumo_fila['gravados']} gravados")
+        cont = getattr(armazem, "contadores", None)
+        if cont: st.caption(f"📖 Planilha: {cont['leituras']} leituras • {cont['sondas']} sondas • {cont['cache']} do cache")
+        meus = st.session_state.get('salvos', [])
+        if meus:
+            st_meus = fila.status(meus)
+            gravados = sum(1 for i in meus if st_meus.get(i) == "gravado")
+            st.caption(f"Seus palpites: {gravados}/{len(meus)} na nuvem")
+        st.markdown("---")
+        st.caption(f"Atualizado: {datetime.now().strftime('%H:%M')}")
+
+    # DASHBOARD
+    st.title("📊 Painel de Controle Oráculo")
+
+    COLS_PER_ROW = 3
+    items = list(CONFIG_GLOBAL.loterias.items())
+    leitor = leitor_snapshots()
+    # Snapshot velho demais (precomputar parado) é ignorado: a loteria volta ao caminho ao vivo
+    snaps = {nome: leitor.atual(nome, max_idade_snapshot()) for nome, _ in items}
+
+    # 1. Monta a grade com um espaço reservado por card
+    slots = {}
+    for i in range(0, len(items), COLS_PER_ROW):
+        cols = st.columns(COLS_PER_ROW)
+        for j in range(COLS_PER_ROW):
+            if i + j < len(items):
+                nome_lot = items[i + j][0]
+                slots[nome_lot] = cols[j].empty()
+                snap = snaps[nome_lot]
+                if snap is not None and snap.html:
+                    # Card pronto do snapshot; o prêmio vem ao vivo (sem esperar: sem valor em cache, fica o do snapshot)
+                    premio = buscar_premio_api(nome_lot, esperar=False)
+                    html = snap.html
+                    if premio is not None and premio != snap.premio:
+                        html = card_de_snapshot(nome_lot, snap.versao, premio, snap, items[i + j][1])
+                    html += gerar_html_idade(snap.idade())
+                else: html = gerar_html_card_degradado(nome_lot)  # o placeholder espera o cálculo abaixo
+                slots[nome_lot].markdown(html, unsafe_allow_html=True)
+
+    # 2. Planilha + API de todas as loterias ao mesmo tempo; cada card aparece quando o seu histórico
+    #    chega (com o prêmio da planilha) e é redesenhado se o valor da API chegar depois
+    _ctx = get_script_run_ctx()
+
+    pendentes = [(nome, cfg) for nome, cfg in items if snaps[nome] is None or not snaps[nome].html]
+    motores_cards = {}
+    for card in carregar_cards(pendentes,
+                               lambda cfg: get_historico(armazem, cfg.aba_historico),
+                               buscar_premio_api,
+                               inicializador=lambda: (add_script_run_ctx(ctx=_ctx), rastreio.ativar(RASTREIO))):
+        if card.ok:
+            if card.nome not in motores_cards: motores_cards[card.nome] = montar_motor(card.nome, card.df, card.cfg)
+            # Gera Card com valor da API se já chegou (senão o da planilha)
+            with rastreio.span("gerar_html_card", loteria=card.nome):
+                html = gerar_html_card(card.nome, motores_cards[card.nome], card.premio)
+        else:
+            html = gerar_html_card_degradado(card.nome, f"⚠️ {card.erro or 'Sincronizando...'}")
+        slots[card.nome].markdown(html, unsafe_allow_html=True)
 
-# SIDEBAR STATUS
-with st.sidebar:
-    st.header("🔌 Conectividade")
-    st.markdown(f"<div style='padding:10px; border-radius:8px; background:#dcfce7; border:1px solid #86efac; color:#166534; margin-bottom:10px'><b>🐙 GitHub:</b> ONLINE ✅</div>", unsafe_allow_html=True)
-    status_go = "CONECTADO ✅" if conn else "ERRO ❌"
-    color_go = "#dbeafe" if conn else "#fee2e2"
-    st.markdown(f"<div style='padding:10px; border-radius:8px; background:{color_go}; border:1px solid #93c5fd; color:#1e40af;'><b>📊 Google Sheets:</b> {status_go}</div>", unsafe_allow_html=True)
     st.markdown("---")
-    st.caption(f"Atualizado: {datetime.now().strftime('%H:%M')}")
-
-# DASHBOARD
-st.title("📊 Painel de Controle Oráculo")
-
-COLS_PER_ROW = 3
-items = list(CONFIG_GLOBAL["loterias"].items())
-
-for i in range(0, len(items), COLS_PER_ROW):
-    cols = st.columns(COLS_PER_ROW)
-    for j in range(COLS_PER_ROW):
-        if i + j < len(items):
-            nome_lot, cfg = items[i + j]
-            with cols[j]:
-                # 1. Busca Planilha
-                df_card = get_data(conn, cfg['aba_historico'])
-                # 2. Busca API (Opcional)
-                valor_api = buscar_premio_api(nome_lot)
-                
-                if df_card is not None and not df_card.empty:
-                    motor_temp = obter_motor(nome_lot, df_card, cfg)
-                    # Gera Card com valor da API se existir
-                    html = gerar_html_card(nome_lot, motor_temp, valor_api)
-                    st.markdown(html, unsafe_allow_html=True)
-                else:
-                    st.warning(f"{nome_lot}: Sincronizando...")
-
-st.markdown("---")
-
-# ÁREA DE OPERAÇÃO
-st.subheader("🛠️ Central de Operações")
-escolha = st.selectbox("Selecione a Loteria:", list(CONFIG_GLOBAL["loterias"].keys()))
-cfg_atual = CONFIG_GLOBAL["loterias"][escolha]
-df_main = get_data(conn, cfg_atual['aba_historico'])
-
-if df_main is not None and not df_main.empty:
-    MotorAtivo = obter_motor(escolha, df_main, cfg_atual)
-    tab1, tab2 = st.tabs(["🎲 Gerador", "📂 Gestão"])
-    
-    with tab1:
-        c1, c2 = st.columns(2)
-        with c1:
-            st.markdown(f"**Análise: {escolha}**")
-            stats = MotorAtivo.get_stats()
-            if stats['quentes']: st.caption(f"🔥 Quentes: {', '.join(map(str, stats['quentes'][:6]))}")
-            strat = st.radio("Estratégia:", ["Equilíbrio", "Tendência", "Mestre"])
-            if st.button("🔮 Gerar Palpite", type="primary"):
-                st.session_state['jogo'] = MotorAtivo.gerar_palpite(strat)
-        with c2:
-            st.markdown("**Palpite Gerado:**")
-            if 'jogo' in st.session_state:
-                nums = st.session_state['jogo']
-                st.markdown(gerar_ticket_visual(escolha, nums), unsafe_allow_html=True)
-                st.write("")
-                if st.button("💾 Salvar na Nuvem", use_container_width=True):
-                    try: targ = int(df_main['Concurso'].max()) + 1
-                    except: targ = "Prox"
-                    row = [datetime.now().strftime("%d/%m/%Y"), targ, str(nums), strat, "", "Pendente"]
-                    with st.spinner("Salvando..."):
-                        ok, msg = save_row(conn, cfg_atual['aba_palpites'], row)
-                        if ok: st.success(msg)
-                        else: st.error(msg)
 
-    with tab2:
-        df_p = get_data(conn, cfg_atual['aba_palpites'])
-        if df_p is not None:
-            st.dataframe(df_p.tail(10), use_container_width=True)
-            cd1, cd2 = st.columns([2,1])
-            with cd1:
-                modo = st.selectbox("Critério:", ["Últimos N", "Por Concurso", "Limpar Tudo"])
-                val = st.number_input("Qtd:", 1, 100, 1) if modo == "Últimos N" else st.text_input("Concurso:") if modo == "Por Concurso" else 0
-            with cd2:
-                st.write(""); st.write("")
-                if st.button("🗑️ Excluir"):
-                    ok, msg = delete_rows(conn, cfg_atual['aba_palpites'], modo, val)
-                    if ok: st.success(msg); time.sleep(1); st.rerun()
+    # ÁREA DE OPERAÇÃO
+    st.subheader("🛠️ Central de Operações")
+    escolha = st.selectbox("Selecione a Loteria:", list(CONFIG_GLOBAL.loterias.keys()))
+    cfg_atual = CONFIG_GLOBAL.loterias[escolha]
+    snap_atual = snaps.get(escolha)
+    df_main = None if snap_atual is not None else get_historico(armazem, cfg_atual.aba_historico)
+
+    if snap_atual is not None or (df_main is not None and not df_main.empty):
+        MotorAtivo = montar_motor(escolha, df_main, cfg_atual, snap_atual)
+        df_p = get_data(armazem, cfg_atual.aba_palpites)
+        # Palpites já salvos (na planilha e os desta sessão ainda na fila) não são gerados de novo
+        if df_p is not None and 'Dezenas' in df_p.columns:
+            MotorAtivo.registrar_salvos(parse_jogos_texto(df_p['Dezenas'], cfg_atual.max_dezenas))
+        MotorAtivo.registrar_salvos(st.session_state.get('jogos_salvos', {}).get(escolha, []))
+        tab1, tab3, tab2 = st.tabs(["🎲 Gerador", "🧮 Desdobramento", "📂 Gestão"])
+
+        with tab1:
+            c1, c2 = st.columns(2)
+            with c1:
+                st.markdown(f"**Análise: {escolha}**")
+                stats = MotorAtivo.get_stats()
+                if stats['quentes']: st.caption(f"🔥 Quentes: {', '.join(map(str, stats['quentes'][:6]))}")
+                atrasadas = MotorAtivo.atrasos.atrasadas(k=6)
+                if atrasadas: st.caption(f"⏳ Atrasadas: {', '.join(map(str, atrasadas))}")
+                with st.expander("📈 Atrasos por dezena"):
+                    st.dataframe(MotorAtivo.get_atrasos(), use_container_width=True, hide_index=True)
+                with st.expander("📐 Características dos sorteios"):
+                    consulta = st.text_input("Filtro (ex.: soma >= 150 and max_seq <= 2)", key="consulta_caract")
+                    try: st.dataframe(MotorAtivo.get_caracteristicas(ultimos=100, filtros=consulta or None),
+                                      use_container_width=True, hide_index=True)
+                    except Exception as e: st.warning(f"Filtro inválido: {e}")
+                strat = st.radio("Estratégia:", ["Equilíbrio", "Tendência", "Mestre", "Afinidade", "Atrasadas"])
+                if st.button("🔮 Gerar Palpite", type="primary"):
+                    st.session_state['jogo'] = MotorAtivo.gerar_palpite(strat)
+            with c2:
+                st.markdown("**Palpite Gerado:**")
+                if 'jogo' in st.session_state:
+                    nums = st.session_state['jogo']
+                    st.markdown(gerar_ticket_visual(escolha, nums), unsafe_allow_html=True)
+                    st.write("")
+                    if st.button("💾 Salvar na Nuvem", use_container_width=True):
+                        try: targ = int(MotorAtivo.concursos.max()) + 1
+                        except: targ = "Prox"
+                        row = [datetime.now().strftime("%d/%m/%Y"), targ, str(nums), strat, "", "Pendente"]
+                        # Write-behind: entra na fila local e a thread envia em lote para a nuvem
+                        id_fila = fila.enfileirar(cfg_atual.aba_palpites, row)
+                        st.session_state.setdefault('salvos', []).append(id_fila)
+                        st.session_state.setdefault('jogos_salvos', {}).setdefault(escolha, []).append([int(n) for n in nums])
+                        st.success("📥 Salvo! Enviando para a nuvem em segundo plano.")
+
+        with tab3:
+            k = cfg_atual.tamanho_jogo
+            grupo = st.multiselect(f"Dezenas do grupo (mais de {k}):", list(range(1, cfg_atual.max_dezenas + 1)),
+                                   default=sorted(MotorAtivo.get_stats()['quentes'][:k + 3]))
+            d1, d2 = st.columns(2)
+            bolas = min(MotorAtivo.bolas_por_sorteio(), max(len(grupo), 1))
+            sorteadas = d1.number_input("Sorteadas dentro do grupo:", 1, bolas, bolas)
+            garantia = d2.number_input("Acertos garantidos:", 1, int(min(k, sorteadas)), int(max(1, min(k, sorteadas) - 1)))
+            if st.button("🧮 Desdobrar", disabled=len(grupo) <= k):
+                try:
+                    # workers=1: sem pool de processos (fork a partir do servidor, cheio de threads, não é seguro)
+                    with st.spinner("Calculando cobertura..."), rastreio.span("desdobrar", loteria=escolha, grupo=len(grupo)):
+                        jogos = [j for bloco in MotorAtivo.desdobrar(grupo, int(garantia), int(sorteadas), workers=1) for j in bloco.tolist()]
+                    st.session_state['desdobramento'] = (escolha, jogos, int(garantia), int(sorteadas))
+                except ValueError as e: st.error(str(e))
+            if st.session_state.get('desdobramento', (None,))[0] == escolha:
+                _, jogos, g, s = st.session_state['desdobramento']
+                st.caption(f"{len(jogos)} jogos garantem {g} acertos se {s} sorteadas estiverem no grupo.")
+                texto = "\n".join(",".join(map(str, j)) for j in jogos)
+                st.dataframe({"Jogo": [", ".join(map(str, j)) for j in jogos]}, use_container_width=True, hide_index=True)
+                st.download_button("⬇️ Baixar CSV", texto, file_name=f"desdobramento_{escolha}.csv", mime="text/csv")
+
+        with tab2:
+            if df_p is not None:
+                st.dataframe(df_p.tail(10), use_container_width=True)
+                cd1, cd2 = st.columns([2,1])
+                with cd1:
+                    modo = st.selectbox("Critério:", MODOS_EXCLUSAO)
+                    val = st.number_input("Qtd:", 1, 100, 1) if modo == "Últimos N" else st.text_input("Concurso:") if modo == "Por Concurso" else 0
+                with cd2:
+                    st.write(""); st.write("")
+                    if st.button("🗑️ Excluir"):
+                        ok, msg = delete_rows(armazem, cfg_atual.aba_palpites, modo, val)
+                        if ok: st.success(msg); time.sleep(1); st.rerun()
+                        else: st.error(msg)
+                if st.button("✅ Conferir Pendentes"):
+                    with st.spinner("Conferindo..."):
+                        ok, msg, dist = conferir_palpites(armazem, cfg_atual.aba_palpites, MotorAtivo)
+                    if ok:
+                        st.success(msg)
+                        if dist: st.caption(" • ".join(f"{a} acertos: {q}" for a, q in sorted(dist.items(), reverse=True)))
                     else: st.error(msg)
-        else: st.info("Sem histórico.")
-else:
-    st.info(f"Carregando {escolha}...")
+            else: st.info("Sem histórico.")
+    else:
+        st.info(f"Carregando {escolha}...")
+finally:
+    # Também quando a página sai no meio (st.rerun, st.stop ou exceção): senão o cProfile
+    # continuaria ligado na thread do servidor e o rastreio desta execução se perderia
+    relatorio_perfil = encerrar_execucao()
+
+# --- 6. RASTREIO: PAINEL, LOG E PERFIL ---
+with st.sidebar:
+    if st.checkbox("⏱️ Rastreio da execução", key="painel_rastreio"):
+        st.caption(f"Total: {RASTREIO.total_ms:.0f} ms")
+        st.dataframe([{"fase": nome, **a} for nome, a in RASTREIO.resumo().items()], use_container_width=True, hide_index=True)
+        if st.button("🧪 Perfilar próxima execução"):
+            st.session_state['perfilar'] = True
+            st.rerun()
+    if relatorio_perfil:
+        with st.expander(f"🧪 cProfile ({PERFIL.caminho})"):
+            st.code(relatorio_perfil)
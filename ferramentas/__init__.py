@@ -0,0 +1,2 @@
+# Arquivo: ferramentas/__init__.py
+# Ferramentas de desenvolvimento (medições, benchmarks); não são importadas pelo app.
@@ -0,0 +1,81 @@
+"""
+Backtest das estratégias pela linha de comando (motores/backtest.py).
+
+Monta o motor de cada loteria com o histórico completo, pela mesma factory do
+app, e roda o backtest em paralelo: para cada concurso com histórico
+suficiente, K palpites por estratégia gerados só com os sorteios anteriores.
+A tabela sai na tela (e, com --saida, em CSV).
+
+    python -m ferramentas.backtest "Mega Sena" -k 1000 --ultimos 200
+    python -m ferramentas.backtest --estrategias Tendência,Afinidade --sqlite --saida backtest.csv
+    python -m ferramentas.backtest Quina --historico quina.csv --workers 4 --seed 42
+
+Sem loterias, roda todas as do config. As fontes do histórico são as mesmas
+do ferramentas.gerar (--historico, --sqlite, --credenciais ou o cache local).
+"""
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+from infra.configuracao import CarregadorConfig
+from motores.backtest import ESTRATEGIAS, MIN_HISTORICO, backtest
+from motores.registro import obter_motor
+
+from .gerar import abrir_armazenamento, carregar_historico
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Backtest das estratégias sobre o histórico (sem o Streamlit)")
+    ap.add_argument("loterias", nargs="*", help="nomes no config (padrão: todas)")
+    ap.add_argument("-k", type=int, default=1000, help="palpites por estratégia em cada concurso")
+    ap.add_argument("--estrategias", default=",".join(ESTRATEGIAS))
+    ap.add_argument("--ultimos", type=int, help="só os N concursos mais recentes")
+    ap.add_argument("--inicio", type=int, default=MIN_HISTORICO, help="concursos mínimos antes do primeiro alvo")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, help="processos (padrão: núcleos da máquina)")
+    ap.add_argument("--bloco", type=int, help="concursos por tarefa (padrão: ~4 tarefas por processo)")
+    ap.add_argument("--saida", help="grava a tabela em CSV")
+    ap.add_argument("--config", help="config_loterias.json (padrão: última cópia remota boa ou a do repositório)")
+    fonte = ap.add_mutually_exclusive_group()
+    fonte.add_argument("--historico", help="CSV/Parquet com o histórico no formato da aba (uma loteria só)")
+    fonte.add_argument("--sqlite", nargs="?", const="", help="backend SQLite do app (caminho opcional)")
+    fonte.add_argument("--credenciais", help="JSON da conta de serviço do Google (lê a planilha)")
+    args = ap.parse_args(argv)
+
+    carregador = CarregadorConfig(arquivo_local=args.config, caminho_cache=None) if args.config else CarregadorConfig()
+    config = carregador.atual()
+    if config is None: ap.error(f"config indisponível: {carregador.ultimo_erro}")
+    nomes = args.loterias or list(config.loterias)
+    desconhecidas = [n for n in nomes if n not in config.loterias]
+    if desconhecidas: ap.error(f"loteria desconhecida: {', '.join(desconhecidas)}; opções: {', '.join(config.loterias)}")
+    if args.historico and len(nomes) != 1: ap.error("--historico vale para uma loteria só")
+    estrategias = [e.strip() for e in args.estrategias.split(",") if e.strip()]
+
+    armazem = abrir_armazenamento(args.sqlite, args.credenciais, config.spreadsheet_id)
+    entradas = []
+    for nome in nomes:
+        cfg = config.loterias[nome]
+        df, _ = carregar_historico(cfg, args.historico, armazem)
+        if df is None or df.empty:
+            print(f"⚠️ {nome}: histórico vazio ou indisponível", file=sys.stderr)
+            continue
+        entradas.append((nome, obter_motor(nome, df, cfg)))
+    if not entradas: ap.error("nenhuma loteria com histórico")
+
+    inicio = time.perf_counter()
+    tabela = backtest(entradas, estrategias, args.k, args.ultimos, args.inicio, args.seed, args.workers, args.bloco)
+    duracao = time.perf_counter() - inicio
+    if tabela.empty:
+        print(f"Nenhum concurso com mais de {args.inicio} sorteios anteriores", file=sys.stderr)
+        return 1
+    with pd.option_context("display.max_columns", None, "display.width", 200):
+        print(tabela.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+    if args.saida: tabela.to_csv(args.saida, index=False)
+    print(f"✅ {int(tabela['Jogos'].sum()):,} palpites em {duracao:.1f} s (seed {args.seed})", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
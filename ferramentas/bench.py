@@ -0,0 +1,173 @@
+"""
+Benchmark dos motores e da renderização com históricos sintéticos.
+
+Para cada loteria do config_loterias.json e cada tamanho de histórico
+(padrão 1k, 10k, 100k e 1M sorteios) mede get_stats, analisar_sinal,
+gerar_palpite (por estratégia), gerar_lote e gerar_html_card (renderizando e
+com o card já no cache): tempo mínimo e mediano de algumas repetições e o
+pico de memória (tracemalloc).
+
+    python -m ferramentas.bench --saida bench.json
+    python -m ferramentas.bench --tamanhos 1000,10000 --loterias "Mega Sena" --comparar bench.json
+
+Com --comparar, cada medição é confrontada com a do arquivo base e o
+comando sai com código 1 se alguma ficar mais lenta que a tolerância.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from interface.dashboard_cards import gerar_html_card, limpar_cache_cards
+from motores.registro import classe_motor
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TAMANHOS = [1_000, 10_000, 100_000, 1_000_000]
+ESTRATEGIAS = ["Equilíbrio", "Tendência", "Mestre", "Afinidade", "Atrasadas"]
+# Quantas dezenas saem por sorteio quando difere do tamanho do jogo
+DEZENAS_SORTEADAS = {"Lotomania": 20}
+MAX_DF = 10_000  # acima disso o motor é montado direto da matriz (DataFrame de strings fica grande demais)
+LOTE = 1_000
+TOLERANCIA = 0.20
+BLOCO_SINTETICO = 16384  # linhas do histórico sintético geradas por vez
+
+
+def historico_sintetico(cfg, n, largura, seed=0, bloco=BLOCO_SINTETICO):
+    """
+    Matriz (n × largura) uint8 ordenada por linha, linha 0 = mais recente.
+    Gerada em blocos de linhas: as chaves float32 e o argpartition (int64) só
+    existem para um bloco por vez, e a memória fica perto da saída (n × largura bytes).
+    """
+    rng = np.random.default_rng(seed)
+    saida = np.empty((n, largura), dtype=np.uint8)
+    for ini in range(0, n, bloco):
+        chaves = rng.random((min(bloco, n - ini), cfg['max_dezenas']), dtype=np.float32)
+        idx = np.argpartition(chaves, largura - 1, axis=1)[:, :largura]
+        idx.sort(axis=1)
+        saida[ini:ini + idx.shape[0]] = idx + 1
+    return saida
+
+
+def como_dataframe(matriz):
+    """Mesmo formato da planilha: strings, Concurso decrescente."""
+    n = matriz.shape[0]
+    df = pd.DataFrame(np.char.zfill(matriz.astype(str), 2), columns=[f"D{i + 1}" for i in range(matriz.shape[1])])
+    df.insert(0, "Concurso", np.arange(n, 0, -1).astype(str))
+    df["Status / Premiação"] = ""
+    return df
+
+
+def medir(fn, repeticoes):
+    """(min_ms, mediana_ms, pico_kb) de `fn`."""
+    tempos = []
+    tracemalloc.start()
+    for _ in range(repeticoes):
+        t = time.perf_counter()
+        fn()
+        tempos.append((time.perf_counter() - t) * 1000)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(tempos), statistics.median(tempos), pico / 1024
+
+
+def rodar(loterias, tamanhos, repeticoes=5):
+    resultados = []
+    for nome, cfg in loterias.items():
+        classe = classe_motor(nome, cfg)
+        largura = DEZENAS_SORTEADAS.get(nome, cfg['tamanho_jogo'])
+        for n in tamanhos:
+            matriz = historico_sintetico(cfg, n, largura)
+            concursos = np.arange(n, 0, -1, dtype=np.int64)
+            reps = repeticoes if n <= 100_000 else max(1, repeticoes // 2)
+
+            def registrar(operacao, fn):
+                mn, med, pico = medir(fn, reps)
+                resultados.append({"loteria": nome, "sorteios": n, "operacao": operacao,
+                                   "min_ms": round(mn, 4), "mediana_ms": round(med, 4), "pico_kb": round(pico, 1)})
+                print(f"{nome:<14} {n:>9} {operacao:<28} {med:>10.2f} ms {pico:>10.0f} KB", flush=True)
+
+            if n <= MAX_DF:
+                df = como_dataframe(matriz)
+                registrar("construir (DataFrame)", lambda: classe(df, cfg))
+                del df
+            registrar("construir (matriz)", lambda: classe.de_matriz(matriz, cfg, concursos))
+            motor = classe.de_matriz(matriz, cfg, concursos)
+
+            def stats_frio():
+                motor._memo_stats.clear()
+                motor.get_stats()
+            registrar("get_stats", stats_frio)
+            registrar("get_stats (memo)", motor.get_stats)
+            registrar("analisar_sinal", motor.analisar_sinal)
+            for e in ESTRATEGIAS:
+                registrar(f"gerar_palpite {e}", lambda e=e: motor.gerar_palpite(e))
+                registrar(f"gerar_lote {e} x{LOTE}", lambda e=e: motor.gerar_lote(e, LOTE, seed=0))
+
+            def card_frio():
+                limpar_cache_cards()
+                gerar_html_card(nome, motor, None)
+            registrar("gerar_html_card", card_frio)
+            registrar("gerar_html_card (cache)", lambda: gerar_html_card(nome, motor, None))
+    return resultados
+
+
+def comparar(atual, base, tolerancia=TOLERANCIA):
+    """Lista de regressões: medições com mediana acima de base × (1 + tolerância)."""
+    indice = {(r["loteria"], r["sorteios"], r["operacao"]): r for r in base["resultados"]}
+    regressoes = []
+    for r in atual:
+        b = indice.get((r["loteria"], r["sorteios"], r["operacao"]))
+        if not b or b["mediana_ms"] <= 0: continue
+        razao = r["mediana_ms"] / b["mediana_ms"]
+        if razao > 1 + tolerancia:
+            regressoes.append({**r, "base_ms": b["mediana_ms"], "razao": round(razao, 2)})
+    return regressoes
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark dos motores do Oráculo")
+    ap.add_argument("--config", default=os.path.join(RAIZ, "config_loterias.json"))
+    ap.add_argument("--loterias", help="nomes separados por vírgula (padrão: todas)")
+    ap.add_argument("--tamanhos", default=",".join(map(str, TAMANHOS)))
+    ap.add_argument("--repeticoes", type=int, default=5)
+    ap.add_argument("--saida", help="grava o resultado em JSON")
+    ap.add_argument("--comparar", help="JSON de uma execução anterior (baseline)")
+    ap.add_argument("--tolerancia", type=float, default=TOLERANCIA)
+    args = ap.parse_args(argv)
+
+    with open(args.config, encoding="utf-8") as f:
+        loterias = json.load(f)["loterias"]
+    if args.loterias:
+        escolhidas = [x.strip() for x in args.loterias.split(",")]
+        loterias = {k: v for k, v in loterias.items() if k in escolhidas}
+    tamanhos = [int(x) for x in args.tamanhos.split(",")]
+
+    resultados = rodar(loterias, tamanhos, args.repeticoes)
+    saida = {"meta": {"data": time.strftime("%Y-%m-%d %H:%M:%S"), "python": platform.python_version(),
+                      "numpy": np.__version__, "pandas": pd.__version__, "maquina": platform.machine()},
+             "resultados": resultados}
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(saida, f, ensure_ascii=False, indent=1)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            regressoes = comparar(resultados, json.load(f), args.tolerancia)
+        for r in regressoes:
+            print(f"❌ REGRESSÃO {r['loteria']} {r['sorteios']} {r['operacao']}: "
+                  f"{r['base_ms']:.2f} -> {r['mediana_ms']:.2f} ms (x{r['razao']})")
+        if regressoes: return 1
+        print("✅ Sem regressões.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,524 @@
+"""
+Teste de carga do app: várias sessões simuladas rodando o app.py de verdade.
+
+Cada sessão é um AppTest (streamlit.testing) no mesmo processo, então os
+st.cache_resource (armazenamento, fila, cliente de prêmios, leitor de
+snapshots) são compartilhados como num servidor com vários usuários. Nada
+sai da máquina:
+
+- Google Sheets: um módulo `gspread` falso (e o `oauth2client` que o
+  connect_google importa) que devolve uma PlanilhaFake com histórico
+  sintético, latência por chamada, erros aleatórios e cota por minuto
+  (APIError 429, como a API real)
+- API de prêmios: um servidor HTTP local com a mesma latência/erros/cota,
+  então o ClientePremios roda o caminho real (requests, keep-alive, backoff)
+- caches locais (histórico, config, snapshots): pasta temporária via
+  ORACULO_CACHE, nunca a .cache do app
+
+Cada sessão faz uma primeira execução (página fria) e depois reruns
+alternando entre só recarregar, trocar de loteria e gerar palpite. No fim:
+vazão, latência p50/p99 (primeira execução e reruns), chamadas a cada
+serviço (por método e recusadas por cota), contadores do
+ArmazenamentoSheets e memória:
+
+- retida por sessão: algumas sessões extras, uma de cada vez e com os caches
+  já quentes, medidas com tracemalloc (o que sobra alocado depois delas,
+  incluindo a árvore de elementos que o AppTest guarda)
+- session_state: tamanho serializado (pickle) do estado de cada sessão
+- RSS: crescimento do processo inteiro dividido pelo número de sessões
+  (inclui os caches compartilhados; é um teto, não o custo de uma sessão)
+
+    python -m ferramentas.carga --sessoes 20 --reruns 10
+    python -m ferramentas.carga --sessoes 50 --concorrencia 10 --latencia-planilha 0.3 --cota-planilha 300 --saida carga.json
+    python -m ferramentas.carga --sessoes 20 --snapshots --p99-max 2.0
+
+Com --p99-max, sai com código 1 se o p99 dos reruns passar do limite ou se
+alguma sessão terminar com exceção (para rodar no CI).
+"""
+import argparse
+import gc
+import json
+import os
+import pickle
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import types
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+# Antes de qualquer import de infra: os caches locais vão para uma pasta só do teste
+os.environ.setdefault("ORACULO_CACHE", tempfile.mkdtemp(prefix="oraculo_carga_"))
+
+from infra.armazenamento import CABECALHO_PALPITES, ArmazenamentoSheets  # noqa: E402
+from infra.configuracao import CarregadorConfig  # noqa: E402
+from infra.planilha_fake import AbaFake, PlanilhaFake  # noqa: E402
+from infra.premios import SLUGS  # noqa: E402
+
+from .bench import DEZENAS_SORTEADAS, como_dataframe, historico_sintetico  # noqa: E402
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(RAIZ, "app.py")
+ACOES = {"rerun": 0.5, "loteria": 0.3, "palpite": 0.2}  # pesos dos reruns depois da primeira execução
+TIMEOUT = 120.0  # segundos por execução do script
+SESSOES_MEMORIA = 3  # sessões extras medidas com tracemalloc
+
+
+# --- SERVIÇOS FALSOS ---
+
+class ErroCota(Exception):
+    """Chamada recusada (cota por minuto estourada ou erro aleatório)."""
+
+
+class APIError(Exception):
+    """Como gspread.exceptions.APIError; aqui sempre 429 (cota)."""
+    code = 429
+
+
+class Rede:
+    """
+    Latência, erros e cota de um serviço falso; conta as chamadas (thread-safe).
+    latencia: média em segundos (uniforme entre 0,5x e 1,5x); taxa_erro: fração
+    de chamadas que falham; cota: chamadas por minuto (janela deslizante), None = sem limite.
+    """
+
+    def __init__(self, latencia=0.0, taxa_erro=0.0, cota=None, seed=0):
+        self.latencia = latencia
+        self.taxa_erro = taxa_erro
+        self.cota = cota
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._janela = deque()
+        self.chamadas = {}
+        self.recusadas = 0
+
+    def chamar(self, nome):
+        with self._lock:
+            agora = time.monotonic()
+            self.chamadas[nome] = self.chamadas.get(nome, 0) + 1
+            while self._janela and agora - self._janela[0] >= 60: self._janela.popleft()
+            estourou = self.cota is not None and len(self._janela) >= self.cota
+            if not estourou: self._janela.append(agora)
+            falhou = estourou or self._rng.random() < self.taxa_erro
+            espera = self.latencia * (0.5 + self._rng.random())
+            if falhou: self.recusadas += 1
+        if espera: time.sleep(espera)
+        if falhou: raise ErroCota(f"{nome}: quota exceeded")
+
+    def total(self):
+        with self._lock: return sum(self.chamadas.values())
+
+
+def _chamar(rede, nome):
+    try: rede.chamar(nome)
+    except ErroCota as e: raise APIError(str(e)) from None
+
+
+class AbaLenta(AbaFake):
+    """AbaFake que passa cada chamada pela Rede (latência, APIError 429) antes de responder."""
+
+    def __init__(self, title, valores=None, rede=None, id=0):
+        super().__init__(title, valores, id)
+        self.rede = rede or Rede()
+
+    def _conta(self, nome, celulas=0):
+        super()._conta(nome, celulas)
+        _chamar(self.rede, nome)
+
+
+class PlanilhaLenta(PlanilhaFake):
+    """PlanilhaFake com todas as abas (e o worksheet()) atrás da mesma Rede."""
+
+    def __init__(self, abas=None, rede=None):
+        super().__init__()
+        self.rede = rede or Rede()
+        self._abas = {t: AbaLenta(t, v, self.rede, id=i) for i, (t, v) in enumerate((abas or {}).items())}
+
+    def _conta(self, nome):
+        super()._conta(nome)
+        _chamar(self.rede, nome)
+
+    def worksheet(self, title):
+        _chamar(self.rede, "worksheet")
+        return super().worksheet(title)
+
+    def add_worksheet(self, title, rows=1000, cols=10):
+        self._abas[title] = AbaLenta(title, rede=self.rede, id=max((a.id for a in self._abas.values()), default=-1) + 1)
+        return self._abas[title]
+
+    def chamadas(self):
+        """{método: chamadas} somando todas as abas (e os batch_update da planilha)."""
+        total = dict(self.pedidos)
+        for aba in self._abas.values():
+            for nome, n in aba.chamadas.items(): total[nome] = total.get(nome, 0) + n
+        return total
+
+
+def instalar_gspread_falso(planilha):
+    """
+    Põe em sys.modules um `gspread` (e `oauth2client.service_account`) cujo
+    authorize(...).open_by_key(...) devolve `planilha`. O connect_google do app
+    importa os dois na hora, então pega estes. Devolve o que havia antes em
+    sys.modules (para `restaurar_modulos`).
+    """
+    gspread = types.ModuleType("gspread")
+    gspread.exceptions = types.ModuleType("gspread.exceptions")
+    gspread.exceptions.APIError = APIError
+    gspread.authorize = lambda creds: types.SimpleNamespace(open_by_key=lambda chave: planilha)
+    oauth2client = types.ModuleType("oauth2client")
+    conta = types.ModuleType("oauth2client.service_account")
+    conta.ServiceAccountCredentials = types.SimpleNamespace(from_json_keyfile_dict=lambda info, scope: object())
+    oauth2client.service_account = conta
+    falsos = {"gspread": gspread, "gspread.exceptions": gspread.exceptions,
+              "oauth2client": oauth2client, "oauth2client.service_account": conta}
+    anteriores = {nome: sys.modules.get(nome) for nome in falsos}
+    sys.modules.update(falsos)
+    return anteriores
+
+
+def restaurar_modulos(anteriores):
+    for nome, modulo in anteriores.items():
+        if modulo is None: sys.modules.pop(nome, None)
+        else: sys.modules[nome] = modulo
+
+
+class ApiPremiosFalsa:
+    """Servidor HTTP local no formato da API pública (GET /<slug> -> JSON), passando pela Rede."""
+
+    def __init__(self, rede=None, seed=0):
+        self.rede = rede or Rede()
+        rng = random.Random(seed)
+        self.valores = {slug: rng.randrange(2, 200) * 500_000 for slug in SLUGS.values()}
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, como a API real
+
+            def do_GET(self):
+                slug = self.path.strip("/")
+                try:
+                    api.rede.chamar(slug)
+                    status, corpo = (200, {"valorEstimadoProximoConcurso": api.valores[slug]}) if slug in api.valores else (404, {})
+                except ErroCota: status, corpo = 429, {"erro": "quota"}
+                dados = json.dumps(corpo).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(dados)))
+                self.end_headers()
+                self.wfile.write(dados)
+
+            def log_message(self, *args):
+                pass
+
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._servidor.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._servidor.server_address[1]}"
+        threading.Thread(target=self._servidor.serve_forever, daemon=True, name="api-falsa").start()
+
+    def fechar(self):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+
+# --- DADOS SINTÉTICOS ---
+
+def abas_sinteticas(config, sorteios=2000, palpites=200, seed=0):
+    """{aba: valores} com histórico (mais novo no topo) e palpites pendentes de cada loteria."""
+    rng = np.random.default_rng(seed)
+    abas = {}
+    for nome, cfg in config.loterias.items():
+        largura = DEZENAS_SORTEADAS.get(nome, cfg.tamanho_jogo)
+        df = como_dataframe(historico_sintetico(cfg, sorteios, largura, seed))
+        abas[cfg.aba_historico] = [list(df.columns)] + df.to_numpy().tolist()
+        linhas = [CABECALHO_PALPITES]
+        for _ in range(palpites):
+            jogo = np.sort(rng.choice(np.arange(1, cfg.max_dezenas + 1), cfg.tamanho_jogo, replace=False))
+            alvo = int(rng.integers(max(1, sorteios - 50), sorteios + 2))
+            linhas.append(["01/01/2024", str(alvo), str([int(x) for x in jogo]), "Mestre", "", "Pendente"])
+        abas[cfg.aba_palpites] = linhas
+    return abas
+
+
+def novo_concurso(planilha, config, rng):
+    """Insere um sorteio novo no topo de cada aba de histórico (como a atualização real da planilha)."""
+    for nome, cfg in config.loterias.items():
+        aba = planilha._abas.get(cfg.aba_historico)
+        if aba is None or len(aba._linhas) < 2: continue
+        cab, topo = aba._linhas[0], aba._linhas[1]
+        largura = sum(1 for c in cab if c.startswith("D") and c[1:].isdigit())
+        dezenas = np.sort(rng.choice(np.arange(1, cfg.max_dezenas + 1), largura, replace=False))
+        linha = [str(int(topo[0]) + 1)] + [f"{int(d):02d}" for d in dezenas] + [""] * (len(cab) - 1 - largura)
+        aba._linhas.insert(1, linha)  # direto, sem passar pela Rede: é a "Caixa" escrevendo
+
+
+# --- SESSÕES ---
+
+def rss_mb():
+    """Memória residente do processo em MB (/proc; fora do Linux, o pico do getrusage)."""
+    try:
+        with open("/proc/self/statm") as f: return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        import resource
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pico / 2 ** 20 if sys.platform == "darwin" else pico / 1024
+
+
+class Sessao:
+    """Um usuário: um AppTest do app.py (os secrets apontando para os serviços falsos vêm de servidor_compartilhado)."""
+
+    def __init__(self, i, loterias, seed=0, timeout=TIMEOUT):
+        from streamlit.testing.v1 import AppTest
+        self.i = i
+        self.at = AppTest.from_file(APP, default_timeout=timeout)
+        self.loterias = loterias
+        self.rng = random.Random(f"{seed}:{i}")
+        self.tempos = []  # (ação, segundos)
+        self.erros = []
+
+    def _executar(self, acao):
+        at = self.at
+        if acao == "loteria" and at.selectbox:
+            at.selectbox[0].set_value(self.rng.choice(self.loterias))
+        elif acao == "palpite":
+            botao = next((b for b in at.button if b.label == "🔮 Gerar Palpite"), None)
+            if botao is not None: botao.click()
+        inicio = time.perf_counter()
+        at.run()
+        self.tempos.append((acao, time.perf_counter() - inicio))
+        for ex in at.exception: self.erros.append(f"{acao}: {ex.message}")
+
+    def estado_kb(self):
+        """Tamanho serializado do session_state (o que a sessão guarda entre reruns)."""
+        total = 0
+        for chave in list(self.at.session_state):
+            try: valor = self.at.session_state[chave]
+            except KeyError: continue  # widget que saiu da tela entre listar e ler
+            try: total += len(pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL))
+            except Exception: total += sys.getsizeof(valor)
+        return total / 1024
+
+    def rodar(self, reruns):
+        try:
+            self._executar("inicio")
+            nomes, pesos = zip(*ACOES.items())
+            for _ in range(reruns): self._executar(self.rng.choices(nomes, pesos)[0])
+        except Exception as e: self.erros.append(f"{type(e).__name__}: {e}")
+        return self
+
+
+def _percentis(valores):
+    if not valores: return {"n": 0}
+    v = np.asarray(valores) * 1000
+    return {"n": len(v), "p50_ms": round(float(np.percentile(v, 50)), 1),
+            "p99_ms": round(float(np.percentile(v, 99)), 1), "max_ms": round(float(v.max()), 1)}
+
+
+def _resumo_kb(valores):
+    if not valores: return {"n": 0}
+    return {"n": len(valores), "media_kb": round(float(np.mean(valores)), 1), "max_kb": round(float(max(valores)), 1)}
+
+
+def memoria_retida(loterias, reruns, n=SESSOES_MEMORIA, seed=0, timeout=TIMEOUT):
+    """
+    KB que cada sessão deixa alocados (tracemalloc), rodando `n` sessões uma de
+    cada vez depois da carga, com os caches compartilhados já quentes. As
+    sessões ficam vivas até o fim da medição, como num servidor com usuários conectados.
+    """
+    vivas, retidas = [], []
+    tracemalloc.start()
+    try:
+        for i in range(n):
+            gc.collect()
+            antes = tracemalloc.get_traced_memory()[0]
+            vivas.append(Sessao(-1 - i, loterias, seed, timeout).rodar(reruns))
+            gc.collect()
+            retidas.append((tracemalloc.get_traced_memory()[0] - antes) / 1024)
+    finally:
+        tracemalloc.stop()
+    return retidas, vivas
+
+
+@contextmanager
+def servidor_compartilhado(secrets):
+    """
+    Estado global do Streamlit que as sessões dividem, como num servidor só.
+    O AppTest foi feito para rodar uma execução por vez e mexe em globais a
+    cada run; com sessões simultâneas, a que termina desfaz o que as outras
+    ainda estão usando. Durante a carga:
+
+    - config: global.appTest ligado (sem ele os widgets não guardam o
+      format_func e o próximo run dá KeyError) e o magic desligado (o AppTest
+      cria um ScriptCache por run, e ast.parse em várias threads quebra no
+      CPython 3.11; o app não tem expressão solta para o magic exibir). O
+      patch que cada run faz por cima deste pode ser desfeito fora de ordem
+      sem mudar nada; no fim, este devolve o config original
+    - Runtime: o AppTest grava o Runtime falso de cada run (e None no fim)
+      numa subclasse; o primeiro criado vira o do processo
+    - st.secrets: instalado uma vez aqui, em vez de trocado a cada run
+    """
+    import streamlit as st
+    from streamlit.runtime.runtime import Runtime
+    from streamlit.runtime.secrets import Secrets
+    from streamlit.testing.v1 import app_test
+    from streamlit.testing.v1.util import patch_config_options
+
+    class _PrimeiroRuntime(type):
+        def __setattr__(cls, nome, valor):
+            super().__setattr__(nome, valor)
+            if nome == "_instance" and valor is not None and Runtime._instance is None: Runtime._instance = valor
+
+    runtime_anterior, secrets_anteriores = Runtime._instance, st.secrets
+    app_test.Runtime = _PrimeiroRuntime("RuntimeDoAppTest", (Runtime,), {})
+    st.secrets = Secrets()
+    st.secrets._secrets = secrets
+    try:
+        with patch_config_options({"global.appTest": True, "runner.magicEnabled": False}): yield
+    finally:
+        app_test.Runtime, Runtime._instance, st.secrets = Runtime, runtime_anterior, secrets_anteriores
+
+
+def carga(sessoes=10, reruns=5, concorrencia=None, sorteios=2000, rede_planilha=None, rede_api=None,
+          snapshots=False, intervalo_concurso=None, seed=0, timeout=TIMEOUT, progresso=None,
+          sessoes_memoria=SESSOES_MEMORIA):
+    """Roda o teste e devolve o relatório (dict pronto para JSON)."""
+    config = CarregadorConfig(caminho_cache=None).atual()
+    if config is None: raise RuntimeError("config_loterias.json indisponível")
+    rede_planilha = rede_planilha or Rede(seed=seed)
+    rede_api = rede_api or Rede(seed=seed + 1)
+    planilha = PlanilhaLenta(abas_sinteticas(config, sorteios, seed=seed), rede_planilha)
+    anteriores = instalar_gspread_falso(planilha)
+    api = ApiPremiosFalsa(rede_api, seed)
+    secrets = {"gcp_service_account": {"type": "service_account"}, "api": {"url_base": api.url}}
+
+    if snapshots:
+        # Publicação fora da página, como em produção (sem contar as chamadas do precomputar)
+        from .precomputar import precomputar
+        rede_planilha.latencia, latencia = 0.0, rede_planilha.latencia
+        precomputar(config, ArmazenamentoSheets(planilha))
+        rede_planilha.latencia = latencia
+        rede_planilha.chamadas.clear()
+
+    parar = threading.Event()
+    if intervalo_concurso:
+        rng = np.random.default_rng(seed)
+
+        def publicar_concursos():
+            while not parar.wait(intervalo_concurso): novo_concurso(planilha, config, rng)
+        threading.Thread(target=publicar_concursos, daemon=True, name="novo-concurso").start()
+
+    gc.collect()
+    memoria_antes = rss_mb()
+    inicio = time.perf_counter()
+    loterias = list(config.loterias)
+    concluidas = []
+    try:
+        with servidor_compartilhado(secrets):
+            with ThreadPoolExecutor(max_workers=concorrencia or sessoes, thread_name_prefix="sessao") as pool:
+                futs = [pool.submit(Sessao(i, loterias, seed, timeout).rodar, reruns) for i in range(sessoes)]
+                for fut in futs:
+                    concluidas.append(fut.result())
+                    if progresso: progresso(len(concluidas), sessoes)
+            duracao = time.perf_counter() - inicio
+            gc.collect()
+            # As sessões continuam vivas (session_state, árvore de elementos) até aqui
+            memoria_depois = rss_mb()
+            retidas, extras = memoria_retida(loterias, reruns, sessoes_memoria, seed, timeout)
+    finally:
+        parar.set()
+        api.fechar()
+        restaurar_modulos(anteriores)
+
+    tempos = [(a, t) for s in concluidas for a, t in s.tempos]
+    armazens = [o for o in gc.get_objects() if isinstance(o, ArmazenamentoSheets)]
+    return {
+        "sessoes": sessoes, "reruns_por_sessao": reruns, "concorrencia": concorrencia or sessoes,
+        "sorteios": sorteios, "snapshots": snapshots, "duracao_s": round(duracao, 2),
+        "vazao_execucoes_s": round(len(tempos) / duracao, 2) if duracao else None,
+        "latencia": {"primeira": _percentis([t for a, t in tempos if a == "inicio"]),
+                     "reruns": _percentis([t for a, t in tempos if a != "inicio"]),
+                     **{a: _percentis([t for b, t in tempos if b == a]) for a in ACOES}},
+        "planilha": {"chamadas": dict(rede_planilha.chamadas), "total": rede_planilha.total(),
+                     "recusadas": rede_planilha.recusadas, "por_metodo_nas_abas": planilha.chamadas(),
+                     "celulas_lidas": sum(a.celulas_lidas for a in planilha._abas.values())},
+        "api_premios": {"chamadas": rede_api.total(), "recusadas": rede_api.recusadas},
+        "armazenamento": [dict(a.contadores) for a in armazens],
+        "memoria": {"retida_por_sessao": _resumo_kb(retidas),
+                    "session_state": _resumo_kb([s.estado_kb() for s in concluidas]),
+                    "rss_antes_mb": round(memoria_antes, 1), "rss_depois_mb": round(memoria_depois, 1),
+                    "rss_crescimento_por_sessao_mb": round((memoria_depois - memoria_antes) / max(sessoes, 1), 2)},
+        "erros": [f"sessão {s.i}: {e}" for s in concluidas + extras for e in s.erros],
+    }
+
+
+def imprimir(r):
+    print(f"{r['sessoes']} sessões × (1 + {r['reruns_por_sessao']}) execuções, {r['concorrencia']} simultâneas, "
+          f"{r['sorteios']} sorteios por loteria{' (snapshots)' if r['snapshots'] else ''}")
+    print(f"⏱️ {r['duracao_s']:.1f} s  ->  {r['vazao_execucoes_s']} execuções/s")
+    print(f"{'latência':<10} {'n':>6} {'p50 (ms)':>10} {'p99 (ms)':>10} {'máx (ms)':>10}")
+    for nome, p in r["latencia"].items():
+        if p["n"]: print(f"{nome:<10} {p['n']:>6} {p['p50_ms']:>10.1f} {p['p99_ms']:>10.1f} {p['max_ms']:>10.1f}")
+    pl = r["planilha"]
+    print(f"📄 Planilha: {pl['total']} chamadas ({pl['recusadas']} recusadas), {pl['celulas_lidas']:,} células lidas")
+    for metodo, n in sorted(pl["chamadas"].items(), key=lambda x: -x[1]): print(f"   {metodo:<16} {n:>8}")
+    print(f"🌐 API de prêmios: {r['api_premios']['chamadas']} chamadas ({r['api_premios']['recusadas']} recusadas)")
+    for c in r["armazenamento"]: print(f"📖 ArmazenamentoSheets: {c}")
+    m = r["memoria"]
+    ret, est = m["retida_por_sessao"], m["session_state"]
+    if ret["n"]: print(f"🧠 Retida por sessão (tracemalloc, {ret['n']} sessões): média {ret['media_kb']:,.0f} KB, máx {ret['max_kb']:,.0f} KB")
+    if est["n"]: print(f"🧠 session_state: média {est['media_kb']:,.1f} KB, máx {est['max_kb']:,.1f} KB")
+    print(f"🧠 RSS do processo {m['rss_antes_mb']:.0f} -> {m['rss_depois_mb']:.0f} MB "
+          f"(+{m['rss_crescimento_por_sessao_mb']:.2f} MB ÷ sessões, com os caches compartilhados)")
+    for e in r["erros"][:20]: print(f"❌ {e}")
+    if len(r["erros"]) > 20: print(f"   ... e mais {len(r['erros']) - 20} erros")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Teste de carga do app com sessões simuladas (AppTest)")
+    ap.add_argument("--sessoes", type=int, default=10)
+    ap.add_argument("--reruns", type=int, default=5, help="reruns por sessão depois da primeira execução")
+    ap.add_argument("--concorrencia", type=int, help="sessões rodando ao mesmo tempo (padrão: todas)")
+    ap.add_argument("--sorteios", type=int, default=2000, help="tamanho do histórico sintético por loteria")
+    ap.add_argument("--latencia-planilha", type=float, default=0.1, help="segundos por chamada ao Sheets (média)")
+    ap.add_argument("--erro-planilha", type=float, default=0.0, help="fração de chamadas ao Sheets que falham")
+    ap.add_argument("--cota-planilha", type=int, help="chamadas por minuto antes do 429 (o Sheets real: 300)")
+    ap.add_argument("--latencia-api", type=float, default=0.2)
+    ap.add_argument("--erro-api", type=float, default=0.0)
+    ap.add_argument("--cota-api", type=int)
+    ap.add_argument("--snapshots", action="store_true", help="publica os snapshots antes (ferramentas/precomputar.py)")
+    ap.add_argument("--novo-concurso", type=float, help="insere um concurso novo na planilha a cada N segundos")
+    ap.add_argument("--sessoes-memoria", type=int, default=SESSOES_MEMORIA,
+                    help="sessões extras medidas uma a uma com tracemalloc (0 = não mede)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--timeout", type=float, default=TIMEOUT, help="segundos por execução do script")
+    ap.add_argument("--saida", help="grava o relatório em JSON")
+    ap.add_argument("--p99-max", type=float, help="segundos; acima disso (nos reruns) sai com código 1")
+    args = ap.parse_args(argv)
+
+    try: import streamlit.testing.v1  # noqa: F401
+    except ImportError as e: ap.error(f"precisa do streamlit com streamlit.testing ({e})")
+    print(f"(caches locais em {os.environ['ORACULO_CACHE']})", file=sys.stderr)
+
+    def progresso(feitas, total):
+        print(f"\rsessões {feitas}/{total}   ", end="", file=sys.stderr, flush=True)
+
+    r = carga(args.sessoes, args.reruns, args.concorrencia, args.sorteios,
+              Rede(args.latencia_planilha, args.erro_planilha, args.cota_planilha, args.seed),
+              Rede(args.latencia_api, args.erro_api, args.cota_api, args.seed + 1),
+              args.snapshots, args.novo_concurso, args.seed, args.timeout, progresso, args.sessoes_memoria)
+    print(file=sys.stderr)
+    imprimir(r)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f: json.dump(r, f, ensure_ascii=False, indent=2)
+    lento = args.p99_max is not None and r["latencia"]["reruns"].get("p99_ms", 0) > args.p99_max * 1000
+    return 1 if lento or (args.p99_max is not None and r["erros"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
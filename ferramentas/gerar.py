@@ -0,0 +1,281 @@
+"""
+Geração em massa de palpites, sem o navegador.
+
+Carrega o histórico da loteria, monta o motor pela mesma factory do app
+(obter_motor) e gera N palpites por estratégia com gerar_lote, em blocos
+distribuídos num pool de processos. Cada bloco tem seu próprio fluxo de
+números aleatórios (SeedSequence(seed, spawn_key=(estratégia, bloco))), e
+os blocos são gravados na ordem, então o arquivo não depende de quantos
+processos rodaram. Só uma janela de blocos fica em memória de cada vez: a
+saída (CSV, CSV.gz ou Parquet) vai sendo escrita conforme os blocos chegam.
+
+    python -m ferramentas.gerar "Mega Sena" -n 1000000 --saida mega.csv.gz
+    python -m ferramentas.gerar Lotofácil -n 500000 --estrategias Tendência,Mestre --sqlite --saida lf.parquet --unicos
+    python -m ferramentas.gerar Quina -n 100000 --filtro "soma >= 150 and max_seq <= 2" --saida quina.csv
+
+Fontes do histórico (nesta ordem): --historico (CSV/Parquet no formato da
+aba), --sqlite (backend local do app), --credenciais (Google Sheets com a
+conta de serviço) ou, sem nada, o cache local que o app mantém da planilha.
+Com --sqlite/--credenciais os palpites já salvos também não são repetidos.
+"""
+import argparse
+import gzip
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from infra import historico_local
+from infra.configuracao import CarregadorConfig
+from motores.matriz import parse_jogos_texto
+from motores.ranking import IndiceJogos
+from motores.registro import obter_motor
+
+ESTRATEGIAS = ["Equilíbrio", "Tendência", "Mestre", "Afinidade", "Atrasadas"]
+BLOCO = 100_000     # palpites por tarefa
+MAX_SEM_NOVOS = 64  # blocos seguidos sem nenhum palpite inédito (--unicos) antes de desistir
+
+
+# --- HISTÓRICO ---
+
+def _ler_tabela(caminho):
+    if caminho.endswith(".parquet"): return pd.read_parquet(caminho).astype(str)
+    return pd.read_csv(caminho, dtype=str, keep_default_na=False)
+
+
+def abrir_armazenamento(sqlite=None, credenciais=None, spreadsheet_id=None):
+    """Backend do app: SQLite local (sqlite='' = caminho padrão), Sheets com a conta de serviço, ou None."""
+    if sqlite is None and not credenciais: return None
+    from infra.armazenamento import ArmazenamentoSheets, ArmazenamentoSQLite
+    if sqlite is not None: return ArmazenamentoSQLite(sqlite or None)
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+    creds = ServiceAccountCredentials.from_json_keyfile_name(credenciais, scope)
+    return ArmazenamentoSheets(gspread.authorize(creds).open_by_key(spreadsheet_id))
+
+
+def carregar_historico(cfg, historico=None, armazem=None):
+    """(DataFrame do histórico, DataFrame dos palpites ou None), no formato de get_data."""
+    if historico: return _ler_tabela(historico), None
+    if armazem is not None:
+        try: palpites = armazem.ler(cfg.aba_palpites)
+        except Exception: palpites = None
+        return armazem.ler_historico(cfg.aba_historico), palpites
+    return historico_local.abrir(cfg.aba_historico).carregar(), None
+
+
+# --- PROCESSOS ---
+
+_MOTOR = None
+
+
+def _preparar(classe, config, matriz, concursos, salvos):
+    """Inicializador de cada processo: monta o motor uma vez só."""
+    global _MOTOR
+    _MOTOR = classe.de_matriz(matriz, config, concursos)
+    if salvos is not None and len(salvos): _MOTOR.registrar_salvos(salvos)
+
+
+def _gerar_bloco(estrategia, j, i, n, seed, consulta=None):
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(j, i)))
+    return _MOTOR.gerar_lote(estrategia, n, rng=rng, consulta=consulta)
+
+
+class _Local:
+    """Executor sem processos (workers=1): mesma interface de submit, roda na hora."""
+
+    def __init__(self, inicializador, args):
+        inicializador(*args)
+
+    def submit(self, fn, *args):
+        fut = Future()
+        try: fut.set_result(fn(*args))
+        except Exception as e: fut.set_exception(e)
+        return fut
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+# --- SAÍDA ---
+
+class EscritorCSV:
+    def __init__(self, caminho, k):
+        abrir = gzip.open if caminho.endswith(".gz") else open
+        self._f = abrir(caminho, "wt", encoding="utf-8", newline="")
+        self.colunas = [f"D{i + 1}" for i in range(k)]
+        self._f.write(",".join(["Estratégia"] + self.colunas) + "\n")
+
+    def escrever(self, estrategia, jogos):
+        df = pd.DataFrame(jogos, columns=self.colunas)
+        df.insert(0, "Estratégia", estrategia)
+        df.to_csv(self._f, header=False, index=False)
+
+    def fechar(self):
+        self._f.close()
+
+
+class EscritorParquet:
+    """Um row group por bloco (pyarrow só é importado aqui)."""
+
+    def __init__(self, caminho, k):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pa = pa
+        self.colunas = [f"D{i + 1}" for i in range(k)]
+        self.esquema = pa.schema([("Estratégia", pa.dictionary(pa.int8(), pa.string()))] +
+                                 [(c, pa.uint8()) for c in self.colunas])
+        self._w = pq.ParquetWriter(caminho, self.esquema, compression="zstd")
+
+    def escrever(self, estrategia, jogos):
+        pa = self._pa
+        rotulo = pa.DictionaryArray.from_arrays(pa.array(np.zeros(len(jogos), dtype=np.int8)), pa.array([estrategia]))
+        colunas = [rotulo] + [pa.array(np.ascontiguousarray(jogos[:, i])) for i in range(jogos.shape[1])]
+        self._w.write_table(pa.Table.from_arrays(colunas, schema=self.esquema))
+
+    def fechar(self):
+        self._w.close()
+
+
+def abrir_saida(caminho, k):
+    if caminho.endswith(".parquet"): return EscritorParquet(caminho, k)
+    return EscritorCSV(caminho, k)
+
+
+# --- GERAÇÃO ---
+
+def _tamanhos(n, bloco):
+    """
+    Tamanho do bloco i: os primeiros cobrem n; os extras (repostos quando --unicos
+    descarta palpites) são menores. Só depende de i, então o arquivo também não
+    depende de quantos blocos estavam em voo.
+    """
+    planejados = -(-n // bloco)
+    extra = max(1, bloco // 10)
+    return lambda i: min(bloco, n - i * bloco) if i < planejados else extra
+
+
+def gerar_estrategia(executor, janela, estrategia, j, n, escritor, seed, bloco=BLOCO, vistos=None,
+                     progresso=None, consulta=None):
+    """Blocos de uma estratégia, gravados na ordem; retorna quantos palpites foram gravados."""
+    tamanho = _tamanhos(n, bloco)
+    feitos, proximo, em_voo, sem_novos = 0, 0, 0, 0
+    pendentes = deque()
+    if progresso: progresso(estrategia, 0, n)
+    try:
+        while feitos < n:
+            # Janela cheia de blocos; com `vistos` pode faltar e os extras completam
+            while len(pendentes) < janela and (feitos + em_voo < n or not pendentes):
+                tam = tamanho(proximo)
+                pendentes.append((tam, executor.submit(_gerar_bloco, estrategia, j, proximo, tam, seed, consulta)))
+                proximo += 1
+                em_voo += tam
+            tam, fut = pendentes.popleft()
+            em_voo -= tam
+            jogos = fut.result()
+            if vistos is not None:
+                jogos = jogos[~vistos.contem(jogos)]
+                sem_novos = 0 if len(jogos) else sem_novos + 1
+                if sem_novos >= MAX_SEM_NOVOS:
+                    raise ValueError(f"sem palpites inéditos depois de {feitos} (combinações esgotadas?)")
+            jogos = jogos[:n - feitos]
+            if vistos is not None: vistos.adicionar(jogos)
+            if len(jogos): escritor.escrever(estrategia, jogos)
+            feitos += len(jogos)
+            if progresso: progresso(estrategia, feitos, n)
+    finally:
+        for _, fut in pendentes: fut.cancel()
+    return feitos
+
+
+def gerar(motor, estrategias, n, escritor, seed, workers=None, bloco=BLOCO, salvos=None, unicos=False,
+          progresso=None, consulta=None):
+    """
+    Gera n palpites por estratégia e entrega cada bloco ao `escritor`, na ordem.
+    unicos: também não repete palpites entre blocos/estratégias (índice em memória, 8 bytes por jogo).
+    consulta: filtro de características (motores/caracteristicas.py) aplicado dentro de cada bloco.
+    Retorna ({estratégia: palpites gravados}, {estratégia: erro}); uma estratégia
+    que falha (ex.: pool com menos combinações que n) não impede as outras.
+    """
+    workers = workers or os.cpu_count() or 1
+    args = (type(motor), motor.config, motor.matriz, motor.concursos, salvos)
+    if workers > 1: executor = ProcessPoolExecutor(max_workers=workers, initializer=_preparar, initargs=args)
+    else: executor = _Local(_preparar, args)
+    vistos = IndiceJogos(motor.max_dezenas, motor.tamanho_jogo) if unicos else None
+    totais, erros = {}, {}
+    try:
+        for j, estrategia in enumerate(estrategias):
+            try: totais[estrategia] = gerar_estrategia(executor, 2 * workers, estrategia, j, n, escritor, seed,
+                                                       bloco, vistos, progresso, consulta)
+            except ValueError as e: erros[estrategia] = str(e)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return totais, erros
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Geração em massa de palpites (sem o Streamlit)")
+    ap.add_argument("loteria", help="nome da loteria no config (ex.: 'Mega Sena')")
+    ap.add_argument("-n", "--quantidade", type=int, required=True, help="palpites por estratégia")
+    ap.add_argument("--estrategias", default=",".join(ESTRATEGIAS))
+    ap.add_argument("--saida", required=True, help=".csv, .csv.gz ou .parquet")
+    ap.add_argument("--seed", type=int, help="semente (padrão: aleatória, mostrada no fim para reproduzir)")
+    ap.add_argument("--workers", type=int, help="processos (padrão: núcleos da máquina)")
+    ap.add_argument("--bloco", type=int, default=BLOCO, help="palpites por tarefa")
+    ap.add_argument("--unicos", action="store_true", help="sem palpites repetidos no arquivo inteiro")
+    ap.add_argument("--filtro", help="só palpites que passam na consulta (ex.: 'soma >= 150 and max_seq <= 2')")
+    ap.add_argument("--config", help="config_loterias.json (padrão: última cópia remota boa ou a do repositório)")
+    fonte = ap.add_mutually_exclusive_group()
+    fonte.add_argument("--historico", help="CSV/Parquet com o histórico no formato da aba")
+    fonte.add_argument("--sqlite", nargs="?", const="", help="backend SQLite do app (caminho opcional)")
+    fonte.add_argument("--credenciais", help="JSON da conta de serviço do Google (lê a planilha)")
+    args = ap.parse_args(argv)
+
+    carregador = CarregadorConfig(arquivo_local=args.config, caminho_cache=None) if args.config else CarregadorConfig()
+    config = carregador.atual()
+    if config is None: ap.error(f"config indisponível: {carregador.ultimo_erro}")
+    if args.loteria not in config.loterias: ap.error(f"loteria desconhecida; opções: {', '.join(config.loterias)}")
+    cfg = config.loterias[args.loteria]
+    estrategias = [e.strip() for e in args.estrategias.split(",") if e.strip()]
+
+    armazem = abrir_armazenamento(args.sqlite, args.credenciais, config.spreadsheet_id)
+    df, palpites = carregar_historico(cfg, args.historico, armazem)
+    if df is None or df.empty: ap.error("histórico vazio ou indisponível")
+    motor = obter_motor(args.loteria, df, cfg)
+    salvos = None
+    if palpites is not None and "Dezenas" in palpites.columns:
+        salvos = parse_jogos_texto(palpites["Dezenas"], cfg.max_dezenas)
+    if args.filtro:
+        try: motor.caracteristicas.filtrar(args.filtro, ultimos=1)
+        except Exception as e: ap.error(f"--filtro inválido: {e}")
+    seed = args.seed if args.seed is not None else int(np.random.SeedSequence().entropy % (1 << 63))
+
+    inicio = time.perf_counter()
+    comeco = {}
+
+    def progresso(estrategia, feitos, n):
+        t0 = comeco.setdefault(estrategia, time.perf_counter())
+        taxa = feitos / max(time.perf_counter() - t0, 1e-9)
+        print(f"\r{estrategia:<12} {feitos:>12,}/{n:,}  ({taxa:,.0f} jogos/s)   ", end="", file=sys.stderr, flush=True)
+
+    try: escritor = abrir_saida(args.saida, motor.tamanho_jogo)
+    except ImportError as e: ap.error(f"Parquet precisa do pyarrow ({e})")
+    try:
+        totais, erros = gerar(motor, estrategias, args.quantidade, escritor, seed, args.workers, args.bloco,
+                              salvos, args.unicos, progresso, args.filtro)
+    finally:
+        escritor.fechar()
+    print(file=sys.stderr)
+    for e, msg in erros.items(): print(f"❌ {e}: {msg}", file=sys.stderr)
+    total = sum(totais.values())
+    print(f"✅ {total:,} palpites de {len(df)} sorteios em {time.perf_counter() - inicio:.1f} s -> {args.saida} (seed {seed})")
+    return 1 if erros else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
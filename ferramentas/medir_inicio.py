@@ -0,0 +1,74 @@
+"""
+Mede o custo de importação do app (cold start) com `python -X importtime`.
+
+Roda um interpretador novo importando os mesmos módulos que o app.py carrega
+no topo e mostra os mais caros (tempo acumulado). Sai com código 1 se o total
+passar do orçamento, para poder rodar no CI.
+
+    python -m ferramentas.medir_inicio [--orcamento-ms 1500] [--top 15]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# O que o app.py importa antes de desenhar a primeira tela
+MODULOS_INICIO = [
+    "streamlit",
+    "motores.registro",
+    "interface.dashboard_cards",
+    "infra.armazenamento",
+    "infra.carregador",
+    "infra.conferencia",
+    "infra.configuracao",
+    "infra.fila_gravacao",
+    "infra.premios",
+    "infra.rastreio",
+    "infra.snapshots",
+]
+# Não devem aparecer no cold start (são carregados sob demanda)
+PROIBIDOS = ["gspread", "oauth2client", "requests", "motores.mega_sena", "motores.lotofacil"]
+
+ORCAMENTO_MS = 1500
+
+
+def medir(modulos=None):
+    """Lista de (módulo, self_us, acumulado_us) na ordem em que o importtime reporta."""
+    codigo = "; ".join(f"import {m}" for m in (modulos or MODULOS_INICIO))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo], cwd=RAIZ,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "falha ao importar")
+    linhas = []
+    for ln in proc.stderr.splitlines():
+        if not ln.startswith("import time:") or "self [us]" in ln: continue
+        proprio, acumulado, nome = ln[len("import time:"):].split("|", 2)
+        linhas.append((nome.rstrip()[1:], int(proprio), int(acumulado)))  # 1º espaço é separador
+    return linhas
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--orcamento-ms", type=float, default=ORCAMENTO_MS)
+    ap.add_argument("--top", type=int, default=15)
+    args = ap.parse_args(argv)
+
+    linhas = medir()
+    # Topo da árvore = nomes sem indentação; a soma deles é o custo total
+    raizes = [(n.strip(), a) for n, _, a in linhas if not n.startswith(" ")]
+    total_ms = sum(a for _, a in raizes) / 1000
+    print(f"{'módulo':<40} {'acumulado (ms)':>15}")
+    for nome, acumulado in sorted(raizes, key=lambda x: -x[1])[:args.top]:
+        print(f"{nome:<40} {acumulado / 1000:>15.1f}")
+    print(f"{'TOTAL':<40} {total_ms:>15.1f}   (orçamento: {args.orcamento_ms:.0f} ms)")
+
+    carregados = {n.strip() for n, _, _ in linhas}
+    vazados = [m for m in PROIBIDOS if m in carregados]
+    if vazados: print(f"⚠️ Importados no cold start (deveriam ser sob demanda): {', '.join(vazados)}")
+    return 1 if total_ms > args.orcamento_ms or vazados else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
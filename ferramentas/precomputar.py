@@ -0,0 +1,85 @@
+"""
+Publica os snapshots de análise (infra/snapshots.py) que o dashboard serve.
+
+Para cada loteria: lê o histórico, monta o motor (obter_motor), busca o
+prêmio e, se algo mudou desde a versão em vigor (concurso, status/prêmio da
+planilha ou da API), calcula get_stats, analisar_sinal e o card e publica uma
+versão nova. Sem mudança, só marca a versão em vigor como conferida (o app
+ignora snapshots que passam de snapshots.MAX_IDADE sem conferência).
+
+    python -m ferramentas.precomputar --sqlite
+    python -m ferramentas.precomputar --credenciais conta.json --api-url https://... --loop 900
+
+Com --loop, repete a cada N segundos (agendador local); sem ele, roda uma vez
+(para cron/CI).
+"""
+import argparse
+import sys
+import time
+
+from infra import snapshots
+from infra.configuracao import CarregadorConfig
+from interface.dashboard_cards import gerar_html_card
+from motores.registro import obter_motor
+
+from .gerar import abrir_armazenamento, carregar_historico
+
+
+def precomputar(config, armazem=None, cliente=None, loterias=None, pasta=snapshots.PASTA_PADRAO, forcar=False):
+    """{loteria: 'publicado <versão>' | 'sem mudança' | 'erro: ...'}"""
+    resultado = {}
+    for nome, cfg in config.loterias.items():
+        if loterias and nome not in loterias: continue
+        try:
+            df, _ = carregar_historico(cfg, armazem=armazem)
+            if df is None or df.empty: raise ValueError("histórico vazio")
+            motor = obter_motor(nome, df, cfg)
+            premio = cliente.obter(nome) if cliente else None
+            vigente = snapshots.abrir(nome, pasta=pasta)
+            if not forcar and vigente and vigente.meta.get("impressao") == snapshots.impressao(motor, premio):
+                snapshots.confirmar(nome, pasta)
+                resultado[nome] = "sem mudança"
+                continue
+            snap = snapshots.publicar(nome, motor, premio, gerar_html_card(nome, motor, premio), pasta)
+            resultado[nome] = f"publicado {snap.versao}"
+        except Exception as e:
+            resultado[nome] = f"erro: {e}"
+    return resultado
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Pré-calcula os snapshots do dashboard")
+    ap.add_argument("--loterias", help="nomes separados por vírgula (padrão: todas)")
+    ap.add_argument("--pasta", default=snapshots.PASTA_PADRAO)
+    ap.add_argument("--api-url", help="url_base da API de prêmios (a mesma dos secrets do app)")
+    ap.add_argument("--loop", type=float, help="repete a cada N segundos")
+    ap.add_argument("--forcar", action="store_true", help="publica mesmo sem mudança")
+    ap.add_argument("--config", help="config_loterias.json (padrão: última cópia remota boa ou a do repositório)")
+    fonte = ap.add_mutually_exclusive_group()
+    fonte.add_argument("--sqlite", nargs="?", const="", help="backend SQLite do app (caminho opcional)")
+    fonte.add_argument("--credenciais", help="JSON da conta de serviço do Google (lê a planilha)")
+    args = ap.parse_args(argv)
+
+    carregador = CarregadorConfig(arquivo_local=args.config, caminho_cache=None) if args.config else CarregadorConfig()
+    config = carregador.atual()
+    if config is None: ap.error(f"config indisponível: {carregador.ultimo_erro}")
+    loterias = [x.strip() for x in args.loterias.split(",")] if args.loterias else None
+    armazem = abrir_armazenamento(args.sqlite, args.credenciais, config.spreadsheet_id)
+    cliente = None
+    if args.api_url:
+        from infra.premios import ClientePremios
+        cliente = ClientePremios(args.api_url)
+
+    while True:
+        inicio = time.perf_counter()
+        config = carregador.atual() or config
+        resultado = precomputar(config, armazem, cliente, loterias, args.pasta, args.forcar)
+        for nome, r in resultado.items(): print(f"{time.strftime('%H:%M:%S')} {nome:<14} {r}", flush=True)
+        print(f"   ({time.perf_counter() - inicio:.1f} s)", flush=True)
+        if not args.loop: return 1 if any(r.startswith("erro") for r in resultado.values()) else 0
+        try: time.sleep(args.loop)
+        except KeyboardInterrupt: return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
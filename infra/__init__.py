@@ -0,0 +1,2 @@
+# Arquivo: infra/__init__.py
+# Infraestrutura de dados (cache local, planilhas, APIs) usada pelo app.
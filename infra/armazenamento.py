@@ -0,0 +1,365 @@
+"""
+Camada de persistência do app com backends trocáveis.
+
+- ArmazenamentoSheets: Google Sheets (gspread), com o histórico servido pelo cache local
+- ArmazenamentoSQLite: arquivo SQLite local, sem cotas de API; útil para rodar sob carga
+
+Os dois expõem a mesma interface (ler, inserir, apagar, por_concurso,
+gravar_conferencia). DataFrames voltam sempre como strings, no formato de
+`get_data`; o índice do DataFrame identifica a linha para gravações posteriores.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+
+from . import historico_local
+from .historico_local import coluna_a1
+
+CABECALHO_PALPITES = ["Data", "Concurso Alvo", "Dezenas", "Estratégia", "Acertos", "Status"]
+COLUNAS_CHAVE = ("Concurso Alvo", "Concurso")  # coluna indexada, na ordem de preferência
+
+MODOS_EXCLUSAO = ("Últimos N", "Por Concurso", "Limpar Tudo")
+
+
+def _coluna_chave(cabecalho):
+    return next((c for c in COLUNAS_CHAVE if c in cabecalho), None)
+
+
+class Armazenamento(ABC):
+    """Interface comum dos backends."""
+    nome = "?"
+
+    @abstractmethod
+    def ler(self, aba, fresco=False):
+        """DataFrame da aba inteira (ou None se não existir/estiver vazia). fresco: sem cache."""
+
+    def ler_historico(self, aba):
+        return self.ler(aba)
+
+    def invalidar(self, aba=None):
+        """Descarta leituras em cache depois de uma escrita (no-op em backends sem cache)."""
+
+    @abstractmethod
+    def inserir(self, aba, linhas, cabecalho=CABECALHO_PALPITES):
+        """Acrescenta várias linhas de uma vez, criando a aba se preciso."""
+
+    @abstractmethod
+    def apagar(self, aba, modo, val):
+        """Remove linhas ('Últimos N', 'Por Concurso', 'Limpar Tudo'). Retorna quantas saíram."""
+
+    def por_concurso(self, aba, alvo):
+        df = self.ler(aba)
+        if df is None: return None
+        col = _coluna_chave(list(df.columns))
+        return df[df[col] == str(alvo)] if col else df.iloc[0:0]
+
+    @abstractmethod
+    def gravar_conferencia(self, aba, df, posicoes, acertos, status):
+        """Grava Acertos/Status das linhas `posicoes` (posições em `df`, vindo de `ler`)."""
+
+
+# --- GOOGLE SHEETS ---
+
+SONDA_TTL = 15.0    # segundos em que a leitura anterior vale sem nem sondar
+MAX_IDADE = 600.0   # depois disso relê a aba inteira mesmo com a sonda igual (edição no meio da planilha)
+
+
+def _aparar(linha):
+    """Como o Sheets devolve: sem as células vazias do fim."""
+    linha = [str(v) for v in (linha or [])]
+    while linha and linha[-1] == "": linha.pop()
+    return linha
+
+
+def _impressao(data):
+    """Cabeçalho, primeira e última linha de dados e o número de linhas: o que a sonda confere."""
+    n = len(data)
+    return (_aparar(data[0]) if n else [], _aparar(data[1]) if n > 1 else [], _aparar(data[-1]) if n > 1 else [], n)
+
+
+class _Leitura:
+    __slots__ = ("df", "impressao", "lido", "verificado")
+
+    def __init__(self, df, impressao):
+        self.df = df
+        self.impressao = impressao
+        self.lido = self.verificado = time.monotonic()
+
+
+class ArmazenamentoSheets(Armazenamento):
+    """
+    Leituras ficam num cache do processo (compartilhado entre sessões). Antes de
+    reler uma aba inteira, uma sonda de uma chamada (batch_get de 4 linhas:
+    cabeçalho, primeira linha, última linha conhecida e a seguinte) confere se
+    algo mudou; as escritas deste backend invalidam a aba na hora.
+    """
+    nome = "Google Sheets"
+
+    def __init__(self, conn, sonda_ttl=SONDA_TTL, max_idade=MAX_IDADE):
+        self.conn = conn
+        self.sonda_ttl = sonda_ttl
+        self.max_idade = max_idade
+        self._lock = threading.Lock()
+        self._travas = {}     # aba -> Lock: uma leitura por aba por vez (as outras sessões esperam e reaproveitam)
+        self._leituras = {}   # aba -> _Leitura
+        self._abas = {}       # aba -> Worksheet (conn.worksheet busca metadados da planilha a cada chamada)
+        self._sync = {}       # aba -> (instante da última sincronização, (concurso, total), DataFrame)
+        self.contadores = {"cache": 0, "sondas": 0, "leituras": 0, "sincronizacoes": 0}
+
+    def _trava(self, aba):
+        with self._lock: return self._travas.setdefault(aba, threading.Lock())
+
+    def _ws(self, aba):
+        ws = self._abas.get(aba)
+        if ws is None: ws = self._abas[aba] = self.conn.worksheet(aba)
+        return ws
+
+    def _contar(self, chave):
+        with self._lock: self.contadores[chave] += 1
+
+    def invalidar(self, aba=None):
+        """Esquece a leitura em cache (de uma aba ou de todas)."""
+        with self._lock:
+            if aba is None: self._leituras.clear(); self._sync.clear()
+            else: self._leituras.pop(aba, None); self._sync.pop(aba, None)
+
+    def _sondar(self, ws, impressao):
+        """True se as 4 linhas da sonda batem com a leitura em cache."""
+        cab, primeira, ultima, n = impressao
+        self._contar("sondas")
+        n_ = max(n, 1)
+        topo, fim = ws.batch_get(["1:2", f"{n_}:{n_ + 1}"])
+        topo, fim = list(topo) + [[], []], list(fim) + [[], []]
+        return (_aparar(topo[0]) == cab and _aparar(topo[1]) == primeira
+                and _aparar(fim[0]) == (ultima if n > 1 else cab) and not _aparar(fim[1]))
+
+    def ler(self, aba, fresco=False):
+        """
+        fresco=True sempre sonda (nada de SONDA_TTL): use antes de gravar por posição
+        (ex.: conferência), para não escrever em cima de linhas que mudaram de lugar.
+        """
+        with self._trava(aba):
+            e = self._leituras.get(aba)
+            agora = time.monotonic()
+            if e is not None and not fresco and agora - e.verificado < self.sonda_ttl:
+                self._contar("cache")
+                return None if e.df is None else e.df.copy()
+            try:
+                ws = self._ws(aba)
+                if e is not None and agora - e.lido < self.max_idade and self._sondar(ws, e.impressao):
+                    e.verificado = agora
+                    return None if e.df is None else e.df.copy()
+                self._contar("leituras")
+                data = ws.get_all_values()
+            except Exception:
+                self._abas.pop(aba, None)  # aba recriada/renomeada: busca de novo na próxima
+                raise
+            df = pd.DataFrame(data[1:], columns=data[0]) if len(data) >= 2 else None
+            self._leituras[aba] = _Leitura(df, _impressao(data))
+            return None if df is None else df.copy()
+
+    def ler_historico(self, aba):
+        """
+        Histórico via cache local: baixa só os concursos novos e lê o resto do disco.
+        Dentro de SONDA_TTL nem a sonda do concurso mais recente é feita, e o
+        DataFrame montado do disco é reaproveitado enquanto o cache local não muda.
+        """
+        local = historico_local.abrir(aba)
+        with self._trava(("historico", aba)):
+            instante, versao, df = self._sync.get(aba, (None, None, None))
+            agora = time.monotonic()
+            if instante is None or agora - instante >= self.sonda_ttl:
+                self._contar("sincronizacoes")
+                try: local.sincronizar(self._ws(aba))
+                except Exception: pass  # Sem rede/planilha: serve o que já está no disco
+                instante = agora
+            else: self._contar("cache")
+            atual = local.versao()
+            if df is None or atual != versao: df = local.carregar()
+            with self._lock: self._sync[aba] = (instante, atual, df)
+        return df.copy() if df is not None else self.ler(aba)
+
+    def _aba(self, aba, cabecalho):
+        try: return self._ws(aba)
+        except Exception:
+            ws = self._abas[aba] = self.conn.add_worksheet(title=aba, rows=1000, cols=10)
+            ws.append_row(cabecalho)
+            return ws
+
+    def inserir(self, aba, linhas, cabecalho=CABECALHO_PALPITES):
+        if not linhas: return 0
+        try: self._aba(aba, cabecalho).append_rows([list(r) for r in linhas])
+        finally: self.invalidar(aba)
+        return len(linhas)
+
+    def apagar(self, aba, modo, val):
+        try: return self._apagar(aba, modo, val)
+        finally: self.invalidar(aba)
+
+    def _apagar(self, aba, modo, val):
+        ws = self._ws(aba)
+        cabecalho = ws.row_values(1)
+        col = _coluna_chave(cabecalho)
+        # Só a coluna-chave é lida; a exclusão mexe apenas nas linhas removidas
+        chaves = ws.col_values(cabecalho.index(col) + 1 if col else 1)[1:]
+        total = len(chaves)
+        if modo == "Limpar Tudo": alvo = list(range(total))
+        elif modo == "Últimos N": alvo = list(range(max(0, total - int(val)), total))
+        elif modo == "Por Concurso": alvo = [i for i, c in enumerate(chaves) if c == str(val)]
+        else: raise ValueError(f"Modo desconhecido: {modo}")
+        # Faixas contíguas, de baixo para cima (os índices de cima não mudam), todas num único
+        # spreadsheets.batchUpdate: uma escrita na cota por exclusão, por mais espalhadas que estejam
+        pedidos = [{"deleteDimension": {"range": {"sheetId": ws.id, "dimension": "ROWS",
+                                                  "startIndex": ini + 1, "endIndex": fim + 2}}}
+                   for ini, fim in reversed(_faixas(alvo))]
+        if pedidos: self.conn.batch_update({"requests": pedidos})
+        return len(alvo)
+
+    def gravar_conferencia(self, aba, df, posicoes, acertos, status):
+        if len(posicoes) == 0: return
+        try: self._gravar_conferencia(aba, df, posicoes, acertos, status)
+        finally: self.invalidar(aba)
+
+    def _gravar_conferencia(self, aba, df, posicoes, acertos, status):
+        ws = self._ws(aba)
+        header = list(df.columns)
+        # Só as células Acertos/Status das linhas afetadas: uma faixa por trecho contíguo, tudo num batch_update
+        pos = np.asarray(posicoes)
+        ordem = np.argsort(pos, kind="stable")
+        pos = pos[ordem]
+        novos_acertos = np.asarray(acertos).astype(str)[ordem]
+        novos_status = np.broadcast_to(np.asarray(status, dtype=object), pos.shape)[ordem]
+
+        c_ac, c_st = header.index('Acertos') + 1, header.index('Status') + 1
+        dados, k = [], 0
+        for ini, fim in _faixas(pos.tolist()):
+            n = fim - ini + 1
+            ac, st = novos_acertos[k:k + n], novos_status[k:k + n]
+            k += n
+            l_ini, l_fim = ini + 2, fim + 2  # +1 do cabeçalho, +1 porque a planilha começa em 1
+            if c_st == c_ac + 1:
+                dados.append({"range": f"{coluna_a1(c_ac)}{l_ini}:{coluna_a1(c_st)}{l_fim}",
+                              "values": np.column_stack([ac, st]).tolist()})
+            else:
+                dados.append({"range": f"{coluna_a1(c_ac)}{l_ini}:{coluna_a1(c_ac)}{l_fim}", "values": ac[:, None].tolist()})
+                dados.append({"range": f"{coluna_a1(c_st)}{l_ini}:{coluna_a1(c_st)}{l_fim}", "values": st[:, None].tolist()})
+        ws.batch_update(dados)
+
+def _faixas(indices):
+    """[1, 2, 3, 7, 8] -> [(1, 3), (7, 8)]"""
+    out = []
+    for i in indices:
+        if out and i == out[-1][1] + 1: out[-1] = (out[-1][0], i)
+        else: out.append((i, i))
+    return out
+
+
+# --- SQLITE LOCAL ---
+
+PASTA_PADRAO = os.path.join(os.path.dirname(historico_local.PASTA_PADRAO), "dados")
+
+
+class ArmazenamentoSQLite(Armazenamento):
+    """
+    Todas as abas num único arquivo: tabela `linhas(id, aba, chave, dados)` com
+    índice em (aba, chave) — chave = 'Concurso Alvo' (palpites) ou 'Concurso' (histórico).
+    """
+    nome = "SQLite local"
+
+    def __init__(self, caminho=None):
+        caminho = caminho or os.path.join(PASTA_PADRAO, "oraculo.sqlite")
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        self.caminho = caminho
+        self._db = sqlite3.connect(caminho, check_same_thread=False)
+        self._lock = threading.RLock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS abas (aba TEXT PRIMARY KEY, cabecalho TEXT NOT NULL)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS linhas (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                             "aba TEXT NOT NULL, chave TEXT, dados TEXT NOT NULL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_linhas_chave ON linhas (aba, chave)")
+            self._db.commit()
+
+    def _cabecalho(self, aba):
+        r = self._db.execute("SELECT cabecalho FROM abas WHERE aba = ?", (aba,)).fetchone()
+        return json.loads(r[0]) if r else None
+
+    def _df(self, cabecalho, registros):
+        if not registros: return None
+        ids = [r[0] for r in registros]
+        return pd.DataFrame([json.loads(r[1]) for r in registros], columns=cabecalho, index=pd.Index(ids, name="id"))
+
+    def ler(self, aba, fresco=False):
+        with self._lock:
+            cab = self._cabecalho(aba)
+            if cab is None: return None
+            registros = self._db.execute("SELECT id, dados FROM linhas WHERE aba = ? ORDER BY id", (aba,)).fetchall()
+        return self._df(cab, registros)
+
+    def por_concurso(self, aba, alvo):
+        with self._lock:
+            cab = self._cabecalho(aba)
+            if cab is None: return None
+            registros = self._db.execute("SELECT id, dados FROM linhas WHERE aba = ? AND chave = ? ORDER BY id",
+                                         (aba, str(alvo))).fetchall()
+        return self._df(cab, registros) if registros else pd.DataFrame(columns=cab)
+
+    def inserir(self, aba, linhas, cabecalho=CABECALHO_PALPITES):
+        if not linhas: return 0
+        with self._lock:
+            cab = self._cabecalho(aba)
+            if cab is None:
+                cab = list(cabecalho)
+                self._db.execute("INSERT INTO abas (aba, cabecalho) VALUES (?, ?)", (aba, json.dumps(cab, ensure_ascii=False)))
+            col = _coluna_chave(cab)
+            i_chave = cab.index(col) if col else None
+            n = len(cab)
+            registros = []
+            for r in linhas:
+                r = ([str(v) for v in r] + [""] * n)[:n]
+                registros.append((aba, r[i_chave] if i_chave is not None else None, json.dumps(r, ensure_ascii=False)))
+            self._db.executemany("INSERT INTO linhas (aba, chave, dados) VALUES (?, ?, ?)", registros)
+            self._db.commit()
+        return len(registros)
+
+    def apagar(self, aba, modo, val):
+        with self._lock:
+            if modo == "Limpar Tudo":
+                cur = self._db.execute("DELETE FROM linhas WHERE aba = ?", (aba,))
+            elif modo == "Últimos N":
+                cur = self._db.execute("DELETE FROM linhas WHERE id IN (SELECT id FROM linhas WHERE aba = ? "
+                                       "ORDER BY id DESC LIMIT ?)", (aba, int(val)))
+            elif modo == "Por Concurso":
+                cur = self._db.execute("DELETE FROM linhas WHERE aba = ? AND chave = ?", (aba, str(val)))
+            else: raise ValueError(f"Modo desconhecido: {modo}")
+            self._db.commit()
+        return cur.rowcount
+
+    def gravar_conferencia(self, aba, df, posicoes, acertos, status):
+        if len(posicoes) == 0: return
+        header = list(df.columns)
+        i_ac, i_st = header.index('Acertos'), header.index('Status')
+        ids = df.index.to_numpy()[np.asarray(posicoes)]
+        linhas = df.iloc[np.asarray(posicoes)].to_numpy(dtype=object)
+        linhas[:, i_ac] = np.asarray(acertos).astype(str)
+        linhas[:, i_st] = status
+        with self._lock:
+            self._db.executemany("UPDATE linhas SET dados = ? WHERE id = ?",
+                                 [(json.dumps(list(r), ensure_ascii=False), int(i)) for r, i in zip(linhas, ids)])
+            self._db.commit()
+
+
+def copiar_abas(origem, destino, abas):
+    """Copia abas inteiras de um backend para outro (ex.: semear o SQLite a partir da planilha)."""
+    total = 0
+    for aba in abas:
+        df = origem.ler(aba)
+        if df is None: continue
+        total += destino.inserir(aba, df.values.tolist(), cabecalho=list(df.columns))
+    return total
@@ -0,0 +1,94 @@
+"""
+Carregamento concorrente dos cards do dashboard.
+
+Cada loteria precisa de duas chamadas de rede (aba do histórico e prêmio na
+API). Aqui todas são disparadas de uma vez num pool de threads e cada card é
+entregue assim que o seu histórico chega (com o prêmio da planilha); se o
+valor da API chegar depois, o mesmo card é entregue de novo para atualizar.
+Vale um prazo por chamada e um orçamento total para a página.
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+PRAZO_CHAMADA = 8.0     # segundos por chamada
+ORCAMENTO_PAGINA = 12.0  # segundos para a página inteira
+
+
+class ResultadoCard:
+    """O que o dashboard precisa para desenhar um card (ou a versão degradada)."""
+
+    def __init__(self, nome, cfg):
+        self.nome = nome
+        self.cfg = cfg
+        self.df = None
+        self.premio = None
+        self.erro = None
+        self.entregue = False  # já saiu uma vez (sem o prêmio da API)
+        self._pendentes = {"historico", "premio"}
+
+    @property
+    def pronto(self):
+        return not self._pendentes
+
+    @property
+    def premio_pendente(self):
+        return "premio" in self._pendentes
+
+    @property
+    def ok(self):
+        return self.erro is None and self.df is not None and not self.df.empty
+
+
+def carregar_cards(itens, buscar_historico, buscar_premio, prazo=PRAZO_CHAMADA,
+                   orcamento=ORCAMENTO_PAGINA, max_workers=None, inicializador=None):
+    """
+    itens: lista de (nome_loteria, cfg).
+    buscar_historico(cfg) -> DataFrame | None ; buscar_premio(nome) -> valor | None.
+    Gera ResultadoCard assim que o histórico de cada um chega, sem esperar o
+    prêmio (premio_pendente diz se ele ainda vem); quando o prêmio chega depois
+    com valor, gera o mesmo card de novo (entregue=True). Chamadas que estouram
+    o prazo viram erro (histórico) ou None (prêmio) sem segurar as demais.
+    """
+    inicio = time.monotonic()
+    fim_pagina = inicio + orcamento
+    cards = {nome: ResultadoCard(nome, cfg) for nome, cfg in itens}
+    pool = ThreadPoolExecutor(max_workers=max_workers or 2 * max(len(cards), 1),
+                              thread_name_prefix="card", initializer=inicializador)
+    futuros = {}
+    try:
+        for nome, cfg in itens:
+            futuros[pool.submit(buscar_historico, cfg)] = (nome, "historico", time.monotonic() + prazo)
+            futuros[pool.submit(buscar_premio, nome)] = (nome, "premio", time.monotonic() + prazo)
+
+        pendentes = set(futuros)
+        while pendentes:
+            agora = time.monotonic()
+            limite = min(min(futuros[f][2] for f in pendentes), fim_pagina)
+            prontos, pendentes = wait(pendentes, timeout=max(0.0, limite - agora), return_when=FIRST_COMPLETED)
+
+            agora = time.monotonic()
+            vencidos = {f for f in pendentes if agora >= min(futuros[f][2], fim_pagina)}
+            pendentes -= vencidos
+
+            for f in prontos | vencidos:
+                nome, parte, _ = futuros[f]
+                card = cards[nome]
+                card._pendentes.discard(parte)
+                if f in vencidos:
+                    f.cancel()
+                    if parte == "historico": card.erro = "Tempo esgotado"
+                elif f.exception() is not None:
+                    if parte == "historico": card.erro = str(f.exception()) or "Falha na planilha"
+                elif parte == "historico":
+                    card.df = f.result()
+                else:
+                    card.premio = f.result()
+
+                if parte == "historico":
+                    yield card
+                    card.entregue = True
+                elif card.entregue and card.ok and card.premio is not None:
+                    yield card  # o valor da API chegou depois do card
+    finally:
+        # Não espera chamadas presas: elas terminam sozinhas em segundo plano
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,62 @@
+"""
+Conferência em massa dos palpites salvos contra os resultados.
+
+Lê a aba de palpites uma vez, converte a coluna 'Dezenas' inteira para
+bitmasks, cruza cada linha pendente com o sorteio do seu 'Concurso Alvo' e
+conta os acertos com AND + popcount. Tudo volta para a planilha numa única
+gravação em lote (no Sheets, um batch_update com Acertos + Status), e não
+uma escrita por célula. A escrita fica a cargo do backend (infra/armazenamento.py).
+"""
+import numpy as np
+import pandas as pd
+
+from motores.matriz import acertos, para_mascaras, parse_jogos_texto
+
+STATUS_PENDENTE = "Pendente"
+STATUS_CONFERIDO = "Conferido"
+
+
+def calcular_acertos(df_palpites, motor):
+    """
+    Para cada linha pendente cujo concurso alvo já está no histórico do motor,
+    devolve (posições das linhas, acertos). Vetorizado sobre a aba inteira.
+    """
+    if df_palpites is None or df_palpites.empty or motor.vazio:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    status = df_palpites.get('Status', pd.Series([""] * len(df_palpites))).astype(str).str.strip()
+    pendente = (status == STATUS_PENDENTE) | (status == "")
+    alvo = pd.to_numeric(df_palpites['Concurso Alvo'], errors='coerce').fillna(-1).to_numpy(dtype=np.int64)
+
+    # Concurso -> linha da matriz do motor (busca binária num índice ordenado)
+    ordem = np.argsort(motor.concursos, kind='stable')
+    concs = motor.concursos[ordem]
+    pos = np.clip(np.searchsorted(concs, alvo), 0, max(len(concs) - 1, 0))
+    achou = (len(concs) > 0) & (concs[pos] == alvo)
+
+    linhas = np.flatnonzero(pendente.to_numpy() & achou)
+    if linhas.size == 0:
+        return linhas, np.zeros(0, dtype=np.int64)
+
+    jogos = parse_jogos_texto(df_palpites['Dezenas'].iloc[linhas], motor.max_dezenas)
+    resultados = motor.mascaras[ordem[pos[linhas]]]
+    return linhas, acertos(para_mascaras(jogos), resultados)
+
+
+def conferir(armazem, aba, motor):
+    """
+    Confere todos os palpites pendentes de `aba` e grava o resultado de uma vez
+    (Sheets: um único batch_update). Retorna (ok, mensagem, distribuição de acertos).
+    """
+    # Sem cache: as posições de `df` vão direto para a gravação
+    df = armazem.ler(aba, fresco=True)
+    if df is None or df.empty: return False, "Vazio", {}
+    for col in ('Concurso Alvo', 'Dezenas', 'Acertos', 'Status'):
+        if col not in df.columns: return False, f"Coluna '{col}' não encontrada", {}
+
+    linhas, hits = calcular_acertos(df, motor)
+    if linhas.size == 0: return True, "Nenhum palpite pendente com resultado disponível.", {}
+    armazem.gravar_conferencia(aba, df, linhas, hits, STATUS_CONFERIDO)
+
+    dist = {int(a): int(c) for a, c in enumerate(np.bincount(hits)) if c}
+    return True, f"✅ {linhas.size} palpites conferidos.", dist
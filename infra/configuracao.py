@@ -0,0 +1,186 @@
+"""
+Configuração das loterias: validação e carga sem bloquear a página.
+
+`validar` transforma o JSON numa estrutura imutável e tipada (ConfigApp com
+um ConfigLoteria por loteria), conferida uma vez só. ConfigLoteria também se
+comporta como Mapping (`cfg['max_dezenas']`, `cfg.get('filtros')`), então os
+motores e ferramentas que recebem dicts continuam funcionando.
+
+`CarregadorConfig` responde na hora com a última cópia remota boa (cache em
+disco) ou, na falta dela, com o config_loterias.json do repositório; a cópia
+remota é buscada em segundo plano, com timeout, e só substitui a atual se
+passar na validação.
+"""
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from . import historico_local
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARQUIVO_LOCAL = os.path.join(RAIZ, "config_loterias.json")
+CACHE_PADRAO = os.path.join(os.path.dirname(historico_local.PASTA_PADRAO), "config", "config_remota.json")
+TIMEOUT = 5.0    # segundos para baixar a cópia remota
+TTL = 600.0      # intervalo entre atualizações da cópia remota
+
+MAX_DEZENAS_LIMITE = 255  # a matriz de sorteios é uint8
+
+
+class ErroConfig(ValueError):
+    pass
+
+
+class ConfigLoteria(Mapping):
+    """Config de uma loteria: atributos tipados, imutável, e Mapping para código legado."""
+    __slots__ = ("nome", "aba_historico", "aba_palpites", "max_dezenas", "tamanho_jogo",
+                 "filtros", "motor", "_dados")
+
+    def __init__(self, nome, dados):
+        d = dict(dados)
+        set_ = object.__setattr__
+        set_(self, "nome", nome)
+        set_(self, "aba_historico", d["aba_historico"])
+        set_(self, "aba_palpites", d["aba_palpites"])
+        set_(self, "max_dezenas", int(d["max_dezenas"]))
+        set_(self, "tamanho_jogo", int(d["tamanho_jogo"]))
+        set_(self, "filtros", d.get("filtros"))
+        set_(self, "motor", d.get("motor"))
+        d["max_dezenas"], d["tamanho_jogo"] = self.max_dezenas, self.tamanho_jogo
+        set_(self, "_dados", MappingProxyType(d))
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("ConfigLoteria é imutável")
+
+    def __getitem__(self, chave):
+        return self._dados[chave]
+
+    def __iter__(self):
+        return iter(self._dados)
+
+    def __len__(self):
+        return len(self._dados)
+
+    def __reduce__(self):
+        # Vai para os processos do backtest/CLI como (nome, dict)
+        return (ConfigLoteria, (self.nome, dict(self._dados)))
+
+    def __repr__(self):
+        return f"ConfigLoteria({self.nome!r}, {dict(self._dados)!r})"
+
+
+class ConfigApp:
+    """Config completa: spreadsheet_id + loterias (nome -> ConfigLoteria, na ordem do JSON)."""
+    __slots__ = ("spreadsheet_id", "loterias", "origem", "carregado_em")
+
+    def __init__(self, spreadsheet_id, loterias, origem):
+        set_ = object.__setattr__
+        set_(self, "spreadsheet_id", spreadsheet_id)
+        set_(self, "loterias", MappingProxyType(dict(loterias)))
+        set_(self, "origem", origem)
+        set_(self, "carregado_em", time.time())
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("ConfigApp é imutável")
+
+
+def _validar_loteria(nome, d, erros):
+    if not isinstance(d, Mapping):
+        erros.append(f"{nome}: esperado objeto"); return
+    for campo in ("aba_historico", "aba_palpites"):
+        if not isinstance(d.get(campo), str) or not d.get(campo).strip():
+            erros.append(f"{nome}: '{campo}' ausente ou vazio")
+    n, k = d.get("max_dezenas"), d.get("tamanho_jogo")
+    if not isinstance(n, int) or isinstance(n, bool) or not 1 <= n <= MAX_DEZENAS_LIMITE:
+        erros.append(f"{nome}: 'max_dezenas' deve ser inteiro entre 1 e {MAX_DEZENAS_LIMITE}")
+    elif not isinstance(k, int) or isinstance(k, bool) or not 1 <= k <= n:
+        erros.append(f"{nome}: 'tamanho_jogo' deve ser inteiro entre 1 e max_dezenas")
+    if d.get("filtros") is not None and not isinstance(d["filtros"], Mapping):
+        erros.append(f"{nome}: 'filtros' deve ser objeto")
+    if d.get("motor") is not None and (not isinstance(d["motor"], str) or ":" not in d["motor"]):
+        erros.append(f"{nome}: 'motor' deve ser 'modulo:Classe'")
+
+
+def validar(dados, origem="?"):
+    """JSON (dict) -> ConfigApp. Levanta ErroConfig listando todos os problemas."""
+    if not isinstance(dados, Mapping): raise ErroConfig(f"{origem}: esperado objeto JSON")
+    erros = []
+    sid = dados.get("spreadsheet_id", "")
+    if not isinstance(sid, str): erros.append("'spreadsheet_id' deve ser texto")
+    lots = dados.get("loterias")
+    if not isinstance(lots, Mapping) or not lots:
+        erros.append("'loterias' ausente ou vazio")
+    else:
+        for nome, d in lots.items(): _validar_loteria(nome, d, erros)
+    if erros: raise ErroConfig(f"{origem}: " + "; ".join(erros))
+    return ConfigApp(sid, {nome: ConfigLoteria(nome, d) for nome, d in lots.items()}, origem)
+
+
+def ler_arquivo(caminho, origem=None):
+    with open(caminho, encoding="utf-8") as f:
+        return validar(json.load(f), origem or caminho)
+
+
+class CarregadorConfig:
+    """
+    atual() nunca espera a rede: devolve a melhor config já validada e, se a
+    cópia remota estiver vencida, dispara a atualização numa thread.
+    """
+
+    def __init__(self, url=None, arquivo_local=ARQUIVO_LOCAL, caminho_cache=CACHE_PADRAO,
+                 timeout=TIMEOUT, ttl=TTL):
+        self.url = url
+        self.arquivo_local = arquivo_local
+        self.caminho_cache = caminho_cache
+        self.timeout = timeout
+        self.ttl = ttl
+        self.ultimo_erro = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._ultima_tentativa = 0.0
+        self._atual = self._inicial()
+
+    def _inicial(self):
+        # Última cópia remota boa primeiro; depois o arquivo do repositório
+        for caminho, origem in ((self.caminho_cache, "cache"), (self.arquivo_local, "local")):
+            if not caminho or not os.path.exists(caminho): continue
+            try: return ler_arquivo(caminho, origem)
+            except Exception as e: self.ultimo_erro = str(e)
+        return None
+
+    def atual(self):
+        if self.url and time.time() - self._ultima_tentativa >= self.ttl: self.atualizar_em_segundo_plano()
+        return self._atual
+
+    def atualizar_em_segundo_plano(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive(): return self._thread
+            self._ultima_tentativa = time.time()
+            self._thread = threading.Thread(target=self.atualizar, name="config-remota", daemon=True)
+            self._thread.start()
+            return self._thread
+
+    def atualizar(self):
+        """Baixa, valida e adota a cópia remota (gravando-a como última boa). Retorna True se adotou."""
+        try:
+            import requests
+            resp = requests.get(self.url, timeout=self.timeout)
+            if resp.status_code != 200: raise ErroConfig(f"HTTP {resp.status_code}")
+            dados = json.loads(resp.text)
+            nova = validar(dados, "remota")
+        except Exception as e:
+            self.ultimo_erro = str(e)
+            return False
+        self._atual = nova
+        self.ultimo_erro = None
+        if self.caminho_cache:
+            try:
+                os.makedirs(os.path.dirname(self.caminho_cache), exist_ok=True)
+                tmp = self.caminho_cache + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(dados, f, ensure_ascii=False, indent=1)
+                os.replace(tmp, self.caminho_cache)
+            except OSError: pass
+        return True
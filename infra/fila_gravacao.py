@@ -0,0 +1,176 @@
+"""
+Fila de gravação (write-behind) para os palpites salvos.
+
+O clique em "Salvar" só grava a linha num SQLite local e volta na hora. Uma
+thread em segundo plano junta o que estiver pendente e manda um único
+`inserir` (append_rows no Sheets) por aba quando a fila passa de LIMITE_LOTE
+linhas ou quando a mais antiga espera mais que INTERVALO_MAX segundos.
+Falhas são repetidas com backoff exponencial; como a fila está em disco,
+um restart do app não perde nada (a thread retoma os pendentes ao subir).
+
+Sem duplicar no reenvio: antes do `inserir` o lote vira "enviando" no disco.
+Se o processo cair (ou a chamada falhar sem dizer se gravou) entre o
+`inserir` e a marca de "gravado", esses itens ficam incertos; no próximo
+envio a aba é relida uma vez e o que já estiver lá (mesmas células, fora
+Acertos/Status, que a conferência muda) é só marcado como gravado.
+"""
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from . import historico_local
+
+PASTA_PADRAO = os.path.join(os.path.dirname(historico_local.PASTA_PADRAO), "fila")
+LIMITE_LOTE = 50        # linhas pendentes que disparam um envio imediato
+INTERVALO_MAX = 5.0     # segundos que uma linha pode esperar na fila
+BACKOFF_MAX = 120.0     # teto do intervalo entre novas tentativas
+RETENCAO = 24 * 3600    # por quanto tempo as já gravadas ficam consultáveis
+
+PENDENTE, ENVIANDO, GRAVADO = "pendente", "enviando", "gravado"
+CAMPOS_MUTAVEIS = ("Acertos", "Status")  # a conferência reescreve; não servem para reconhecer a linha
+
+
+class FilaGravacao:
+    def __init__(self, armazem, caminho=None, limite=LIMITE_LOTE, intervalo=INTERVALO_MAX, iniciar=True):
+        caminho = caminho or os.path.join(PASTA_PADRAO, "fila.sqlite")
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        self.armazem = armazem
+        self.limite = limite
+        self.intervalo = intervalo
+        self.ultimo_erro = None
+        self._db = sqlite3.connect(caminho, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._envio = threading.Lock()  # um envio por vez (thread x parar())
+        self._acordar = threading.Event()
+        self._parar = threading.Event()
+        self._falhas = 0
+        self._proxima_tentativa = 0.0
+        with self._lock:
+            self._db.execute("CREATE TABLE IF NOT EXISTS fila (id INTEGER PRIMARY KEY AUTOINCREMENT, aba TEXT NOT NULL, "
+                             "linha TEXT NOT NULL, criado REAL NOT NULL, status TEXT NOT NULL, gravado REAL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_fila_status ON fila (status, id)")
+            self._db.commit()
+        self._thread = None
+        if iniciar: self.iniciar()
+
+    # --- API DO APP ---
+
+    def enfileirar(self, aba, linha):
+        """Grava a linha na fila local e retorna o id (não espera a planilha)."""
+        with self._lock:
+            cur = self._db.execute("INSERT INTO fila (aba, linha, criado, status) VALUES (?, ?, ?, ?)",
+                                   (aba, json.dumps([str(v) for v in linha], ensure_ascii=False), time.time(), PENDENTE))
+            self._db.commit()
+            pendentes = self._contar(PENDENTE, ENVIANDO)
+        if pendentes >= self.limite: self._acordar.set()
+        return cur.lastrowid
+
+    def status(self, ids):
+        """{id: 'pendente' | 'gravado'} para os ids pedidos (ids expirados não aparecem)."""
+        ids = list(ids)
+        if not ids: return {}
+        with self._lock:
+            marcas = ",".join("?" * len(ids))
+            r = self._db.execute(f"SELECT id, status FROM fila WHERE id IN ({marcas})", ids).fetchall()
+        return {i: PENDENTE if st == ENVIANDO else st for i, st in r}
+
+    def resumo(self):
+        with self._lock:
+            return {"pendentes": self._contar(PENDENTE, ENVIANDO), "gravados": self._contar(GRAVADO),
+                    "falhas_seguidas": self._falhas, "erro": self.ultimo_erro}
+
+    def _contar(self, *status):
+        marcas = ",".join("?" * len(status))
+        return self._db.execute(f"SELECT COUNT(*) FROM fila WHERE status IN ({marcas})", status).fetchone()[0]
+
+    # --- ENVIO ---
+
+    def descarregar(self):
+        """Envia tudo o que está pendente: uma chamada `inserir` por aba. Retorna linhas gravadas."""
+        with self._envio:
+            return self._descarregar()
+
+    def _descarregar(self):
+        with self._lock:
+            registros = self._db.execute("SELECT id, aba, linha, status FROM fila WHERE status IN (?, ?) ORDER BY id",
+                                         (PENDENTE, ENVIANDO)).fetchall()
+        por_aba = {}
+        for id_, aba, linha, status in registros:
+            por_aba.setdefault(aba, []).append((id_, json.loads(linha), status == ENVIANDO))
+
+        gravadas = 0
+        for aba, itens in por_aba.items():
+            ja_gravados = self._ja_gravados(aba, itens) if any(incerto for _, _, incerto in itens) else set()
+            enviar = [(id_, linha) for id_, linha, _ in itens if id_ not in ja_gravados]
+            self._marcar(ENVIANDO, [id_ for id_, _ in enviar])
+            if enviar: self.armazem.inserir(aba, [linha for _, linha in enviar])
+            self._marcar(GRAVADO, [id_ for id_, _, _ in itens])
+            gravadas += len(enviar)
+        with self._lock:
+            self._db.execute("DELETE FROM fila WHERE status = ? AND gravado < ?", (GRAVADO, time.time() - RETENCAO))
+            self._db.commit()
+        return gravadas
+
+    def _marcar(self, status, ids):
+        with self._lock:
+            agora = time.time() if status == GRAVADO else None
+            self._db.executemany("UPDATE fila SET status = ?, gravado = ? WHERE id = ?", [(status, agora, i) for i in ids])
+            self._db.commit()
+
+    def _ja_gravados(self, aba, itens):
+        """
+        Ids dos itens incertos (um envio anterior pode ter gravado) que já estão na aba.
+        Compara as células fora de CAMPOS_MUTAVEIS; cada linha da aba reconhece um item só.
+        """
+        df = self.armazem.ler(aba, fresco=True)
+        if df is None or df.empty: return set()
+        fixas = [i for i, c in enumerate(df.columns) if c not in CAMPOS_MUTAVEIS]
+        na_aba = Counter(tuple(r[i] for i in fixas) for r in df.to_numpy(dtype=object).tolist())
+        achados = set()
+        for id_, linha, incerto in itens:
+            if not incerto: continue
+            chave = tuple((linha[i] if i < len(linha) else "") for i in fixas)
+            if na_aba[chave] > 0:
+                na_aba[chave] -= 1
+                achados.add(id_)
+        return achados
+
+    def _deve_enviar(self):
+        with self._lock:
+            r = self._db.execute("SELECT COUNT(*), MIN(criado) FROM fila WHERE status IN (?, ?)",
+                                 (PENDENTE, ENVIANDO)).fetchone()
+        n, mais_antigo = r
+        if not n or time.time() < self._proxima_tentativa: return False
+        return n >= self.limite or time.time() - mais_antigo >= self.intervalo
+
+    def _laco(self):
+        while not self._parar.is_set():
+            self._acordar.wait(timeout=min(1.0, self.intervalo))
+            self._acordar.clear()
+            if not self._deve_enviar(): continue
+            try:
+                self.descarregar()
+                self._falhas, self.ultimo_erro, self._proxima_tentativa = 0, None, 0.0
+            except Exception as e:
+                # Backoff exponencial com jitter (cota do Sheets, rede fora...)
+                self._falhas += 1
+                self.ultimo_erro = str(e)
+                espera = min(BACKOFF_MAX, 2 ** self._falhas) * random.uniform(0.5, 1.0)
+                self._proxima_tentativa = time.time() + espera
+
+    def iniciar(self):
+        if self._thread and self._thread.is_alive(): return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._laco, name="fila-gravacao", daemon=True)
+        self._thread.start()
+        self._acordar.set()  # retoma pendentes de uma execução anterior
+
+    def parar(self, descarregar=True):
+        self._parar.set()
+        self._acordar.set()
+        if self._thread: self._thread.join(timeout=5)
+        if descarregar: self.descarregar()
@@ -0,0 +1,176 @@
+"""
+Cache local (SQLite) do histórico de cada loteria, indexado por Concurso.
+
+Em vez de baixar a aba inteira do Google Sheets a cada rerun, o app lê o
+arquivo local e pede à planilha apenas as linhas com concurso maior que o
+último já guardado (o "delta") mais as REVISAR últimas já guardadas, que
+ainda podem ser editadas (Status, prêmio) depois de entrarem no cache.
+"""
+import json
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+# ORACULO_CACHE troca a raiz de todos os caches locais (histórico, config, snapshots, SQLite), ex.: no teste de carga
+RAIZ_CACHE = os.environ.get("ORACULO_CACHE") or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")
+PASTA_PADRAO = os.path.join(RAIZ_CACHE, "historico")
+COL_CONCURSO = "Concurso"
+REVISAR = 3  # últimas linhas já guardadas relidas a cada sincronização
+
+
+def coluna_a1(n):
+    """1 -> 'A', 27 -> 'AA'"""
+    letras = ""
+    while n > 0:
+        n, resto = divmod(n - 1, 26)
+        letras = chr(65 + resto) + letras
+    return letras
+
+
+def _para_int(valor):
+    try: return int(str(valor).strip().replace(".", ""))
+    except (TypeError, ValueError): return None
+
+
+class HistoricoLocal:
+    """Um arquivo SQLite por aba_historico: tabela `sorteios(concurso, linha)` + metadados."""
+
+    def __init__(self, aba, pasta=PASTA_PADRAO):
+        self.aba = aba
+        os.makedirs(pasta, exist_ok=True)
+        self.caminho = os.path.join(pasta, f"{aba}.sqlite")
+        self._db = sqlite3.connect(self.caminho, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._db.execute("CREATE TABLE IF NOT EXISTS sorteios (concurso INTEGER PRIMARY KEY, linha TEXT NOT NULL)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT)")
+        self._db.commit()
+
+    # --- METADADOS ---
+
+    def _meta(self, chave, padrao=None):
+        r = self._db.execute("SELECT valor FROM meta WHERE chave = ?", (chave,)).fetchone()
+        return json.loads(r[0]) if r else padrao
+
+    def _set_meta(self, chave, valor):
+        self._db.execute("INSERT OR REPLACE INTO meta (chave, valor) VALUES (?, ?)", (chave, json.dumps(valor)))
+
+    @property
+    def cabecalho(self):
+        return self._meta("cabecalho")
+
+    def max_concurso(self):
+        r = self._db.execute("SELECT MAX(concurso) FROM sorteios").fetchone()
+        return r[0]
+
+    def total(self):
+        return self._db.execute("SELECT COUNT(*) FROM sorteios").fetchone()[0]
+
+    def versao(self):
+        """Muda quando entra concurso novo ou uma linha guardada é reescrita (também por outro processo)."""
+        return self.max_concurso(), self.total(), self._meta("revisao", 0)
+
+    # --- ESCRITA ---
+
+    def _gravar(self, cabecalho, linhas):
+        """Insere/atualiza linhas (listas de str). Linhas sem concurso numérico são ignoradas."""
+        idx = cabecalho.index(COL_CONCURSO)
+        n = len(cabecalho)
+        registros = []
+        for r in linhas:
+            r = (list(r) + [""] * n)[:n]
+            conc = _para_int(r[idx])
+            if conc is not None: registros.append((conc, json.dumps(r, ensure_ascii=False)))
+        self._db.executemany("INSERT OR REPLACE INTO sorteios (concurso, linha) VALUES (?, ?)", registros)
+        self._set_meta("cabecalho", cabecalho)
+        self._set_meta("revisao", self._meta("revisao", 0) + 1)
+        self._db.commit()
+        return len(registros)
+
+    def _mudaram(self, cabecalho, linhas):
+        """Só as linhas novas ou diferentes do que está guardado (nada a gravar se a planilha não mudou)."""
+        idx = cabecalho.index(COL_CONCURSO)
+        n = len(cabecalho)
+        por_concurso = {}
+        for r in linhas:
+            r = (list(r) + [""] * n)[:n]
+            conc = _para_int(r[idx])
+            if conc is not None: por_concurso[conc] = r
+        if not por_concurso: return []
+        marcas = ",".join("?" * len(por_concurso))
+        atuais = dict(self._db.execute(f"SELECT concurso, linha FROM sorteios WHERE concurso IN ({marcas})", list(por_concurso)))
+        return [r for c, r in por_concurso.items() if atuais.get(c) != json.dumps(r, ensure_ascii=False)]
+
+    def limpar(self):
+        self._db.execute("DELETE FROM sorteios")
+        self._db.execute("DELETE FROM meta WHERE chave != 'revisao'")  # a versão nunca volta atrás
+        self._db.commit()
+
+    # --- SINCRONIZAÇÃO ---
+
+    def sincronizar(self, ws, completo=False):
+        """
+        Traz para o cache as linhas novas de `ws` (gspread.Worksheet ou AbaFake)
+        e as edições nas REVISAR últimas já guardadas. Retorna quantas linhas foram gravadas.
+        """
+        with self._lock:
+            return self._sincronizar(ws, completo)
+
+    def _sincronizar(self, ws, completo):
+        cab = self.cabecalho
+        topo = self.max_concurso()
+        if completo or cab is None or topo is None or COL_CONCURSO not in cab:
+            data = ws.get_all_values()
+            if len(data) < 2 or COL_CONCURSO not in data[0]: return 0
+            self.limpar()
+            # A planilha costuma vir do mais novo para o mais antigo; guardamos a ordem para devolver igual
+            self._set_meta("decrescente", self._eh_decrescente(data[1:], data[0].index(COL_CONCURSO)))
+            return self._gravar(data[0], data[1:])
+
+        ultima = coluna_a1(len(cab))
+        idx = cab.index(COL_CONCURSO)
+        if self._meta("decrescente", True):
+            # Mais novo no topo: a sonda já traz as REVISAR primeiras linhas inteiras
+            delta = ws.get(f"A2:{ultima}{1 + REVISAR}")
+            novo = _para_int(delta[0][idx]) if delta and len(delta[0]) > idx else None
+            if novo is None: return 0
+            # Concursos são únicos e crescentes, então no máximo (novo - topo) linhas novas
+            if novo > topo: delta = ws.get(f"A2:{ultima}{1 + novo - topo + REVISAR}")
+        else:
+            # Mais novo no fim: lê a partir das REVISAR últimas linhas que já temos
+            delta = ws.get(f"A{max(2, self.total() + 2 - REVISAR)}:{ultima}")
+
+        delta = self._mudaram(cab, delta)
+        return self._gravar(cab, delta) if delta else 0
+
+    @staticmethod
+    def _eh_decrescente(linhas, idx):
+        concs = [c for c in (_para_int(r[idx]) for r in linhas[:2] if len(r) > idx) if c is not None]
+        return len(concs) < 2 or concs[0] > concs[1]
+
+    # --- LEITURA ---
+
+    def carregar(self):
+        """DataFrame no mesmo formato de `get_data` (strings, mesma ordem da planilha)."""
+        with self._lock:
+            return self._carregar()
+
+    def _carregar(self):
+        cab = self.cabecalho
+        if not cab: return None
+        ordem = "DESC" if self._meta("decrescente", True) else "ASC"
+        linhas = [json.loads(r[0]) for r in self._db.execute(f"SELECT linha FROM sorteios ORDER BY concurso {ordem}")]
+        if not linhas: return None
+        return pd.DataFrame(linhas, columns=cab)
+
+
+_abertos = {}
+_lock_abertos = threading.Lock()
+
+def abrir(aba, pasta=PASTA_PADRAO):
+    """Reaproveita uma conexão por (pasta, aba) dentro do processo."""
+    chave = (pasta, aba)
+    with _lock_abertos:
+        if chave not in _abertos: _abertos[chave] = HistoricoLocal(aba, pasta)
+        return _abertos[chave]
@@ -0,0 +1,168 @@
+"""
+Planilha falsa em memória que imita a parte da API do gspread usada pelo app.
+Serve como substituta local do Google Sheets (desenvolvimento e testes manuais).
+"""
+import re
+
+_RE_CELULA = re.compile(r"^([A-Za-z]*)(\d*)$")
+
+
+def _coluna_para_indice(letras):
+    n = 0
+    for ch in letras.upper():
+        n = n * 26 + (ord(ch) - 64)
+    return n
+
+
+def _parse_a1(intervalo):
+    """'A2:C5' -> (linha_ini, col_ini, linha_fim, col_fim), 1-based; None = aberto."""
+    partes = intervalo.split("!")[-1].split(":")
+    ini = _RE_CELULA.match(partes[0].strip())
+    fim = _RE_CELULA.match(partes[-1].strip())
+    l1 = int(ini.group(2)) if ini.group(2) else 1
+    c1 = _coluna_para_indice(ini.group(1)) if ini.group(1) else 1
+    l2 = int(fim.group(2)) if fim.group(2) else None
+    c2 = _coluna_para_indice(fim.group(1)) if fim.group(1) else None
+    if len(partes) == 1: l2, c2 = l1, c1
+    return l1, c1, l2, c2
+
+
+def _aparar(trecho):
+    # Igual ao Sheets: células vazias no fim da linha não voltam
+    trecho = list(trecho)
+    while trecho and trecho[-1] == "": trecho.pop()
+    return trecho
+
+
+class AbaFake:
+    """Imita um gspread.Worksheet guardando as células como lista de listas de str."""
+
+    def __init__(self, title, valores=None, id=0):
+        self.title = title
+        self.id = id
+        self._linhas = [[str(v) for v in r] for r in (valores or [])]
+        self.chamadas = {}
+        self.celulas_lidas = 0
+
+    def _conta(self, nome, celulas=0):
+        self.chamadas[nome] = self.chamadas.get(nome, 0) + 1
+        self.celulas_lidas += celulas
+
+    @property
+    def row_count(self):
+        return len(self._linhas)
+
+    def get_all_values(self):
+        out = [list(r) for r in self._linhas]
+        self._conta("get_all_values", sum(len(r) for r in out))
+        return out
+
+    def get(self, intervalo):
+        l1, c1, l2, c2 = _parse_a1(intervalo)
+        l2 = l2 or len(self._linhas)
+        out = []
+        for r in self._linhas[l1 - 1:l2]:
+            trecho = r[c1 - 1:c2] if c2 else r[c1 - 1:]
+            # Igual ao Sheets: células vazias no fim da linha não voltam
+            while trecho and trecho[-1] == "": trecho = trecho[:-1]
+            out.append(trecho)
+        while out and not out[-1]: out.pop()
+        self._conta("get", sum(len(r) for r in out))
+        return out
+
+    def batch_get(self, intervalos, **kwargs):
+        """Várias faixas numa única chamada (values.batchGet)."""
+        self._conta("batch_get")
+        saida = []
+        for intervalo in intervalos:
+            l1, c1, l2, c2 = _parse_a1(intervalo)
+            linhas = self._linhas[l1 - 1:l2 or len(self._linhas)]
+            out = [_aparar(r[c1 - 1:c2] if c2 else r[c1 - 1:]) for r in linhas]
+            while out and not out[-1]: out.pop()
+            self.celulas_lidas += sum(len(r) for r in out)
+            saida.append(out)
+        return saida
+
+    def col_values(self, col):
+        out = [r[col - 1] if len(r) >= col else "" for r in self._linhas]
+        while out and out[-1] == "": out.pop()
+        self._conta("col_values", len(out))
+        return out
+
+    def row_values(self, row):
+        out = list(self._linhas[row - 1]) if row <= len(self._linhas) else []
+        while out and out[-1] == "": out.pop()
+        self._conta("row_values", len(out))
+        return out
+
+    def delete_rows(self, start_index, end_index=None):
+        self._conta("delete_rows")
+        del self._linhas[start_index - 1:(end_index or start_index)]
+
+    def append_row(self, row, **kwargs):
+        self._conta("append_row")
+        self._linhas.append([str(v) for v in row])
+
+    def append_rows(self, rows, **kwargs):
+        self._conta("append_rows")
+        self._linhas.extend([str(v) for v in r] for r in rows)
+
+    def insert_rows(self, rows, row=1, **kwargs):
+        self._conta("insert_rows")
+        self._linhas[row - 1:row - 1] = [[str(v) for v in r] for r in rows]
+
+    def update(self, intervalo, valores=None, **kwargs):
+        self._conta("update")
+        self._escrever(intervalo, valores)
+
+    def _escrever(self, intervalo, valores):
+        l1, c1, _, _ = _parse_a1(intervalo)
+        for i, r in enumerate(valores or []):
+            while len(self._linhas) < l1 + i: self._linhas.append([])
+            linha = self._linhas[l1 - 1 + i]
+            while len(linha) < c1 - 1 + len(r): linha.append("")
+            linha[c1 - 1:c1 - 1 + len(r)] = [str(v) for v in r]
+
+    def batch_update(self, data, **kwargs):
+        """Várias faixas numa única chamada (como no Sheets API values.batchUpdate)."""
+        self._conta("batch_update")
+        for bloco in data:
+            self._escrever(bloco["range"], bloco["values"])
+
+    def clear(self):
+        self._conta("clear")
+        self._linhas = []
+
+
+class PlanilhaFake:
+    """Imita um gspread.Spreadsheet: um dicionário de abas por título."""
+
+    def __init__(self, abas=None):
+        self._abas = {}
+        self.pedidos = {}  # chamadas no nível da planilha (batch_update), por método
+        for titulo, valores in (abas or {}).items():
+            self._abas[titulo] = AbaFake(titulo, valores, id=len(self._abas))
+
+    def worksheet(self, title):
+        if title not in self._abas: raise KeyError(f"Aba não encontrada: {title}")
+        return self._abas[title]
+
+    def add_worksheet(self, title, rows=1000, cols=10):
+        self._abas[title] = AbaFake(title, id=max((a.id for a in self._abas.values()), default=-1) + 1)
+        return self._abas[title]
+
+    def _conta(self, nome):
+        self.pedidos[nome] = self.pedidos.get(nome, 0) + 1
+
+    def batch_update(self, body):
+        """spreadsheets.batchUpdate: só deleteDimension (linhas), aplicado na ordem dos pedidos."""
+        self._conta("batch_update")
+        por_id = {a.id: a for a in self._abas.values()}
+        for pedido in body.get("requests", []):
+            faixa = pedido["deleteDimension"]["range"]
+            if faixa.get("dimension") != "ROWS": raise NotImplementedError(faixa.get("dimension"))
+            del por_id[faixa["sheetId"]]._linhas[faixa["startIndex"]:faixa["endIndex"]]
+        return {"replies": [{} for _ in body.get("requests", [])]}
+
+    def worksheets(self):
+        return list(self._abas.values())
@@ -0,0 +1,127 @@
+"""
+Cliente da API pública de prêmios.
+
+Uma única `requests.Session` (conexões keep-alive reaproveitadas) atende todas
+as loterias, com as buscas correndo em paralelo num pool de threads. Enquanto
+houver um valor bom em cache ele é servido na hora, mesmo vencido; a renovação
+roda em segundo plano (stale-while-revalidate). Falhas não são guardadas pelo
+TTL cheio: o próximo retry vem depois de TTL_ERRO segundos, dobrando a cada
+falha seguida até BACKOFF_MAX.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import rastreio
+
+SLUGS = {
+    "Mega Sena": "megasena", "Lotofácil": "lotofacil", "Quina": "quina",
+    "Lotomania": "lotomania", "Timemania": "timemania",
+    "Dupla Sena": "duplasena", "Dia de Sorte": "diadesorte"
+}
+
+TTL = 3600.0         # validade de um valor bom
+TTL_ERRO = 15.0      # espera após a primeira falha
+BACKOFF_MAX = 600.0  # teto da espera entre tentativas com falha
+TIMEOUT = 4.0        # segundos por requisição
+
+
+class ClientePremios:
+    def __init__(self, url_base, slugs=SLUGS, ttl=TTL, ttl_erro=TTL_ERRO, backoff_max=BACKOFF_MAX,
+                 timeout=TIMEOUT, max_workers=4, sessao=None):
+        self.url_base = url_base.rstrip("/")
+        self.slugs = dict(slugs)
+        self.ttl = ttl
+        self.ttl_erro = ttl_erro
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self._sessao = sessao
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="premio")
+        self._lock = threading.Lock()
+        self._cache = {}   # nome -> {"valor", "expira", "falhas", "erro"}
+        self._em_voo = {}  # nome -> Future da busca em andamento (uma por loteria)
+
+    def sessao(self):
+        if self._sessao is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            s = requests.Session()
+            s.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers))
+            s.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers))
+            self._sessao = s
+        return self._sessao
+
+    # --- BUSCA ---
+
+    def _buscar(self, nome):
+        resp = self.sessao().get(f"{self.url_base}/{self.slugs[nome]}", timeout=self.timeout)
+        rastreio.somar_bytes(len(resp.content))
+        if resp.status_code != 200: raise RuntimeError(f"HTTP {resp.status_code}")
+        d = resp.json()
+        # Tenta pegar estimativa ou acumulado
+        val = d.get("valorEstimadoProximoConcurso", 0)
+        if val == 0: val = d.get("valorAcumuladoProximoConcurso", 0)
+        return val
+
+    def _atualizar(self, nome, rastreio_origem):
+        rastreio.ativar(rastreio_origem)
+        try:
+            with rastreio.span("premio_http", loteria=nome):
+                valor = self._buscar(nome)
+            with self._lock:
+                self._cache[nome] = {"valor": valor, "expira": time.monotonic() + self.ttl, "falhas": 0, "erro": None}
+        except Exception as e:
+            with self._lock:
+                anterior = self._cache.get(nome) or {"valor": None, "falhas": 0}
+                falhas = anterior["falhas"] + 1
+                espera = min(self.backoff_max, self.ttl_erro * 2 ** (falhas - 1))
+                # O último valor bom continua sendo servido durante o backoff
+                self._cache[nome] = {"valor": anterior["valor"], "expira": time.monotonic() + espera,
+                                     "falhas": falhas, "erro": str(e) or type(e).__name__}
+        finally:
+            with self._lock: self._em_voo.pop(nome, None)
+            rastreio.ativar(None)
+
+    def _disparar(self, nome):
+        with self._lock:
+            fut = self._em_voo.get(nome)
+            if fut is None:
+                fut = self._em_voo[nome] = self._pool.submit(self._atualizar, nome, rastreio.ativo())
+            return fut
+
+    # --- API ---
+
+    def obter(self, nome, esperar=True):
+        """
+        Valor do prêmio (ou None). Válido: volta do cache. Vencido com valor bom:
+        volta o antigo e renova em segundo plano. Sem valor: busca e espera até
+        o timeout (esperar=False só dispara a busca).
+        """
+        if nome not in self.slugs: return None
+        with self._lock: e = self._cache.get(nome)
+        if e is not None and time.monotonic() < e["expira"]: return e["valor"]
+        fut = self._disparar(nome)
+        if e is not None and e["valor"] is not None: return e["valor"]
+        if not esperar: return None
+        try: fut.result(timeout=self.timeout + 1)
+        except Exception: pass
+        with self._lock: e = self._cache.get(nome)
+        return e["valor"] if e else None
+
+    def obter_todos(self, nomes=None, esperar=True):
+        """{nome: valor} buscando todas as loterias ao mesmo tempo."""
+        nomes = [n for n in (nomes or self.slugs) if n in self.slugs]
+        for n in nomes: self.obter(n, esperar=False)
+        return {n: self.obter(n, esperar=esperar) for n in nomes}
+
+    def estado(self):
+        """Snapshot do cache para diagnóstico: {nome: {valor, expira_em, falhas, erro}}."""
+        agora = time.monotonic()
+        with self._lock:
+            return {n: {"valor": e["valor"], "expira_em": round(e["expira"] - agora, 1),
+                        "falhas": e["falhas"], "erro": e["erro"]} for n, e in self._cache.items()}
+
+    def fechar(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._sessao is not None: self._sessao.close()
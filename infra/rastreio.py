@@ -0,0 +1,213 @@
+"""
+Rastreio leve das fases de cada execução (rerun) do app.
+
+Um `Rastreio` por execução junta spans (tempo de parede, chamadas e bytes
+trazidos) abertos com `span(...)` ou com o decorador `rastreado(...)`. O
+rastreio ativo é por thread: as threads do carregador de cards o recebem pelo
+`inicializador`. Sem rastreio ativo, tudo vira no-op (custo de um getattr).
+
+No fim da execução o app mostra o `resumo()` no painel lateral e, se
+configurado, acrescenta uma linha JSON ao log (`gravar_jsonl`). `Perfil`
+liga o cProfile numa única execução.
+"""
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from . import historico_local
+
+PASTA_PADRAO = os.path.join(os.path.dirname(historico_local.PASTA_PADRAO), "rastreio")
+
+_local = threading.local()
+
+
+class Span:
+    def __init__(self, nome, pai, profundidade, attrs):
+        self.nome = nome
+        self.pai = pai
+        self.profundidade = profundidade
+        self.attrs = attrs
+        self.thread = threading.current_thread().name
+        self.inicio_ms = 0.0
+        self.ms = 0.0
+        self.bytes = 0
+        self.erro = None
+
+    def como_dict(self):
+        d = {"nome": self.nome, "inicio_ms": round(self.inicio_ms, 3), "ms": round(self.ms, 3),
+             "bytes": self.bytes, "thread": self.thread, "profundidade": self.profundidade}
+        if self.pai: d["pai"] = self.pai
+        if self.attrs: d["attrs"] = self.attrs
+        if self.erro: d["erro"] = self.erro
+        return d
+
+
+class Rastreio:
+    """Spans de uma execução do script. Seguro para várias threads."""
+
+    def __init__(self, rotulo=""):
+        self.id = uuid.uuid4().hex[:12]
+        self.rotulo = rotulo
+        self.inicio = time.time()
+        self._t0 = time.perf_counter()
+        self.total_ms = None
+        self.spans = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, nome, **attrs):
+        pilha = _pilha()
+        s = Span(nome, pilha[-1].nome if pilha else None, len(pilha), attrs)
+        pilha.append(s)
+        t = time.perf_counter()
+        s.inicio_ms = (t - self._t0) * 1000
+        try: yield s
+        except BaseException as e:
+            s.erro = type(e).__name__
+            raise
+        finally:
+            s.ms = (time.perf_counter() - t) * 1000
+            pilha.pop()
+            with self._lock: self.spans.append(s)
+
+    def finalizar(self):
+        if self.total_ms is None: self.total_ms = (time.perf_counter() - self._t0) * 1000
+        return self.total_ms
+
+    def resumo(self):
+        """{nome: {chamadas, total_ms, max_ms, bytes}} ordenado pelo tempo total."""
+        agg = {}
+        with self._lock: spans = list(self.spans)
+        for s in spans:
+            a = agg.setdefault(s.nome, {"chamadas": 0, "total_ms": 0.0, "max_ms": 0.0, "bytes": 0})
+            a["chamadas"] += 1
+            a["total_ms"] += s.ms
+            a["max_ms"] = max(a["max_ms"], s.ms)
+            a["bytes"] += s.bytes
+        for a in agg.values():
+            a["total_ms"] = round(a["total_ms"], 3)
+            a["max_ms"] = round(a["max_ms"], 3)
+        return dict(sorted(agg.items(), key=lambda kv: -kv[1]["total_ms"]))
+
+    def como_dict(self):
+        with self._lock: spans = sorted(self.spans, key=lambda s: s.inicio_ms)
+        return {"id": self.id, "rotulo": self.rotulo, "inicio": round(self.inicio, 3),
+                "total_ms": round(self.finalizar(), 3), "resumo": self.resumo(),
+                "spans": [s.como_dict() for s in spans]}
+
+    def gravar_jsonl(self, caminho=None):
+        """Acrescenta esta execução como uma linha JSON no log."""
+        caminho = caminho or os.path.join(PASTA_PADRAO, "execucoes.jsonl")
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        linha = json.dumps(self.como_dict(), ensure_ascii=False, default=str)
+        with open(caminho, "a", encoding="utf-8") as f:
+            f.write(linha + "\n")
+        return caminho
+
+
+# --- RASTREIO ATIVO (POR THREAD) ---
+
+def _pilha():
+    p = getattr(_local, "pilha", None)
+    if p is None: p = _local.pilha = []
+    return p
+
+
+def ativar(rastreio):
+    """Define o rastreio da thread atual (None desliga)."""
+    _local.rastreio = rastreio
+    _local.pilha = []
+
+
+def ativo():
+    return getattr(_local, "rastreio", None)
+
+
+@contextmanager
+def span(nome, **attrs):
+    """Span no rastreio ativo da thread; sem rastreio, só executa o bloco."""
+    r = ativo()
+    if r is None:
+        yield None
+        return
+    with r.span(nome, **attrs) as s:
+        yield s
+
+
+def somar_bytes(n):
+    """Soma bytes trazidos ao span aberto mais interno da thread."""
+    pilha = getattr(_local, "pilha", None)
+    if pilha and n: pilha[-1].bytes += int(n)
+
+
+def tamanho(obj):
+    """Bytes aproximados de um resultado (DataFrame, bytes/str, array)."""
+    if obj is None: return 0
+    if hasattr(obj, "memory_usage"):
+        try: return int(obj.memory_usage(index=False, deep=True).sum())
+        except Exception: return 0
+    if isinstance(obj, (bytes, bytearray)): return len(obj)
+    if isinstance(obj, str): return len(obj.encode("utf-8"))
+    return int(getattr(obj, "nbytes", 0))
+
+
+def rastreado(nome=None, medir=False, **attrs):
+    """
+    Decorador: cada chamada vira um span. Com medir=True o tamanho do retorno
+    (ver `tamanho`) entra como bytes trazidos.
+    """
+    def decorar(fn):
+        rotulo = nome or fn.__name__
+
+        @functools.wraps(fn)
+        def envoltorio(*args, **kwargs):
+            r = ativo()
+            if r is None: return fn(*args, **kwargs)
+            with r.span(rotulo, **attrs) as s:
+                out = fn(*args, **kwargs)
+                if medir: s.bytes += tamanho(out)
+                return out
+        return envoltorio
+    return decorar
+
+
+def instrumentar(obj, metodos, prefixo=None):
+    """Envolve métodos de uma instância (ex.: o motor) em spans 'prefixo.metodo'."""
+    prefixo = prefixo or type(obj).__name__
+    for m in metodos:
+        original = getattr(obj, m, None)
+        if original is None or hasattr(original, "__wrapped__"): continue
+        setattr(obj, m, rastreado(f"{prefixo}.{m}")(original))
+    return obj
+
+
+# --- CPROFILE SOB DEMANDA ---
+
+class Perfil:
+    """cProfile de uma execução (só a thread principal do script)."""
+
+    def __init__(self):
+        self._prof = cProfile.Profile()
+        self.caminho = None
+
+    def iniciar(self):
+        self._prof.enable()
+        return self
+
+    def parar(self, pasta=None, linhas=30):
+        """Para a captura, salva o .prof e devolve o relatório (top por tempo acumulado)."""
+        self._prof.disable()
+        pasta = pasta or PASTA_PADRAO
+        os.makedirs(pasta, exist_ok=True)
+        self.caminho = os.path.join(pasta, f"perfil-{time.strftime('%Y%m%d-%H%M%S')}.prof")
+        self._prof.dump_stats(self.caminho)
+        saida = io.StringIO()
+        pstats.Stats(self._prof, stream=saida).sort_stats("cumulative").print_stats(linhas)
+        return saida.getvalue()
@@ -0,0 +1,189 @@
+"""
+Snapshots de análise pré-calculados, um por loteria.
+
+O dashboard refaz motor, get_stats, analisar_sinal e card de todas as
+loterias a cada rerun, mas isso só muda quando sai um concurso (ou o prêmio).
+Aqui a conta é feita uma vez, fora da página (ferramentas/precomputar.py), e
+publicada em disco:
+
+    <pasta>/<loteria>/<versão>/matriz.npy, concursos.npy, meta.json
+    <pasta>/<loteria>/ATUAL    -> nome da versão em vigor
+    <pasta>/<loteria>/VERIFICADO  (mtime = última vez que o precomputar conferiu)
+
+A versão é escrita inteira numa pasta temporária, renomeada, e só então o
+ATUAL é trocado com os.replace (atômico): quem lê vê a versão velha ou a nova,
+nunca uma pela metade. O leitor confere o ATUAL com um stat por loteria e só
+recarrega quando ele muda; a matriz é aberta com mmap, então o custo da
+página não depende do tamanho do histórico nem de quantas sessões existem.
+
+Sem versão nova, o precomputar só toca o VERIFICADO. A idade de um snapshot
+conta desde a última publicação ou conferência; passando de max_idade (job
+parado), o leitor não o entrega e o app volta ao caminho ao vivo.
+"""
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import unicodedata
+
+import numpy as np
+
+from . import historico_local
+
+PASTA_PADRAO = os.path.join(os.path.dirname(historico_local.PASTA_PADRAO), "snapshots")
+FORMATO = 1
+MANTER = 3  # versões antigas guardadas por loteria (leitores com mmap aberto continuam válidos)
+MAX_IDADE = 3 * 3600.0  # segundos sem publicação nem conferência até o snapshot ser ignorado
+MARCADORES = ("ATUAL", "VERIFICADO")
+
+
+def pasta_loteria(nome, pasta=PASTA_PADRAO):
+    """'Lotofácil' -> <pasta>/lotofacil"""
+    slug = unicodedata.normalize("NFKD", nome).encode("ascii", "ignore").decode()
+    return os.path.join(pasta, re.sub(r"[^a-z0-9]+", "_", slug.lower()).strip("_"))
+
+
+def _json(valor):
+    """Valores do `ultimo` (numpy/pandas) em tipos que o json aceita."""
+    if isinstance(valor, np.generic): return valor.item()
+    return valor if isinstance(valor, (str, int, float, bool, type(None))) else str(valor)
+
+
+class Snapshot:
+    """Uma versão publicada: matriz (mmap, só leitura) + análises e card prontos."""
+
+    def __init__(self, nome, versao, caminho, meta, matriz, concursos):
+        self.nome = nome
+        self.versao = versao
+        self.caminho = caminho
+        self.meta = meta
+        self.matriz = matriz
+        self.concursos = concursos
+        self.concurso = meta["concurso"]
+        self.stats = meta["stats"]
+        self.sinal = tuple(meta["sinal"])
+        self.ultimo = meta["ultimo"]
+        self.premio = meta["premio"]
+        self.html = meta["html"]
+        self.criado_em = meta["criado_em"]
+
+    def idade(self):
+        """Segundos desde a publicação ou a última conferência do precomputar (o que for mais recente)."""
+        try: verificado = os.stat(os.path.join(os.path.dirname(self.caminho), "VERIFICADO")).st_mtime
+        except OSError: verificado = 0.0
+        return max(0.0, time.time() - max(self.criado_em, verificado))
+
+    def motor(self, classe, config):
+        """Motor montado direto da matriz (sem DataFrame); `ultimo` traz status e prêmio da planilha."""
+        return classe.de_matriz(self.matriz, config, self.concursos, ultimo=self.ultimo,
+                                colunas=self.meta["colunas"])
+
+
+def impressao(motor, premio=None):
+    """O que, mudando, pede uma versão nova: último concurso, sorteio, status/prêmio da planilha e API."""
+    return json.dumps([str(motor.ultimo.get("Concurso", "")), [int(x) for x in motor.ultimo_sorteio()],
+                       {k: _json(v) for k, v in motor.ultimo.items()}, premio], sort_keys=True)
+
+
+def publicar(nome, motor, premio=None, html=None, pasta=PASTA_PADRAO, manter=MANTER):
+    """
+    Grava uma versão nova para `motor` e a põe em vigor. Retorna o Snapshot.
+    html: card já renderizado (ex.: gerar_html_card(nome, motor, premio)).
+    """
+    base = pasta_loteria(nome, pasta)
+    os.makedirs(base, exist_ok=True)
+    concursos = np.asarray(motor.concursos, dtype=np.int64)
+    concurso = int(concursos[0]) if concursos.size else -1
+    agora = time.time()
+    # Microssegundos no nome: duas publicações no mesmo segundo (ex.: --forcar) não colidem
+    versao = f"{max(concurso, 0):06d}-{time.strftime('%Y%m%d%H%M%S', time.localtime(agora))}{int(agora % 1 * 1e6):06d}-{os.getpid()}"
+    stats = {k: [int(x) for x in v] for k, v in motor.get_stats().items()}
+    meta = {"formato": FORMATO, "nome": nome, "versao": versao, "concurso": concurso,
+            "criado_em": time.time(), "stats": stats, "sinal": list(motor.analisar_sinal()),
+            "ultimo": {k: _json(v) for k, v in motor.ultimo.items()}, "colunas": list(motor.colunas),
+            "premio": premio, "html": html, "impressao": impressao(motor, premio)}
+
+    tmp = os.path.join(base, f".{versao}.tmp")
+    os.makedirs(tmp)
+    np.save(os.path.join(tmp, "matriz.npy"), np.ascontiguousarray(motor.matriz, dtype=np.uint8))
+    np.save(os.path.join(tmp, "concursos.npy"), concursos)
+    with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp, os.path.join(base, versao))
+
+    ponteiro = os.path.join(base, "ATUAL")
+    with open(ponteiro + ".tmp", "w", encoding="utf-8") as f: f.write(versao)
+    os.replace(ponteiro + ".tmp", ponteiro)
+    _limpar(base, versao, manter)
+    return abrir(nome, versao, pasta)
+
+
+def confirmar(nome, pasta=PASTA_PADRAO):
+    """Registra que a versão em vigor foi conferida agora e continua certa (renova a idade)."""
+    caminho = os.path.join(pasta_loteria(nome, pasta), "VERIFICADO")
+    with open(caminho, "a", encoding="utf-8"): pass
+    os.utime(caminho)
+
+
+def _limpar(base, atual, manter):
+    versoes = sorted(v for v in os.listdir(base)
+                     if v not in MARCADORES and not v.startswith(".") and not v.endswith(".tmp") and v != atual)
+    for v in versoes[:max(0, len(versoes) - manter)]:
+        shutil.rmtree(os.path.join(base, v), ignore_errors=True)
+
+
+def versao_atual(nome, pasta=PASTA_PADRAO):
+    try:
+        with open(os.path.join(pasta_loteria(nome, pasta), "ATUAL"), encoding="utf-8") as f: return f.read().strip() or None
+    except OSError: return None
+
+
+def abrir(nome, versao=None, pasta=PASTA_PADRAO):
+    """Snapshot da versão (padrão: a em vigor) ou None se não houver."""
+    versao = versao or versao_atual(nome, pasta)
+    if not versao: return None
+    caminho = os.path.join(pasta_loteria(nome, pasta), versao)
+    try:
+        with open(os.path.join(caminho, "meta.json"), encoding="utf-8") as f: meta = json.load(f)
+        if meta.get("formato") != FORMATO: return None
+        matriz = np.load(os.path.join(caminho, "matriz.npy"), mmap_mode="r")
+        concursos = np.load(os.path.join(caminho, "concursos.npy"), mmap_mode="r")
+    except (OSError, ValueError): return None
+    return Snapshot(nome, versao, caminho, meta, matriz, concursos)
+
+
+class LeitorSnapshots:
+    """
+    Snapshot em vigor de cada loteria, compartilhado entre sessões. atual()
+    custa um stat do ATUAL (e um do VERIFICADO com max_idade); versão nova é
+    carregada e trocada por atribuição (quem já pegou a anterior continua com
+    ela até o fim do rerun).
+    """
+
+    def __init__(self, pasta=PASTA_PADRAO):
+        self.pasta = pasta
+        self._lock = threading.Lock()
+        self._vigentes = {}  # nome -> ((inode, mtime) do ATUAL, Snapshot)
+
+    def atual(self, nome, max_idade=None):
+        """Snapshot em vigor, ou None se não houver ou se estiver mais velho que `max_idade` segundos."""
+        snap = self._atual(nome)
+        if snap is not None and max_idade is not None and snap.idade() > max_idade: return None
+        return snap
+
+    def _atual(self, nome):
+        try:
+            st = os.stat(os.path.join(pasta_loteria(nome, self.pasta), "ATUAL"))
+            marca = (st.st_ino, st.st_mtime_ns)  # os.replace troca o inode a cada publicação
+        except OSError: return None
+        vigente = self._vigentes.get(nome)
+        if vigente and vigente[0] == marca: return vigente[1]
+        with self._lock:
+            vigente = self._vigentes.get(nome)
+            if vigente and vigente[0] == marca: return vigente[1]
+            snap = abrir(nome, pasta=self.pasta)
+            if snap is None: return vigente[1] if vigente else None
+            self._vigentes[nome] = (marca, snap)
+            return snap
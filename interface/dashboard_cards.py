@@ -1,5 +1,7 @@
-import pandas as pd
 import textwrap
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 
 # --- CSS MODERNO ---
 CSS_ESTILO = """
@@ -65,56 +67,23 @@ def formatar_moeda(valor):
         return f"R$ {v_float:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
     except: return "R$ ---"
 
-def gerar_html_card(nome_loteria, motor, valor_api=None):
-    cor_marca = get_brand_color(nome_loteria)
-    txt_sinal, tipo_sinal = motor.analisar_sinal()
-    
-    concurso, prox, premio, numeros = "--", "--", "Apurando...", []
-    
-    try:
-        if motor.df is not None and not motor.df.empty:
-            last = motor.df.iloc[0]
-            concurso = str(last.get('Concurso', '--'))
-            if concurso.isdigit(): prox = str(int(concurso) + 1)
-            
-            # PRIORIDADE 1: API
-            if valor_api and valor_api > 0:
-                premio = formatar_moeda(valor_api)
-            else:
-                # PRIORIDADE 2: Planilha
-                cols_premio = ['Estimativa Próximo', 'Prêmio Estimado', 'Valor Acumulado', 'Acumulado']
-                for c in cols_premio:
-                    real_c = next((x for x in motor.df.columns if x.lower() == c.lower()), None)
-                    if real_c and str(last.get(real_c)).strip() not in ['0', '', '0,00']:
-                        premio = formatar_moeda(last.get(real_c))
-                        break
-            
-            for c in motor.cols:
-                v = last.get(c)
-                if v: numeros.append(int(float(v)))
-    except: pass
-
-    is_acumulado = "ACUMULADO" in txt_sinal
-    badge = '<div class="status-badge bg-acumulado">ACUMULOU!</div>' if is_acumulado else '<div class="status-badge bg-normal">NORMAL</div>'
-    
-    ft_cls, txt_cls, l_cls, icon = ("signal-go", "txt-go", "light-green", "🚀") if tipo_sinal == "go" else ("signal-wait", "txt-wait", "light-yellow", "✋")
-    css_bola = "ball-mini" if len(numeros) > 10 else "ball-style"
-    html_bolas = "".join([f'<div class="{css_bola}">{n}</div>' for n in numeros])
-
-    html_template = f"""
+# --- CARDS: TEMPLATES PRÉ-COMPILADOS + CACHE DE RENDERIZAÇÃO ---
+# Os templates são "dedentados" uma vez só; renderizar vira um str.format.
+# Sem linhas em branco no HTML: no markdown do Streamlit uma linha vazia encerra o bloco HTML.
+TEMPLATE_CARD = textwrap.dedent("""
     <div class="card-loteria">
         <div class="card-header">
-            <div class="loteria-title" style="color: {cor_marca}">{nome_loteria}</div>
+            <div class="loteria-title" style="color: {cor}">{nome}</div>
             <div class="next-draw">Próx: {prox}</div>
         </div>
         <div class="prize-section">
             <div class="prize-label">Estimativa de Prêmio</div>
-            <div class="prize-value" style="color: {cor_marca}">{premio}</div>
+            <div class="prize-value" style="color: {cor}">{premio}</div>
             {badge}
         </div>
         <div class="last-result-section">
             <div class="last-conc-info">Último: {concurso}</div>
-            <div class="balls-grid">{html_bolas}</div>
+            <div class="balls-grid">{bolas}</div>{atrasadas}
         </div>
         <div class="ai-footer {ft_cls}">
             <div class="ai-text {txt_cls}">
@@ -124,8 +93,126 @@ def gerar_html_card(nome_loteria, motor, valor_api=None):
             <div style="font-size:0.7rem; color:#94a3b8;">MOTOR V.1</div>
         </div>
     </div>
+    """)
+
+TEMPLATE_DEGRADADO = textwrap.dedent("""
+    <div class="card-loteria">
+        <div class="card-header">
+            <div class="loteria-title" style="color: {cor}">{nome}</div>
+            <div class="next-draw">Próx: --</div>
+        </div>
+        <div class="prize-section">
+            <div class="prize-label">Estimativa de Prêmio</div>
+            <div class="prize-value" style="color: #cbd5e1">R$ ---</div>
+        </div>
+        <div class="last-result-section">
+            <div class="last-conc-info">{motivo}</div>
+        </div>
+    </div>
+    """)
+
+HTML_ATRASADAS = '<div class="last-conc-info" style="margin:8px 0 0">⏳ Atrasadas: {}</div>'
+MAX_ATRASADAS_CARD = 5
+HTML_IDADE = '<div class="last-conc-info" style="text-align:right; margin:4px 8px 0">📦 Pré-calculado • conferido {}</div>'
+BADGE_ACUMULADO = '<div class="status-badge bg-acumulado">ACUMULOU!</div>'
+BADGE_NORMAL = '<div class="status-badge bg-normal">NORMAL</div>'
+ESTILO_SINAL = {"go": ("signal-go", "txt-go", "light-green", "🚀")}
+ESTILO_ESPERA = ("signal-wait", "txt-wait", "light-yellow", "✋")
+
+COLS_PREMIO = ['Estimativa Próximo', 'Prêmio Estimado', 'Valor Acumulado', 'Acumulado']
+MAX_CARDS_CACHE = 64  # cards renderizados guardados (LRU, compartilhado entre sessões)
+
+_cache_cards = OrderedDict()
+_lock_cards = threading.Lock()
+
+
+@lru_cache(maxsize=32)
+def colunas_premio(colunas):
+    """Nomes reais das colunas de prêmio (comparação sem caixa), resolvidos uma vez por esquema."""
+    por_minusculo = {}
+    for x in colunas: por_minusculo.setdefault(x.lower(), x)
+    return tuple(por_minusculo[c.lower()] for c in COLS_PREMIO if c.lower() in por_minusculo)
+
+
+def _estado_card(motor):
+    """(concurso, prêmio da planilha, dezenas): o que muda o card além do nome, da API e do sinal."""
+    if motor.vazio: return None
+    last = motor.ultimo
+    premio_planilha = None
+    for c in colunas_premio(tuple(motor.colunas)):
+        if str(last.get(c)).strip() not in ['0', '', '0,00']:
+            premio_planilha = last.get(c)
+            break
+    return str(last.get('Concurso', '--')), premio_planilha, tuple(motor.ultimo_sorteio())
+
+
+def _atrasadas(motor):
+    # Só no cache miss: o índice de atrasos é uma passada no histórico, e só muda com o concurso (que está na chave)
+    try: return tuple(motor.atrasos.atrasadas()[:MAX_ATRASADAS_CARD])
+    except Exception: return ()
+
+
+def _renderizar_card(nome_loteria, estado, valor_api, sinal, motor=None):
+    cor_marca = get_brand_color(nome_loteria)
+    txt_sinal, tipo_sinal = sinal
+    concurso, prox, premio, numeros, atrasadas = "--", "--", "Apurando...", (), ()
+
+    if estado is not None:
+        concurso, premio_planilha, numeros = estado
+        if motor is not None: atrasadas = _atrasadas(motor)
+        if concurso.isdigit(): prox = str(int(concurso) + 1)
+        # PRIORIDADE 1: API ; PRIORIDADE 2: Planilha
+        if valor_api and valor_api > 0: premio = formatar_moeda(valor_api)
+        elif premio_planilha is not None: premio = formatar_moeda(premio_planilha)
+
+    ft_cls, txt_cls, l_cls, icon = ESTILO_SINAL.get(tipo_sinal, ESTILO_ESPERA)
+    css_bola = "ball-mini" if len(numeros) > 10 else "ball-style"
+    bola = f'<div class="{css_bola}">{{}}</div>'
+    return TEMPLATE_CARD.format(
+        cor=cor_marca, nome=nome_loteria, prox=prox, premio=premio,
+        badge=BADGE_ACUMULADO if "ACUMULADO" in txt_sinal else BADGE_NORMAL,
+        concurso=concurso, bolas="".join(bola.format(n) for n in numeros),
+        atrasadas=HTML_ATRASADAS.format(", ".join(map(str, atrasadas))) if atrasadas else "",
+        ft_cls=ft_cls, txt_cls=txt_cls, l_cls=l_cls, icon=icon, txt_sinal=txt_sinal)
+
+
+def gerar_html_card(nome_loteria, motor, valor_api=None):
     """
-    return textwrap.dedent(html_template)
+    HTML do card. Memoizado em (loteria, último concurso, prêmio, sinal): com o
+    dashboard parado, redesenhar é só uma consulta ao cache.
+    """
+    sinal = motor.analisar_sinal()
+    try: estado = _estado_card(motor)
+    except Exception: estado = None
+    chave = (nome_loteria, estado, valor_api, sinal)
+    try: hash(chave)
+    except TypeError: return _renderizar_card(nome_loteria, estado, valor_api, sinal, motor)
+
+    with _lock_cards:
+        html = _cache_cards.get(chave)
+        if html is not None:
+            _cache_cards.move_to_end(chave)
+            return html
+    html = _renderizar_card(nome_loteria, estado, valor_api, sinal, motor)
+    with _lock_cards:
+        _cache_cards[chave] = html
+        while len(_cache_cards) > MAX_CARDS_CACHE: _cache_cards.popitem(last=False)
+    return html
+
+
+def limpar_cache_cards():
+    with _lock_cards: _cache_cards.clear()
+
+
+def gerar_html_card_degradado(nome_loteria, motivo="Carregando..."):
+    """Card reduzido para quando a planilha não respondeu a tempo (ou ainda está carregando)."""
+    return TEMPLATE_DEGRADADO.format(cor=get_brand_color(nome_loteria), nome=nome_loteria, motivo=motivo)
+
+def gerar_html_idade(segundos):
+    """Linha abaixo do card servido de um snapshot: há quanto tempo os dados foram conferidos."""
+    minutos = int(segundos // 60)
+    quando = "agora" if minutos < 1 else f"há {minutos} min" if minutos < 120 else f"há {minutos // 60} h"
+    return HTML_IDADE.format(quando)
 
 def gerar_ticket_visual(nome_loteria, numeros):
     cor = get_brand_color(nome_loteria)
@@ -1,26 +1,25 @@
 # Arquivo: motores/__init__.py
 
-# 1. Importa a Base (O Pai de todos)
-from .base import MotorBase
-
-# 2. Tenta importar os filhos (Especialistas)
-# O try/except evita que o sistema quebre se você ainda não criou o arquivo de algum jogo.
-
-try: from .mega_sena import MotorMegaSena
-except ImportError: pass
-
-try: from .lotofacil import MotorLotofacil
-except ImportError: pass
-
-try: from .quina import MotorQuina
-except ImportError: pass
-
-try: from .dia_de_sorte import MotorDiaDeSorte
-except ImportError: pass
-
-try: from .dupla_sena import MotorDuplaSena
-except ImportError: pass
-
-# Se criar Timemania ou Lotomania no futuro, adicione aqui:
-# try: from .timemania import MotorTimemania
-# except ImportError: pass
+# Os motores são carregados sob demanda (ver motores/registro.py):
+# `from motores import MotorMegaSena` continua funcionando, mas só importa
+# o módulo da Mega Sena quando o nome é acessado pela primeira vez.
+# Se criar Timemania ou Lotomania no futuro, registre em motores/registro.py.
+
+_CLASSES = {
+    "MotorBase": ".base",
+    "MotorMegaSena": ".mega_sena",
+    "MotorLotofacil": ".lotofacil",
+    "MotorQuina": ".quina",
+    "MotorDiaDeSorte": ".dia_de_sorte",
+    "MotorDuplaSena": ".dupla_sena",
+}
+
+__all__ = list(_CLASSES)
+
+
+def __getattr__(nome):
+    if nome not in _CLASSES: raise AttributeError(f"module 'motores' has no attribute '{nome}'")
+    import importlib
+    valor = getattr(importlib.import_module(_CLASSES[nome], __name__), nome)
+    globals()[nome] = valor
+    return valor
@@ -0,0 +1,182 @@
+"""
+Amostragem exata de jogos que respeitam filtros declarativos.
+
+Em vez de sortear e rejeitar, contamos (programação dinâmica) quantos jogos
+válidos existem a partir de cada estado e sorteamos dezena a dezena com as
+probabilidades certas. Resultado: distribuição uniforme sobre os jogos
+válidos do pool, com custo fixo por jogo (uma passada pelo universo).
+
+Filtros aceitos (todos opcionais):
+    {"soma": (140, 240),          # soma das dezenas
+     "max_seq": 2,                # maior sequência de números consecutivos
+     "pares": (2, 4),             # quantidade de dezenas pares
+     "faixas": (15, 0, 3)}        # universo em blocos de 15: cada bloco com 0..3 dezenas
+
+O estado da DP é (escolhidas, sequência atual, soma, pares, dezenas na faixa
+atual); dimensões de filtros ausentes têm tamanho 1. As contagens são float64
+(a Lotomania passa de 1e29 combinações), então a uniformidade é exata até o
+arredondamento de ponto flutuante.
+"""
+import numpy as np
+
+EIXO_C, EIXO_R, EIXO_S, EIXO_P, EIXO_G = range(5)
+
+
+def normalizar_filtros(filtros):
+    """Aceita listas vindas do JSON e descarta chaves vazias."""
+    if not filtros: return {}
+    out = {}
+    if filtros.get("soma") is not None: out["soma"] = tuple(int(x) for x in filtros["soma"])
+    if filtros.get("max_seq") is not None: out["max_seq"] = int(filtros["max_seq"])
+    if filtros.get("pares") is not None: out["pares"] = tuple(int(x) for x in filtros["pares"])
+    if filtros.get("faixas") is not None: out["faixas"] = tuple(int(x) for x in filtros["faixas"])
+    return out
+
+
+def _deslocar(arr, eixo, passo):
+    """out[..., i, ...] = arr[..., i + passo, ...] (zero fora dos limites)."""
+    if passo == 0: return arr
+    out = np.zeros_like(arr)
+    tam = arr.shape[eixo]
+    if passo < tam:
+        fonte = [slice(None)] * arr.ndim
+        dest = [slice(None)] * arr.ndim
+        fonte[eixo] = slice(passo, tam)
+        dest[eixo] = slice(0, tam - passo)
+        out[tuple(dest)] = arr[tuple(fonte)]
+    return out
+
+
+class AmostradorRestrito:
+    def __init__(self, max_dezenas, tamanho_jogo, pool=None, filtros=None):
+        self.n = int(max_dezenas)
+        self.k = int(tamanho_jogo)
+        self.filtros = normalizar_filtros(filtros)
+        permitido = np.zeros(self.n + 1, dtype=bool)
+        permitido[np.asarray(pool if pool is not None else range(1, self.n + 1), dtype=np.int64)] = True
+        self.permitido = permitido
+
+        f = self.filtros
+        self.soma_min, self.soma_max = f.get("soma", (0, None))
+        self.max_seq = f.get("max_seq")
+        self.pares_min, self.pares_max = f.get("pares", (0, self.k))
+        self.faixa, self.faixa_min, self.faixa_max = f.get("faixas", (self.n, 0, self.k))
+
+        self.forma = (
+            self.k + 1,
+            (self.max_seq + 1) if self.max_seq is not None else 1,
+            (self.soma_max + 1) if self.soma_max is not None else 1,
+            (self.k + 1) if "pares" in f else 1,
+            (self.k + 1) if "faixas" in f else 1,
+        )
+        self._construir()
+
+    # --- TRANSIÇÕES ---
+
+    def _fim_de_faixa(self, v):
+        return "faixas" in self.filtros and (v % self.faixa == 0 or v == self.n)
+
+    def _proximo(self, v, c, r, s, p, g, incluir):
+        """Estado depois de decidir a dezena v (índices podem sair da tabela = inválido)."""
+        usa = self.forma
+        if incluir:
+            c = c + 1
+            r = r + 1 if usa[EIXO_R] > 1 else r
+            s = s + v if usa[EIXO_S] > 1 else s
+            p = p + (v % 2 == 0) if usa[EIXO_P] > 1 else p
+            g = g + 1 if usa[EIXO_G] > 1 else g
+        else:
+            r = r * 0
+        if self._fim_de_faixa(v):
+            fora = (g < self.faixa_min) | (g > self.faixa_max)
+            g = np.where(fora, -1, 0)
+        return c, r, s, p, g
+
+    def _ler(self, prox, v, incluir):
+        """Para cada estado antes de v, o valor de `prox` no estado depois de decidir v."""
+        forma = self.forma
+        if self._fim_de_faixa(v):
+            # Fecha a faixa: a próxima começa em g = 0; só passa quem ficou dentro dos limites
+            base = np.ascontiguousarray(np.broadcast_to(prox[..., :1], forma))
+            g_final = np.arange(forma[EIXO_G]) + (1 if incluir else 0)
+            base = base * ((g_final >= self.faixa_min) & (g_final <= self.faixa_max))
+        else:
+            base = prox
+            if incluir and forma[EIXO_G] > 1: base = _deslocar(base, EIXO_G, 1)
+        if not incluir:
+            # Sequência zera ao pular uma dezena
+            return np.ascontiguousarray(np.broadcast_to(base[:, :1], forma))
+        if not self.permitido[v]: return np.zeros(forma)
+        out = _deslocar(base, EIXO_C, 1)
+        if forma[EIXO_R] > 1: out = _deslocar(out, EIXO_R, 1)
+        if forma[EIXO_S] > 1: out = _deslocar(out, EIXO_S, v)
+        if forma[EIXO_P] > 1 and v % 2 == 0: out = _deslocar(out, EIXO_P, 1)
+        return out
+
+    def _construir(self):
+        """W[v][estado] = nº de formas de completar um jogo válido usando as dezenas v..n."""
+        forma = self.forma
+        final = np.zeros(forma)
+        # Terminal: k dezenas escolhidas, soma/pares dentro dos limites e última faixa fechada (g = 0)
+        s_ok = np.ones(forma[EIXO_S], dtype=bool)
+        if forma[EIXO_S] > 1: s_ok[:self.soma_min] = False
+        p_ok = np.ones(forma[EIXO_P], dtype=bool)
+        if forma[EIXO_P] > 1:
+            p_ok[:] = False
+            p_ok[self.pares_min:self.pares_max + 1] = True
+        final[self.k, :, :, :, 0] = (s_ok[:, None] & p_ok[None, :])[None, :, :]
+
+        self.W = [None] * (self.n + 2)
+        self.W[self.n + 1] = final
+        for v in range(self.n, 0, -1):
+            prox = self.W[v + 1]
+            self.W[v] = self._ler(prox, v, False) + self._ler(prox, v, True)
+
+    # --- CONSULTA / SORTEIO ---
+
+    def total(self):
+        """Quantos jogos válidos existem no pool."""
+        return float(self.W[1][0, 0, 0, 0, 0])
+
+    def _tabelas_com_borda(self):
+        """
+        Cópias achatadas de W com uma borda de zeros em volta: qualquer estado
+        inválido (fora dos limites) cai na borda e vale 0, sem testes por sorteio.
+        """
+        if getattr(self, "_planos", None) is None:
+            k, r, s, p, g = self.forma
+            borda = (k + 2, r + 1 if r > 1 else 1, s + self.n + 1 if s > 1 else 1, p + 1 if p > 1 else 1, g + 2 if g > 1 else 1)
+            self._desloc_g = 1 if g > 1 else 0
+            self._passos = np.array(np.zeros(borda).strides) // 8
+            self._planos = [None] * (self.n + 2)
+            for v in range(2, self.n + 2):
+                t = np.zeros(borda)
+                t[:k, :r, :s, :p, self._desloc_g:self._desloc_g + g] = self.W[v]
+                self._planos[v] = t.ravel()
+        return self._planos
+
+    def sortear(self, m, rng):
+        """(m × k) uint8 ordenado, uniforme entre os jogos válidos."""
+        if self.total() <= 0:
+            raise ValueError("Nenhum jogo satisfaz os filtros com este pool.")
+        planos = self._tabelas_com_borda()
+        passos = self._passos
+
+        def pegar(tabela, c, r, s, p, g):
+            return tabela[c * passos[0] + r * passos[1] + s * passos[2] + p * passos[3] + (g + self._desloc_g) * passos[4]]
+
+        c = np.zeros(m, dtype=np.int64)
+        r, s, p, g = (np.zeros(m, dtype=np.int64) for _ in range(4))
+        jogos = np.zeros((m, self.k), dtype=np.uint8)
+        for v in range(1, self.n + 1):
+            ce, re, se, pe, ge = self._proximo(v, c, r, s, p, g, False)
+            if not self.permitido[v]:
+                c, r, s, p, g = ce, re, se, pe, ge
+                continue
+            ci, ri, si, pi, gi = self._proximo(v, c, r, s, p, g, True)
+            w_incl = pegar(planos[v + 1], ci, ri, si, pi, gi)
+            w_excl = pegar(planos[v + 1], ce, re, se, pe, ge)
+            inclui = rng.random(m) * (w_incl + w_excl) < w_incl
+            jogos[inclui, np.minimum(c[inclui], self.k - 1)] = v
+            c, r, s, p, g = (np.where(inclui, a, b) for a, b in ((ci, ce), (ri, re), (si, se), (pi, pe), (gi, ge)))
+        return jogos
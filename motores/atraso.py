@@ -0,0 +1,112 @@
+"""
+Índice de atraso por dezena.
+
+Para cada dezena: o último sorteio em que saiu, o atraso atual (sorteios
+desde então; 0 = saiu no último) e a distribuição dos intervalos entre
+aparições (máximo, média, percentis). A primeira passada é vetorizada: as
+posições (sorteio, dezena) da matriz são ordenadas por dezena e os intervalos
+saem de uma diferença. Cada sorteio novo custa O(bolas).
+
+Intervalo = diferença de índices entre duas aparições seguidas (1 = saiu em
+sorteios consecutivos). O trecho aberto desde a última aparição não entra na
+distribuição; ele é o atraso atual.
+"""
+import numpy as np
+
+from .frequencia import _anexar
+
+PERCENTIS = (50, 90)
+
+
+class Atrasos:
+    def __init__(self, freq):
+        """Lê os sorteios cronológicos de `freq` (Frequencias) numa passada só."""
+        self.freq = freq
+        self.max_dezenas = m = freq.max_dezenas
+        linhas = freq.linhas()
+        lin, col = np.nonzero(linhas)
+        num = linhas[lin, col].astype(np.int64) - 1
+        # np.nonzero já devolve `lin` crescente; sort estável em uint8 é radix (linear)
+        ordem = np.argsort(num.astype(np.uint8), kind='stable')
+        num, lin = num[ordem], lin[ordem].astype(np.int64)
+        mesma = num[1:] == num[:-1]
+        gaps = (lin[1:] - lin[:-1])[mesma]
+        validos = gaps > 0  # dezena repetida no mesmo sorteio não vira intervalo
+        self._gaps = np.column_stack([num[1:][mesma][validos], gaps[validos]])
+        self._n_gaps = self._gaps.shape[0]
+        # Última aparição (índice cronológico) = último elemento de cada grupo
+        self.ultimo = np.full(m, -1, dtype=np.int64)
+        fim = np.r_[~mesma, True] if num.size else np.zeros(0, dtype=bool)
+        self.ultimo[num[fim]] = lin[fim]
+        self._resumo = None
+
+    def __len__(self):
+        return len(self.freq)
+
+    @property
+    def atual(self):
+        """Atraso atual de cada dezena (nunca saiu = total de sorteios)."""
+        n = len(self.freq)
+        return np.where(self.ultimo >= 0, n - 1 - self.ultimo, n)
+
+    def resumo(self):
+        """
+        Arrays por dezena (índice 0 = dezena 1): contagem de intervalos, máximo,
+        média e percentis (PERCENTIS), com interpolação linear. Sem intervalo = 0.
+        """
+        if self._resumo is None:
+            m = self.max_dezenas
+            g = self._gaps[:self._n_gaps]
+            # Ordena por (dezena, intervalo): dois sorts estáveis, o último pela chave principal
+            ordem = np.argsort(g[:, 1], kind='stable')
+            ordem = ordem[np.argsort(g[ordem, 0].astype(np.uint8), kind='stable')]
+            num, val = g[ordem, 0], g[ordem, 1].astype(float)
+            qtd = np.bincount(num, minlength=m)
+            ini = np.concatenate([[0], np.cumsum(qtd)[:-1]])
+            soma = np.bincount(num, weights=val, minlength=m)
+            tem = qtd > 0
+            r = {"intervalos": qtd,
+                 "media": np.where(tem, soma / np.maximum(qtd, 1), 0.0),
+                 "max": np.where(tem, val[np.maximum(ini + qtd - 1, 0)] if val.size else 0.0, 0.0)}
+            for p in PERCENTIS:
+                # Percentil de cada grupo já ordenado: posição fracionária dentro do grupo
+                pos = ini + (p / 100) * np.maximum(qtd - 1, 0)
+                lo = np.floor(pos).astype(np.int64)
+                hi = np.minimum(lo + 1, ini + qtd - 1)
+                if val.size:
+                    lo_c, hi_c = np.minimum(lo, val.size - 1), np.clip(hi, 0, val.size - 1)
+                    v = val[lo_c] + (pos - lo) * (val[hi_c] - val[lo_c])
+                else: v = np.zeros(m)
+                r[f"p{p}"] = np.where(tem, v, 0.0)
+            self._resumo = r
+        return self._resumo
+
+    def razao(self):
+        """(atraso atual + 1) / intervalo médio: > 1 = passou do ritmo habitual."""
+        r = self.resumo()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(r["media"] > 0, (self.atual + 1) / r["media"], 0.0)
+
+    def atrasadas(self, k=None, percentil=90):
+        """
+        Dezenas "vencidas": atraso atual + 1 acima do percentil `percentil` dos
+        próprios intervalos, da mais para a menos atrasada (pela razão).
+        Com k, devolve as k maiores razões mesmo abaixo do percentil.
+        """
+        razao = self.razao()
+        ordem = np.argsort(-razao, kind='stable')
+        if k is not None: return (ordem[:k] + 1).tolist()
+        limite = self.resumo()[f"p{percentil}"]
+        vencidas = (self.atual + 1 > limite) & (limite > 0)
+        return (ordem[vencidas[ordem]] + 1).tolist()
+
+    def adicionar(self, linha):
+        """Chamado depois de `freq.adicionar(linha)`: O(bolas)."""
+        i = len(self.freq) - 1
+        d = np.asarray(linha, dtype=np.int64)
+        for x in np.unique(d[(d >= 1) & (d <= self.max_dezenas)]) - 1:
+            if self.ultimo[x] >= 0:
+                self._gaps = _anexar(self._gaps, self._n_gaps, (x, i - self.ultimo[x]))
+                self._n_gaps += 1
+            self.ultimo[x] = i
+        self._resumo = None
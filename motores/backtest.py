@@ -0,0 +1,105 @@
+"""
+Backtest das estratégias sobre o histórico.
+
+Para cada concurso alvo, o motor enxerga só os sorteios ANTERIORES a ele,
+gera K palpites por estratégia (gerar_lote) e os acertos são contados com
+AND + popcount entre as bitmasks dos palpites e a do resultado real. Com
+mais de um sorteio por concurso (Dupla Sena), cada sorteio é conferido
+separado e vale o melhor. O motor é montado uma vez por bloco, no alvo mais
+antigo, e avança com adicionar_sorteio (nada de remontar a cada concurso).
+
+O trabalho é dividido em blocos de concursos num pool de processos. Cada
+concurso tem seu próprio fluxo de números aleatórios (SeedSequence com o
+índice do concurso como spawn_key), então o resultado não depende de quantos
+processos rodaram nem de como os blocos foram divididos.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .matriz import acertos, para_mascaras
+
+ESTRATEGIAS = ["Equilíbrio", "Tendência", "Mestre"]
+MIN_HISTORICO = 30  # concursos mínimos antes do primeiro alvo
+
+
+def _resultados(motor, linha):
+    """Bitmasks do resultado de um concurso: uma por sorteio (Dupla Sena: 2) ou a linha inteira."""
+    sorteios = motor._jogos_do_sorteio(linha[None, :])
+    return para_mascaras(sorteios if sorteios.shape[0] else linha[None, :])
+
+
+def _rodar_bloco(classe, config, matriz, concursos, alvos, estrategias, k, seed):
+    """
+    Executa no processo filho. `alvos` são índices na matriz (0 = mais recente).
+    Retorna {estrategia: histograma de acertos}, o total de concursos avaliados
+    e {estrategia: concursos em que não foi possível gerar os K jogos}.
+    """
+    tam_hist = max(config['tamanho_jogo'], matriz.shape[1]) + 1
+    hist = {e: np.zeros(tam_hist, dtype=np.int64) for e in estrategias}
+    falhas = {e: 0 for e in estrategias}
+    alvos = sorted(alvos, reverse=True)  # do mais antigo para o mais recente
+    if not alvos: return hist, 0, falhas
+    atual = alvos[0] + 1  # o motor tem os sorteios matriz[atual:]
+    motor = classe.de_matriz(matriz[atual:], config, concursos[atual:])
+    for i in alvos:
+        while atual > i + 1:
+            atual -= 1
+            motor.adicionar_sorteio(matriz[atual], int(concursos[atual]))
+        resultados = _resultados(motor, matriz[i])
+        for j, e in enumerate(estrategias):
+            rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(int(i), j)))
+            try: jogos = motor.gerar_lote(e, k, rng=rng)
+            except ValueError:
+                falhas[e] += 1
+                continue
+            pontos = acertos(para_mascaras(jogos)[:, None, :], resultados[None, :, :]).max(axis=1)
+            hist[e] += np.bincount(pontos, minlength=tam_hist)[:tam_hist]
+    return hist, len(alvos), falhas
+
+
+def _blocos(alvos, tamanho):
+    return [alvos[i:i + tamanho] for i in range(0, len(alvos), tamanho)]
+
+
+def backtest(entradas, estrategias=ESTRATEGIAS, k=1000, ultimos=None, inicio=MIN_HISTORICO,
+             seed=0, workers=None, tamanho_bloco=None):
+    """
+    entradas: lista de (nome_loteria, motor) — o motor já montado com o histórico completo.
+    ultimos: avalia só os N concursos mais recentes (None = todos com histórico suficiente).
+    Retorna um DataFrame: uma linha por (loteria, estratégia) com a distribuição de acertos.
+    """
+    workers = workers or os.cpu_count() or 1
+    tarefas = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for nome, motor in entradas:
+            n = motor.matriz.shape[0]
+            alvos = list(range(max(0, n - inicio)))
+            if ultimos is not None: alvos = alvos[:ultimos]
+            if not alvos: continue
+            bloco = tamanho_bloco or max(1, -(-len(alvos) // (4 * workers)))
+            for b in _blocos(alvos, bloco):
+                fut = pool.submit(_rodar_bloco, type(motor), motor.config, motor.matriz, motor.concursos,
+                                  b, list(estrategias), k, seed)
+                tarefas.append((nome, motor, fut))
+
+        totais = {}
+        for nome, motor, fut in tarefas:
+            hist, n_conc, falhas = fut.result()
+            for e, h in hist.items():
+                chave = (nome, e)
+                if chave not in totais: totais[chave] = [np.zeros_like(h), 0, 0]
+                totais[chave][0] += h
+                totais[chave][1] += n_conc
+                totais[chave][2] += falhas[e]
+
+    linhas = []
+    for (nome, e), (h, n_conc, falhas) in totais.items():
+        jogos = int(h.sum())
+        linha = {"Loteria": nome, "Estratégia": e, "Concursos": n_conc, "Jogos": jogos, "Falhas": falhas,
+                 "Média": float((np.arange(h.size) * h).sum() / jogos) if jogos else 0.0}
+        linha.update({f"{a} acertos": int(c) for a, c in enumerate(h)})
+        linhas.append(linha)
+    return pd.DataFrame(linhas).fillna(0)
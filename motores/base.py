@@ -1,23 +1,138 @@
-import pandas as pd
+from collections import OrderedDict
+
 import numpy as np
 
+from . import desdobramento, lote
+from .amostragem import AmostradorRestrito, normalizar_filtros
+from .atraso import Atrasos
+from .caracteristicas import Caracteristicas
+from .coocorrencia import Coocorrencias
+from .frequencia import Frequencias
+from .matriz import colunas_dezenas, parse_concursos, parse_matriz, para_mascaras
+from .ranking import IndiceJogos
+
+
+def _com_folga(buf, folga):
+    """Cópia de `buf` com `folga` linhas vazias no começo (onde entram os sorteios novos)."""
+    novo = np.zeros((folga + buf.shape[0],) + buf.shape[1:], dtype=buf.dtype)
+    novo[folga:] = buf
+    return novo
+
+
 class MotorBase:
+    # Filtros declarativos (ver motores/amostragem.py); o config da loteria pode sobrescrever com "filtros"
+    FILTROS = None
+    # Amostradores guardados por pool (~8 MB cada na Mega Sena); o backtest troca de pool quase todo concurso
+    MAX_AMOSTRADORES = 4
+    # Descarta palpites que repetem um sorteio do histórico ou um palpite já salvo (registrar_salvos)
+    EVITAR_REPETIDOS = True
+    TENTATIVAS_INEDITO = 50
+
     def __init__(self, df, config):
-        self.df = df
+        # Identifica colunas D1, D2... ignorando colunas de Data ou Concurso
+        colunas = list(df.columns) if df is not None else []
+        cols = colunas_dezenas(colunas)
+        
+        # Converte o histórico UMA vez: matriz uint8 (sorteios × bolas) + bitmask por sorteio.
+        # O DataFrame de strings não é guardado; só a última linha (status/prêmio) fica em dict.
+        self._iniciar(config, parse_matriz(df, cols, config['max_dezenas']), parse_concursos(df),
+                      df.iloc[0].to_dict() if df is not None and not df.empty else {}, colunas, cols)
+
+    @classmethod
+    def de_matriz(cls, matriz, config, concursos=None, ultimo=None, colunas=None):
+        """
+        Monta o motor direto de uma matriz já convertida (linha 0 = mais recente), sem DataFrame.
+        `ultimo`/`colunas` (ex.: de um snapshot) preservam status e prêmio da última linha da planilha.
+        """
+        motor = cls.__new__(cls)
+        matriz = np.ascontiguousarray(matriz, dtype=np.uint8)
+        cols = colunas_dezenas(colunas) if colunas else []
+        if not colunas or len(cols) != matriz.shape[1]:
+            cols = [f"D{i + 1}" for i in range(matriz.shape[1])]
+            colunas = ['Concurso'] + cols
+        if concursos is None: concursos = np.full(matriz.shape[0], -1, dtype=np.int64)
+        if ultimo is None:
+            ultimo = {}
+            if matriz.shape[0]:
+                ultimo = {'Concurso': str(concursos[0]) if concursos[0] >= 0 else '--'}
+                ultimo.update({c: str(v) for c, v in zip(cols, matriz[0]) if v})
+        motor._iniciar(config, matriz, np.asarray(concursos, dtype=np.int64), dict(ultimo), list(colunas), cols)
+        return motor
+
+    def _iniciar(self, config, matriz, concursos, ultimo, colunas, cols):
         self.config = config
+        # Campos do config usados em todo palpite viram atributos (nada de dict lookup no caminho quente)
+        self.max_dezenas = int(config['max_dezenas'])
+        self.tamanho_jogo = int(config['tamanho_jogo'])
+        self.filtros = normalizar_filtros(config.get('filtros', self.FILTROS))
+        self._amostradores = OrderedDict()
+        self.colunas = colunas
+        self.cols = cols
+        self.matriz = matriz
+        self.mascaras = para_mascaras(self.matriz)
+        self.concursos = concursos
+        # matriz/mascaras/concursos são views de buffers com folga no começo (ver adicionar_sorteio)
+        self._bufs = (self.matriz, self.mascaras, self.concursos)
+        self._livre = 0
+        self.ultimo = ultimo
         
-        # Identifica colunas D1, D2... ignorando colunas de Data ou Concurso
-        self.cols = [c for c in df.columns if c.startswith('D') and any(char.isdigit() for char in c) and 'Data' not in c]
+        # Contadores de frequência (total, janelas, decaimento) + memo de get_stats
+        self.freq = Frequencias(self.matriz, self.max_dezenas)
+        self._memo_stats = {}
+        self._cooc = None  # pares/trincas: só montados quando alguma estratégia pede
+        self._atrasos = None
+        self._caract = None
+        self._indice_hist = None
+        self.salvos = IndiceJogos(self.max_dezenas, self.tamanho_jogo)
+
+    @property
+    def vazio(self):
+        return self.matriz.shape[0] == 0
+
+    def ultimo_sorteio(self):
+        """Dezenas do concurso mais recente (na ordem das colunas, sem vazios)"""
+        if self.vazio: return []
+        linha = self.matriz[0]
+        return linha[linha > 0].astype(int).tolist()
+
+    def adicionar_sorteio(self, dezenas, concurso=None):
+        """
+        Acrescenta um concurso novo sem reconstruir o motor (vira a linha 0).
+        Os buffers têm folga no começo, dobrada quando acaba: O(bolas) amortizado, sem copiar o histórico.
+        """
+        linha = np.zeros((1, self.matriz.shape[1]), dtype=np.uint8)
+        d = np.asarray(dezenas, dtype=np.int64)[:linha.shape[1]]
+        linha[0, :d.size] = np.where((d >= 1) & (d <= self.max_dezenas), d, 0)
+        if self._livre == 0:
+            folga = max(16, self.matriz.shape[0])
+            self._bufs = tuple(_com_folga(b[self._livre:], folga) for b in self._bufs)
+            self._livre = folga
+        self._livre -= 1
+        i = self._livre
+        buf_matriz, buf_mascaras, buf_concursos = self._bufs
+        buf_matriz[i] = linha[0]
+        buf_mascaras[i] = para_mascaras(linha)[0]
+        buf_concursos[i] = concurso if concurso is not None else -1
+        self.matriz, self.mascaras, self.concursos = buf_matriz[i:], buf_mascaras[i:], buf_concursos[i:]
+        self.freq.adicionar(linha[0])
+        if self._cooc is not None: self._cooc.adicionar(linha[0])
+        if self._atrasos is not None: self._atrasos.adicionar(linha[0])
+        if self._caract is not None: self._caract.adicionar(linha[0])
+        if self._indice_hist is not None: self._indice_hist.adicionar(self._jogos_do_sorteio(linha))
+        self._memo_stats.clear()
+        # Status/prêmio do concurso novo ainda não são conhecidos
+        self.ultimo = {'Concurso': str(concurso) if concurso is not None else '--'}
+        self.ultimo.update({c: str(v) for c, v in zip(self.cols, linha[0]) if v})
 
     def analisar_sinal(self):
         """Gera o sinal visual para o Dashboard (Verde/Amarelo)"""
         # Blindagem: Se não tem dados, retorna neutro
-        if self.df is None or self.df.empty: 
+        if self.vazio: 
             return "⚪ Aguardando", "neutral"
         
         try:
             # Pega a última linha (assumindo que é a mais recente)
-            last_row = self.df.iloc[0]
+            last_row = self.ultimo
             
             # Verifica se acumulou
             status = str(last_row.get('Status / Premiação', '')).upper()
@@ -27,22 +142,13 @@ class MotorBase:
             if "ACUMULOU" in status or "ACUMULADO" in status:
                 return "💰 ACUMULADO", "go"
             
-            # Limpeza de Dados para Análise Matemática
-            # Força conversão para números, ignorando erros
-            nums = []
-            for c in self.cols:
-                val = last_row.get(c)
-                try:
-                    # Tenta converter para float
-                    if val and str(val).strip():
-                        nums.append(float(val))
-                except:
-                    continue
+            # Dezenas já vêm limpas da matriz
+            nums = self.ultimo_sorteio()
             
             if not nums: return "⚪ Erro Dados", "neutral"
             
             # Cálculo do Desvio
-            media_esperada = (self.config['max_dezenas'] * self.config['tamanho_jogo']) / 2
+            media_esperada = (self.max_dezenas * self.tamanho_jogo) / 2
             soma = sum(nums)
             desvio = abs(soma - media_esperada)
             
@@ -55,64 +161,214 @@ class MotorBase:
         except Exception as e:
             return "⚠️ Erro", "neutral"
 
-    def get_stats(self):
-        """Calcula Quentes e Frios com tratamento de erro robusto"""
+    def get_stats(self, ultimos=None, meia_vida=None):
+        """
+        Calcula Quentes e Frios a partir dos contadores incrementais.
+        `ultimos`: só os N concursos mais recentes; `meia_vida`: pesos exponenciais.
+        """
         # Blindagem contra base vazia
-        if self.df is None or self.df.empty:
+        if self.vazio or not self.freq.total.any():
             return {"quentes": [], "frios": []}
 
-        # [CORREÇÃO DO ERRO TYPEERROR AQUI]
-        # 1. Seleciona apenas as colunas de bolas
-        df_bolas = self.df[self.cols].copy()
-        
-        # 2. Força a conversão de TUDO para números. 
-        # O que for texto inválido vira NaN (Not a Number)
-        df_bolas = df_bolas.apply(pd.to_numeric, errors='coerce')
-        
-        # 3. Transforma em uma lista única
-        todos = df_bolas.values.flatten()
-        
-        # 4. Remove os NaNs (agora funciona porque são float, não string)
-        todos = todos[~np.isnan(todos)]
-        
-        # Se após limpar não sobrou nada, retorna vazio
-        if len(todos) == 0:
-             return {"quentes": [], "frios": []}
+        chave = (ultimos, meia_vida)
+        if chave not in self._memo_stats:
+            self._memo_stats[chave] = self.freq.quentes_frios(ultimos=ultimos, meia_vida=meia_vida)
+        stats = self._memo_stats[chave]
+        # Cópia rasa: quem chama pode mexer nas listas sem estragar o memo
+        return {"quentes": list(stats["quentes"]), "frios": list(stats["frios"])}
 
-        # 5. Realiza a contagem
-        contagem = pd.Series(todos).value_counts().reindex(range(1, self.config['max_dezenas']+1), fill_value=0)
-        
-        corte = self.config['max_dezenas'] // 3
-        
-        return {
-            "quentes": contagem.sort_values(ascending=False).index[:corte].tolist(),
-            "frios": contagem.sort_values(ascending=True).index[:corte].tolist()
-        }
+    @property
+    def atrasos(self):
+        """Índice de atraso por dezena (motores/atraso.py), montado no primeiro uso."""
+        if self._atrasos is None: self._atrasos = Atrasos(self.freq)
+        return self._atrasos
 
-    def gerar_palpite(self, estrategia):
-        """Gerador Genérico"""
+    def get_atrasos(self):
+        """
+        Tabela de atrasos, uma entrada por dezena: último concurso em que saiu
+        (-1 se nunca), atraso atual e intervalos históricos (máx, média, p50, p90).
+        """
+        a = self.atrasos
+        r = a.resumo()
+        n = len(a)
+        ultimo = np.where(a.ultimo >= 0, self.concursos[np.clip(n - 1 - a.ultimo, 0, max(n - 1, 0))], -1) if n else a.ultimo
+        return {"dezena": list(range(1, self.max_dezenas + 1)), "ultimo_concurso": ultimo.tolist(),
+                "atraso": a.atual.tolist(), "max": r["max"].astype(int).tolist(),
+                "media": np.round(r["media"], 2).tolist(), "p50": r["p50"].tolist(), "p90": r["p90"].tolist()}
+
+    @property
+    def caracteristicas(self):
+        """Tabela de características por sorteio (motores/caracteristicas.py), montada no primeiro uso."""
+        if self._caract is None: self._caract = Caracteristicas(self.freq, self.tamanho_jogo)
+        return self._caract
+
+    def get_caracteristicas(self, ultimos=None, filtros=None):
+        """
+        Características dos sorteios (mais recente primeiro) como dict de listas,
+        com o concurso (e o sorteio, na Dupla Sena); `filtros` (dict ou expressão)
+        mantém só os que passam.
+        """
+        c = self.caracteristicas
+        t = c.tabela(ultimos)
+        s = c.por_concurso
+        concursos = np.repeat(self.concursos, s)[:t.shape[0]]
+        sorteio = np.tile(np.arange(s, 0, -1), len(self.concursos))[:t.shape[0]]
+        if filtros:
+            ok = c.filtrar(filtros, ultimos)
+            t, concursos, sorteio = t[ok], concursos[ok], sorteio[ok]
+        saida = {"concurso": concursos.tolist()}
+        if s > 1: saida["sorteio"] = sorteio.tolist()
+        saida.update({nome: t[:, i].tolist() for i, nome in enumerate(c.nomes)})
+        return saida
+
+    def filtrar_jogos(self, jogos, filtros):
+        """Máscara dos palpites (n × tamanho_jogo) que passam nos filtros, vetorizada sobre o lote."""
+        return self.caracteristicas.filtrar_jogos(jogos, filtros)
+
+    @property
+    def coocorrencia(self):
+        """Pares e trincas de dezenas (motores/coocorrencia.py), sobre o mesmo histórico do freq."""
+        if self._cooc is None: self._cooc = Coocorrencias(self.freq, self.tamanho_jogo)
+        return self._cooc
+
+    def _pool_afinidade(self, quentes, ultimos=None):
+        """
+        Núcleo de quentes + as dezenas com maior afinidade (lift médio de pares)
+        com ele: favorece combinações que costumam sair juntas.
+        """
+        nucleo = list(quentes[:self.tamanho_jogo])
+        tamanho = min(self.max_dezenas, max(self.max_dezenas // 3, 2 * self.tamanho_jogo))
+        lift = self.coocorrencia.afinidade(ultimos=ultimos)
+        score = lift[np.asarray(nucleo) - 1].mean(axis=0)
+        score[np.asarray(nucleo) - 1] = -np.inf
+        extras = (np.argsort(-score, kind='stable')[:tamanho - len(nucleo)] + 1).tolist()
+        return nucleo + extras
+
+    # --- REPETIDOS (índice combinatório, motores/ranking.py) ---
+
+    def _jogos_do_sorteio(self, linhas):
+        """
+        Sorteios como jogos de tamanho_jogo: a linha inteira quando a largura bate;
+        se for múltipla (ex.: Dupla Sena, 2 sorteios por concurso), cada metade.
+        """
+        k, largura = self.tamanho_jogo, linhas.shape[1]
+        if largura == 0 or largura % k: return np.zeros((0, k), dtype=np.uint8)
+        return linhas.reshape(-1, k)
+
+    @property
+    def indice_historico(self):
+        """Ranks de todos os sorteios do histórico (montado no primeiro uso)."""
+        if self._indice_hist is None:
+            self._indice_hist = IndiceJogos(self.max_dezenas, self.tamanho_jogo, self._jogos_do_sorteio(self.matriz))
+        return self._indice_hist
+
+    def registrar_salvos(self, jogos):
+        """Palpites já salvos (matriz de dezenas, ex.: parse_jogos_texto da aba) que não devem voltar."""
+        return self.salvos.adicionar(jogos)
+
+    def repetidos(self, jogos):
+        """Máscara: jogos que já saíram num sorteio ou já estão salvos."""
+        return self.indice_historico.contem(jogos) | self.salvos.contem(jogos)
+
+    # --- DESDOBRAMENTO (motores/desdobramento.py) ---
+
+    def bolas_por_sorteio(self):
+        """Dezenas sorteadas por sorteio (Lotomania: 20, mesmo com jogos de 50)."""
+        largura = self.matriz.shape[1]
+        return self.tamanho_jogo if largura == 0 or largura % self.tamanho_jogo == 0 else largura
+
+    def desdobrar(self, dezenas, acertos, sorteadas=None, tentativas=4, seed=0, workers=None):
+        """
+        Jogos cobrindo o grupo `dezenas`: se `sorteadas` dezenas do sorteio caírem
+        no grupo (padrão: todas as do sorteio que cabem nele), algum jogo faz pelo
+        menos `acertos`. Gera blocos (n × tamanho_jogo) uint8.
+        """
+        dezenas = sorted({int(d) for d in dezenas if 1 <= int(d) <= self.max_dezenas})
+        if sorteadas is None: sorteadas = min(self.bolas_por_sorteio(), len(dezenas))
+        return desdobramento.desdobrar(dezenas, self.tamanho_jogo, sorteadas, acertos,
+                                       tentativas=tentativas, seed=seed, workers=workers)
+
+    def _pool(self, estrategia):
+        """Dezenas candidatas de cada estratégia (universo inteiro se não houver estatística)"""
         stats = self.get_stats()
+        universo = list(range(1, self.max_dezenas+1))
         
         # Se não tem estatística (erro na base), gera aleatório
         if not stats['quentes']:
-            pool = range(1, self.config['max_dezenas']+1)
-            jogo = np.random.choice(pool, self.config['tamanho_jogo'], replace=False)
-            return sorted(jogo)
+            return universo
 
         pool = []
         if estrategia == "Tendência": 
             pool = stats['quentes']
+        elif estrategia == "Afinidade":
+            pool = self._pool_afinidade(stats['quentes'])
+        elif estrategia == "Atrasadas":
+            # As que mais passaram do próprio intervalo médio entre aparições
+            pool = self.atrasos.atrasadas(k=max(self.max_dezenas // 3, self.tamanho_jogo))
         elif estrategia == "Equilíbrio": 
             # Frios + Neutros (Neutros são Total - Quentes)
-            todos = set(range(1, self.config['max_dezenas']+1))
-            neutros = list(todos - set(stats['quentes']) - set(stats['frios']))
+            todos = set(universo)
+            neutros = sorted(todos - set(stats['quentes']) - set(stats['frios']))
             pool = stats['frios'] + neutros
         else: 
             pool = stats['quentes'] + stats['frios'] # Mestre
         
         # Garante tamanho mínimo do pool
-        if len(pool) < self.config['tamanho_jogo']: 
-            pool = range(1, self.config['max_dezenas']+1)
-        
-        jogo = np.random.choice(pool, self.config['tamanho_jogo'], replace=False)
+        if len(pool) < self.tamanho_jogo: 
+            pool = universo
+        return pool
+
+    def _amostrador(self, pool):
+        """Tabela de contagem dos filtros para este pool (construída uma vez e reaproveitada)"""
+        chave = tuple(sorted(int(x) for x in pool))
+        if chave in self._amostradores:
+            self._amostradores.move_to_end(chave)
+            return self._amostradores[chave]
+        a = AmostradorRestrito(self.max_dezenas, self.tamanho_jogo, chave, self.filtros)
+        # Pool sem nenhum jogo válido: usa o universo inteiro
+        if a.total() <= 0 and len(chave) < self.max_dezenas:
+            a = self._amostrador(range(1, self.max_dezenas + 1))
+        self._amostradores[chave] = a
+        # LRU: só os MAX_AMOSTRADORES pools mais recentes ficam na memória
+        while len(self._amostradores) > self.MAX_AMOSTRADORES: self._amostradores.popitem(last=False)
+        return a
+
+    def gerar_palpite(self, estrategia):
+        """Palpite inédito: sorteia de novo (até TENTATIVAS_INEDITO vezes) se repetir histórico ou salvos."""
+        jogo = self._sortear_palpite(estrategia)
+        if not self.EVITAR_REPETIDOS: return jogo
+        for _ in range(self.TENTATIVAS_INEDITO - 1):
+            if not self.repetidos(np.asarray(jogo)[None, :])[0]: break
+            jogo = self._sortear_palpite(estrategia)
+        return jogo
+
+    def _sortear_palpite(self, estrategia):
+        """Gerador Genérico"""
+        pool = self._pool(estrategia)
+        if self.filtros:
+            return self._amostrador(pool).sortear(1, np.random.default_rng())[0].tolist()
+        jogo = np.random.choice(pool, self.tamanho_jogo, replace=False)
         return sorted(jogo)
+
+    def gerar_lote(self, estrategia, n, seed=None, rng=None, consulta=None):
+        """
+        Gera n palpites distintos de uma vez: array (n × tamanho_jogo) uint8, linhas ordenadas.
+        `seed`/`rng` tornam o lote reprodutível. Jogos repetidos (histórico/salvos) são rejeitados.
+        `consulta`: filtro de características (ver motores/caracteristicas.py) aplicado ao lote.
+        """
+        rng = lote.rng_de(seed, rng)
+        pool = self._pool(estrategia)
+        k = self.tamanho_jogo
+        if self.filtros:
+            a = self._amostrador(pool)
+            return lote.completar_lote(lambda m: a.sortear(m, rng), n, k, limite=int(a.total()),
+                                       rejeitar=self._rejeitar(consulta))
+        return lote.completar_lote(lambda m: lote.sortear(pool, k, m, rng), n, k,
+                                   limite=lote.combinacoes(len(pool), k), rejeitar=self._rejeitar(consulta))
+
+    def _rejeitar(self, consulta=None):
+        """Máscara de descarte do lote: repetidos (se EVITAR_REPETIDOS) e/ou quem não passa na consulta."""
+        repetidos = self.repetidos if self.EVITAR_REPETIDOS else None
+        if not consulta: return repetidos
+        if repetidos is None: return lambda jogos: ~self.filtrar_jogos(jogos, consulta)
+        return lambda jogos: repetidos(jogos) | ~self.filtrar_jogos(jogos, consulta)
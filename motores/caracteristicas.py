@@ -0,0 +1,205 @@
+"""
+Características por jogo/sorteio, em colunas, e filtros como consultas.
+
+As mesmas funções servem para o histórico inteiro (uma passada vetorizada
+sobre a matriz) e para lotes de palpites (gerar_lote): soma, pares/ímpares,
+primos, amplitude, sequências de consecutivos, dezenas por faixa (décadas)
+e repetidas em relação ao sorteio anterior (AND + popcount das bitmasks).
+
+Filtros usam o mesmo vocabulário do amostrador (motores/amostragem.py):
+
+    {"soma": (140, 240), "pares": (2, 4), "max_seq": 2, "primos": (None, 2)}
+
+(tupla = mínimo/máximo, None = sem limite; número sozinho = máximo), ou uma
+expressão curta: "soma >= 150 and primos <= 2 or max_seq == 1". A expressão é
+lida por uma gramática fechada (coluna, comparação, número, unidos por and/or;
+and antes de or) e vira máscaras numpy: nada de eval, chamada de método ou
+acesso a atributo sobre texto do usuário.
+
+`Caracteristicas(freq, tamanho_jogo)` guarda a tabela do histórico em ordem
+cronológica, num buffer que cresce por dobra como o de Frequencias; cada
+sorteio novo custa O(bolas). Concursos com mais de um sorteio (Dupla Sena: 12
+bolas = 2 × 6) viram uma linha por sorteio (matriz.por_sorteio), para que soma,
+amplitude e sequências do histórico sejam comparáveis às dos palpites.
+"""
+import operator
+import re
+from collections.abc import Mapping
+
+import numpy as np
+
+from .frequencia import _anexar
+from .matriz import acertos, para_mascaras, por_sorteio
+
+FAIXA = 10  # largura das faixas (décadas): dezenas 1-10, 11-20, ...
+
+_PRIMOS = np.zeros(256, dtype=bool)
+for _p in range(2, 256):
+    _PRIMOS[_p] = all(_p % d for d in range(2, int(_p ** 0.5) + 1))
+
+
+def colunas(max_dezenas, faixa=FAIXA):
+    """Nomes das colunas, na ordem de `calcular`."""
+    faixas = [f"faixa_{i * faixa + 1}_{min((i + 1) * faixa, max_dezenas)}" for i in range(-(-max_dezenas // faixa))]
+    return ["dezenas", "soma", "pares", "impares", "primos", "amplitude", "max_seq", "consecutivas",
+            "repetidas"] + faixas
+
+
+def calcular(jogos, max_dezenas, anteriores=None, faixa=FAIXA):
+    """
+    (n × bolas) uint8 (0 = vazio) -> (n × colunas) int16.
+    anteriores: bitmasks (n × 2) do sorteio anterior de cada linha, ou (2,) para
+    todas (ex.: o último concurso, para palpites); None = repetidas fica 0.
+    """
+    jogos = np.asarray(jogos, dtype=np.uint8)
+    if jogos.ndim == 1: jogos = jogos[None, :]
+    jogos = np.sort(jogos, axis=1)
+    n = jogos.shape[0]
+    x = jogos.astype(np.int16)
+    cheio = x > 0
+    nf = -(-max_dezenas // faixa)
+    saida = np.zeros((n, 9 + nf), dtype=np.int16)
+    saida[:, 0] = cheio.sum(axis=1)
+    saida[:, 1] = x.sum(axis=1)
+    saida[:, 2] = (cheio & (x % 2 == 0)).sum(axis=1)
+    saida[:, 3] = saida[:, 0] - saida[:, 2]
+    saida[:, 4] = _PRIMOS[jogos].sum(axis=1)
+    if n and x.shape[1]:
+        # Linhas ordenadas com vazios (0) no começo: o primeiro não vazio é o menor
+        menor = np.where(cheio, x, np.int16(max_dezenas + 1)).min(axis=1)
+        saida[:, 5] = np.where(saida[:, 0] > 0, x[:, -1] - menor, 0)
+    if x.shape[1] > 1:
+        passo = (np.diff(x, axis=1) == 1) & cheio[:, :-1]
+        saida[:, 7] = passo.sum(axis=1)
+        # Maior sequência: comprimento da maior corrida de passos 1 (+1), com reinício a cada quebra
+        acum = np.cumsum(passo, axis=1, dtype=np.int16)
+        corrida = acum - np.maximum.accumulate(np.where(~passo, acum, 0), axis=1)
+        saida[:, 6] = np.where(saida[:, 0] > 0, corrida.max(axis=1) + 1, 0)
+    else:
+        saida[:, 6] = saida[:, 0] > 0
+    if anteriores is not None:
+        saida[:, 8] = acertos(para_mascaras(jogos), np.asarray(anteriores, dtype=np.uint64))
+    bloco = np.where(cheio, (x - 1) // faixa, -1)
+    for i in range(nf):
+        saida[:, 9 + i] = (bloco == i).sum(axis=1)
+    return saida
+
+
+# --- CONSULTAS EM TEXTO ---
+
+_COMPARACOES = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+                "==": operator.eq, "!=": operator.ne}
+_TOKEN = re.compile(r"\s*(?:(?P<numero>-?\d+(?:\.\d+)?)(?![\w.])|(?P<op><=|>=|==|!=|<|>)|(?P<nome>[A-Za-z_]\w*)(?![\w.(]))")
+
+
+def _tokens(expressao):
+    pos, texto = 0, expressao.strip()
+    while pos < len(texto):
+        m = _TOKEN.match(texto, pos)
+        if not m: raise ValueError(f"Filtro inválido perto de {texto[pos:pos + 20]!r}")
+        pos = m.end()
+        tipo = m.lastgroup
+        yield tipo, float(m.group(tipo)) if tipo == "numero" else m.group(tipo)
+
+
+def interpretar(expressao, nomes):
+    """
+    "soma >= 150 and primos <= 2 or max_seq == 1" -> [[(coluna, op, valor), ...], ...]
+    (OU de grupos E). Só aceita colunas de `nomes`, os operadores de _COMPARACOES e números.
+    """
+    tokens = list(_tokens(expressao))
+    if not tokens: raise ValueError("Filtro vazio")
+    grupos, atual, i = [], [], 0
+    while True:
+        trio = tokens[i:i + 3]
+        if [t for t, _ in trio] != ["nome", "op", "numero"]:
+            raise ValueError("Filtro inválido: esperado 'coluna <op> número' (ex.: soma >= 150)")
+        nome, op, valor = (v for _, v in trio)
+        if nome not in nomes: raise KeyError(f"Característica desconhecida: {nome}")
+        atual.append((nome, op, valor))
+        i += 3
+        if i == len(tokens): break
+        tipo, junta = tokens[i]
+        if tipo != "nome" or junta not in ("and", "or"): raise ValueError(f"Filtro inválido: esperado and/or, veio {junta!r}")
+        if junta == "or": grupos.append(atual); atual = []
+        i += 1
+    grupos.append(atual)
+    return grupos
+
+
+def _mascara_expressao(tabela, nomes, expressao):
+    ok = np.zeros(tabela.shape[0], dtype=bool)
+    for grupo in interpretar(expressao, nomes):
+        parcial = np.ones(tabela.shape[0], dtype=bool)
+        for nome, op, valor in grupo: parcial &= _COMPARACOES[op](tabela[:, nomes.index(nome)], valor)
+        ok |= parcial
+    return ok
+
+
+def como_dict(tabela, nomes):
+    return {nome: tabela[:, i] for i, nome in enumerate(nomes)}
+
+
+def mascara(tabela, nomes, filtros):
+    """Linhas de `tabela` que passam nos filtros (dict de faixas ou expressão, ver `interpretar`)."""
+    if not filtros: return np.ones(tabela.shape[0], dtype=bool)
+    if isinstance(filtros, str): return _mascara_expressao(tabela, nomes, filtros)
+    ok = np.ones(tabela.shape[0], dtype=bool)
+    for nome, limites in filtros.items():
+        if nome not in nomes: raise KeyError(f"Característica desconhecida: {nome}")
+        col = tabela[:, nomes.index(nome)]
+        lo, hi = (None, limites) if not isinstance(limites, (tuple, list)) else tuple(limites)
+        if lo is not None: ok &= col >= lo
+        if hi is not None: ok &= col <= hi
+    return ok
+
+
+class Caracteristicas:
+    def __init__(self, freq, tamanho_jogo=None, faixa=FAIXA):
+        """Tabela de todo o histórico de `freq` (Frequencias) numa passada só, uma linha por sorteio."""
+        self.freq = freq
+        self.max_dezenas = freq.max_dezenas
+        self.tamanho_jogo = tamanho_jogo
+        self.faixa = faixa
+        self.nomes = colunas(self.max_dezenas, faixa)
+        linhas = por_sorteio(freq.linhas(), tamanho_jogo)
+        # Sorteios por linha da matriz (Dupla Sena: 2)
+        self.por_concurso = por_sorteio(np.zeros((1, freq.linhas().shape[1]), dtype=np.uint8), tamanho_jogo).shape[0]
+        mascaras = para_mascaras(linhas)
+        # Repetidas: cada sorteio contra o anterior cronológico (o primeiro não tem anterior)
+        anteriores = np.vstack([np.zeros((1, mascaras.shape[1]), dtype=np.uint64), mascaras[:-1]])
+        self._buf = calcular(linhas, self.max_dezenas, anteriores, faixa)
+        self._n = self._buf.shape[0]
+        self._ultima_mascara = mascaras[-1] if len(mascaras) else None
+
+    def __len__(self):
+        return self._n
+
+    def tabela(self, ultimos=None):
+        """
+        (n × colunas) int16, linha 0 = sorteio mais recente (mesma ordem da matriz do motor);
+        `ultimos` conta concursos (Dupla Sena: 2 linhas por concurso, o 2º sorteio primeiro).
+        """
+        crono = self._buf[:self._n]
+        if ultimos is not None: crono = crono[max(0, self._n - ultimos * self.por_concurso):]
+        return crono[::-1]
+
+    def filtrar(self, filtros, ultimos=None):
+        """Máscara (linha 0 = mais recente) dos sorteios que passam nos filtros."""
+        return mascara(self.tabela(ultimos), self.nomes, filtros)
+
+    def de_jogos(self, jogos):
+        """As mesmas colunas para um lote de palpites; repetidas = contra o último sorteio."""
+        return calcular(jogos, self.max_dezenas, self._ultima_mascara, self.faixa)
+
+    def filtrar_jogos(self, jogos, filtros):
+        return mascara(self.de_jogos(jogos), self.nomes, filtros)
+
+    def adicionar(self, linha):
+        """Chamado depois de `freq.adicionar(linha)`: O(bolas), um sorteio da linha por vez."""
+        for sorteio in por_sorteio(np.asarray(linha, dtype=np.uint8)[None, :], self.tamanho_jogo):
+            nova = calcular(sorteio, self.max_dezenas, self._ultima_mascara, self.faixa)[0]
+            if self._ultima_mascara is None: nova[8] = 0
+            self._buf = _anexar(self._buf, self._n, nova)
+            self._n += 1
+            self._ultima_mascara = para_mascaras(sorteio)[0]
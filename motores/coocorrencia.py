@@ -0,0 +1,198 @@
+"""
+Co-ocorrência de dezenas: pares (matriz dezena × dezena) e trincas mais comuns.
+
+- pares: Xᵀ·X, com X a matriz one-hot (sorteios × dezenas), em blocos de
+  linhas para não materializar X inteira; a diagonal é a frequência simples
+- janelas (`ultimos`) e decaimento (`meia_vida`) como em Frequencias, e cada
+  matriz já calculada é atualizada em O(bolas²) quando entra um sorteio
+- trincas: cada sorteio vira C(bolas, 3) códigos a·M² + b·M + c contados num
+  bincount (denso se o espaço de códigos couber em LIMITE_DENSO, senão por
+  np.unique); só os pares código/contagem não nulos ficam guardados
+- com mais de um sorteio por linha (Dupla Sena: largura = 2 × tamanho_jogo),
+  cada sorteio conta separado, como em MotorBase._jogos_do_sorteio: nada de
+  par ou trinca com uma dezena de cada sorteio
+"""
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from .matriz import por_sorteio
+
+BLOCO_LINHAS = 65536          # linhas one-hot por produto de matrizes
+MAX_CODIGOS_BLOCO = 4_000_000  # códigos de trinca gerados por vez
+LIMITE_DENSO = 1 << 21         # até aqui as trincas são contadas num vetor denso
+
+
+def _top_k(valores, k):
+    """Índices dos k maiores valores; empates resolvidos pelo menor índice (resultado determinístico)."""
+    k = min(k, valores.size)
+    if k <= 0: return np.zeros(0, dtype=np.int64)
+    corte = np.partition(valores, valores.size - k)[valores.size - k]
+    acima = np.flatnonzero(valores > corte)
+    sel = np.concatenate([acima, np.flatnonzero(valores == corte)[:k - acima.size]])
+    return sel[np.lexsort((sel, -valores[sel]))]
+
+
+class Coocorrencias:
+    def __init__(self, freq, tamanho_jogo=None):
+        """Lê os sorteios do contador de frequências (`freq.linhas`), sem copiar o histórico."""
+        self.freq = freq
+        self.max_dezenas = freq.max_dezenas
+        self.tamanho_jogo = tamanho_jogo
+        self._pares = {}    # ultimos (None = tudo) -> matriz int64
+        self._decaidas = {}  # meia_vida -> (fator, matriz float)
+        self._trincas = {}  # ultimos -> (códigos ordenados, contagens)
+
+    def _sorteios(self, linhas):
+        """Uma linha por sorteio (matriz.por_sorteio)."""
+        return por_sorteio(linhas, self.tamanho_jogo)
+
+    def _por_linha(self):
+        """Sorteios por linha do histórico (Dupla Sena: 2)."""
+        return max(1, self._sorteios(self.freq.linhas()[:1]).shape[0]) if len(self.freq) else 1
+
+    # --- PARES ---
+
+    def _produto(self, linhas, pesos=None):
+        """Xᵀ·diag(pesos)·X por blocos de sorteios; sem pesos, contagem inteira."""
+        m = self.max_dezenas
+        sorteios = self._sorteios(linhas)
+        if pesos is not None and sorteios.shape[0] > linhas.shape[0]: pesos = np.repeat(pesos, sorteios.shape[0] // linhas.shape[0])
+        linhas = sorteios
+        c = np.zeros((m, m), dtype=np.int64 if pesos is None else float)
+        for ini in range(0, linhas.shape[0], BLOCO_LINHAS):
+            bloco = linhas[ini:ini + BLOCO_LINHAS]
+            x = np.zeros((bloco.shape[0], m + 1), dtype=np.float32 if pesos is None else float)
+            x[np.arange(bloco.shape[0])[:, None], bloco] = 1.0
+            x = x[:, 1:]  # coluna 0 = vazio
+            if pesos is None:
+                # float32 é exato aqui: cada entrada do bloco fica <= BLOCO_LINHAS < 2**24
+                c += (x.T @ x).astype(np.int64)
+            else:
+                c += (x * pesos[ini:ini + BLOCO_LINHAS, None]).T @ x
+        return c
+
+    def pares(self, ultimos=None, meia_vida=None):
+        """Matriz (M × M): quantas vezes i e j saíram juntas (diagonal = frequência)."""
+        if meia_vida:
+            if meia_vida not in self._decaidas:
+                fator = 0.5 ** (1.0 / meia_vida)
+                pesos = fator ** np.arange(len(self.freq) - 1, -1, -1, dtype=float)
+                self._decaidas[meia_vida] = (fator, self._produto(self.freq.linhas(), pesos))
+            return self._decaidas[meia_vida][1].copy()
+        if ultimos is not None and ultimos >= len(self.freq): ultimos = None
+        if ultimos not in self._pares:
+            self._pares[ultimos] = self._produto(self.freq.linhas(ultimos))
+        return self._pares[ultimos].copy()
+
+    def afinidade(self, ultimos=None, meia_vida=None):
+        """
+        Lift de cada par: P(i e j) / (P(i)·P(j)). 1 = independentes, > 1 saem
+        juntas mais que o acaso. Diagonal zerada.
+        """
+        c = self.pares(ultimos=ultimos, meia_vida=meia_vida).astype(float)
+        if meia_vida: n = (1 - (0.5 ** (1.0 / meia_vida)) ** len(self.freq)) / (1 - 0.5 ** (1.0 / meia_vida))
+        else: n = min(len(self.freq), ultimos or len(self.freq))
+        n *= self._por_linha()  # probabilidades por sorteio, não por concurso
+        f = np.diag(c).copy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lift = np.where(np.outer(f, f) > 0, c * n / np.outer(f, f), 0.0)
+        np.fill_diagonal(lift, 0.0)
+        return lift
+
+    def top_pares(self, k=10, ultimos=None):
+        """[((i, j), contagem), ...] dos k pares mais frequentes."""
+        c = self.pares(ultimos=ultimos)
+        i, j = np.triu_indices(self.max_dezenas, 1)
+        v = c[i, j]
+        return [((int(i[s]) + 1, int(j[s]) + 1), int(v[s])) for s in _top_k(v, k)]
+
+    # --- TRINCAS ---
+
+    def _codigos(self, linhas):
+        """Códigos das trincas de cada sorteio (vazios descartados; linhas com vários sorteios, um por vez)."""
+        linhas = self._sorteios(linhas)
+        pos = np.array(list(combinations(range(linhas.shape[1]), 3)), dtype=np.intp).reshape(-1, 3)
+        if pos.size == 0: return np.zeros(0, dtype=np.int64)
+        m1 = self.max_dezenas + 1
+        # int32 basta (M ≤ 255 → M³ < 2**24); os pesos de cada posição saem antes do gather
+        ordenadas = np.sort(linhas, axis=1).astype(np.int32)
+        cod = ordenadas[:, pos[:, 0]] * (m1 * m1)
+        cod += ordenadas[:, pos[:, 1]] * m1
+        cod += ordenadas[:, pos[:, 2]]
+        if ordenadas.size and ordenadas[:, 0].min() == 0:
+            cod = cod[ordenadas[:, pos[:, 0]] > 0]  # linhas ordenadas: se a > 0, b e c também
+        return cod.ravel()
+
+    def _contar_trincas(self, linhas):
+        m1 = self.max_dezenas + 1
+        if linhas.shape[0] == 0: return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        sorteios = self._sorteios(linhas[:1])
+        if sorteios.shape[1] < 3: return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        por_linha = sorteios.shape[0] * comb(sorteios.shape[1], 3)
+        passo = max(1, MAX_CODIGOS_BLOCO // por_linha)
+        denso = m1 ** 3 <= LIMITE_DENSO
+        acc = np.zeros(m1 ** 3, dtype=np.int64) if denso else None
+        partes = []
+        for ini in range(0, linhas.shape[0], passo):
+            cod = self._codigos(linhas[ini:ini + passo])
+            if denso: acc += np.bincount(cod, minlength=m1 ** 3)
+            else: partes.append(np.unique(cod, return_counts=True))
+        if denso:
+            codigos = np.flatnonzero(acc)
+            return codigos, acc[codigos]
+        codigos = np.concatenate([p[0] for p in partes])
+        contagens = np.concatenate([p[1] for p in partes])
+        ordem = np.argsort(codigos, kind='stable')
+        codigos, contagens = codigos[ordem], contagens[ordem]
+        inicio = np.flatnonzero(np.r_[True, codigos[1:] != codigos[:-1]])
+        return codigos[inicio], np.add.reduceat(contagens, inicio)
+
+    def trincas(self, k=10, ultimos=None):
+        """[((a, b, c), contagem), ...] das k trincas mais frequentes."""
+        if ultimos is not None and ultimos >= len(self.freq): ultimos = None
+        if ultimos not in self._trincas:
+            self._trincas[ultimos] = self._contar_trincas(self.freq.linhas(ultimos))
+        codigos, contagens = self._trincas[ultimos]
+        sel = _top_k(contagens, k)  # códigos ordenados: empate sai na ordem (a, b, c)
+        m1 = self.max_dezenas + 1
+        return [((int(c // (m1 * m1)), int(c // m1 % m1), int(c % m1)), int(n))
+                for c, n in zip(codigos[sel], contagens[sel])]
+
+    # --- ATUALIZAÇÃO ---
+
+    def _dezenas_por_sorteio(self, linha):
+        """Índices (dezena - 1) de cada sorteio da linha, sem vazios nem repetidas dentro do sorteio."""
+        sorteios = self._sorteios(np.asarray(linha, dtype=np.int64)[None, :])
+        return [np.unique(d[(d >= 1) & (d <= self.max_dezenas)]) - 1 for d in sorteios]
+
+    def adicionar(self, linha):
+        """
+        Chamado depois de `freq.adicionar(linha)`: soma o sorteio novo e, nas
+        janelas, tira o que saiu delas. Trincas de janelas são recontadas sob demanda.
+        """
+        n = len(self.freq)
+        entrou = self._dezenas_por_sorteio(linha)
+        for ultimos, c in self._pares.items():
+            for novo in entrou: c[np.ix_(novo, novo)] += 1
+            if ultimos is not None and n > ultimos:
+                for saiu in self._dezenas_por_sorteio(self.freq.linhas()[n - 1 - ultimos]):
+                    c[np.ix_(saiu, saiu)] -= 1
+        for mv, (fator, c) in self._decaidas.items():
+            c *= fator
+            for novo in entrou: c[np.ix_(novo, novo)] += 1.0
+        self._trincas = {u: t for u, t in self._trincas.items() if u is None}
+        if None in self._trincas:
+            codigos, contagens = self._trincas[None]
+            cod = self._codigos(np.asarray(linha, dtype=np.int64)[None, :])
+            pos = np.searchsorted(codigos, cod)
+            existe = np.zeros(cod.size, dtype=bool)
+            dentro = pos < codigos.size
+            existe[dentro] = codigos[pos[dentro]] == cod[dentro]
+            contagens = contagens.copy()
+            contagens[pos[existe]] += 1
+            novos = cod[~existe]
+            codigos = np.insert(codigos, pos[~existe], novos)
+            contagens = np.insert(contagens, pos[~existe], np.ones(novos.size, dtype=np.int64))
+            self._trincas[None] = (codigos, contagens)
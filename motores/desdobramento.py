@@ -0,0 +1,264 @@
+"""
+Desdobramento (wheel): poucos jogos que garantem um prêmio mínimo.
+
+Dado um grupo de v dezenas escolhidas, busca um conjunto pequeno de jogos de
+k dezenas (tamanho_jogo) tal que, se m das dezenas sorteadas caírem dentro do
+grupo, algum jogo acerta pelo menos t. É um problema de cobertura (set cover):
+
+- alvos: todos os m-subconjuntos do grupo; candidatos: todos os k-subconjuntos
+- cada subconjunto é identificado pelo rank combinatório (motores/ranking.py),
+  então nada de matriz de cobertura: os vizinhos de um conjunto (os que
+  cruzam com ele em >= t elementos) são enumerados e ranqueados sob demanda
+- guloso com contabilidade incremental: `ganho[c]` = alvos ainda descobertos
+  que o candidato c cobre; cada alvo coberto desconta 1 de todos os seus vizinhos.
+  Como os ganhos só descem, os empatados no máximo ficam guardados entre as
+  escolhas e a varredura completa só acontece quando esse nível se esgota
+- rank de bitsets por tabela (v ≤ 22) ou por blocos de 16 bits (combinadic
+  pré-somado por bloco), sempre vetorizado
+- custo estimado (C(v, m) × vizinhança) limitado por MAX_TRABALHO: pedidos
+  maiores são recusados com a explicação, em vez de prender a sessão
+- busca local no fim: remove jogos redundantes (todos os alvos deles já cobertos
+  por outro)
+
+Várias tentativas com desempate aleatório rodam num pool de processos (cada
+uma com SeedSequence(seed, spawn_key=(i,))) e fica a menor. A saída é gerada
+em blocos, com a memória limitada a O(C(v, k) + C(v, m)) inteiros.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from .matriz import popcount
+from .ranking import _binomiais, desranquear
+
+MAX_SUBCONJUNTOS = 2_000_000  # teto para C(v, k) e C(v, m): acima disso não é interativo
+# Teto de vizinhos ranqueados por rodada do guloso (cada alvo coberto desconta a vizinhança dele):
+# ~10 s numa máquina comum; acima disso o pedido é recusado em vez de prender a sessão
+MAX_TRABALHO = 250_000_000
+MAX_VIZINHOS_LOTE = 4_000_000  # linhas geradas por vez ao enumerar vizinhanças
+BLOCO_SAIDA = 500
+LIMITE_TABELA_BITS = 22  # até 2**22 máscaras, o rank sai de uma tabela (int32, 16 MB)
+BITS_BLOCO = 16  # acima disso, uma tabela por bloco de 16 bits do bitset
+MAX_GRUPO = 63  # bitsets em uint64
+
+
+def _posicoes(n, r):
+    pos = list(combinations(range(n), r))
+    return np.array(pos, dtype=np.intp).reshape(len(pos), r)
+
+
+def tamanho_vizinhanca(v, s, r, t):
+    """Quantos r-subconjuntos de v cruzam um s-subconjunto fixo em pelo menos t elementos."""
+    return sum(comb(s, j) * comb(v - s, r - j) for j in range(t, min(s, r) + 1))
+
+
+@lru_cache(maxsize=8)
+def _tabela_rank(v, r):
+    """rank de cada máscara de v bits com r bits ligados (as demais posições ficam -1)."""
+    tab = np.full(1 << v, -1, dtype=np.int32)
+    tab[_mascaras(desranquear(np.arange(comb(v, r)), v, r))] = np.arange(comb(v, r), dtype=np.int32)
+    tab.setflags(write=False)
+    return tab
+
+
+@lru_cache(maxsize=8)
+def _tabela_blocos(v, r):
+    """
+    Combinadic por bloco de BITS_BLOCO bits: T[p, i · 2^16 + b] = quanto o bloco b,
+    na posição p do bitset, soma ao rank quando i bits já vieram dos blocos de baixo.
+    Também devolve o popcount de cada bloco.
+    """
+    nb, w = -(-v // BITS_BLOCO), 1 << BITS_BLOCO
+    t = _binomiais(BITS_BLOCO * nb, r)
+    b = np.arange(w)
+    bits = np.zeros(w, dtype=np.intp)
+    for j in range(BITS_BLOCO): bits += (b >> j) & 1
+    tab = np.zeros((nb, r + 1, w), dtype=np.int64)
+    for p in range(nb):
+        for i in range(r + 1):
+            cont = np.full(w, i)
+            for j in range(BITS_BLOCO):
+                ligado = (b >> j) & 1
+                cont += ligado
+                tab[p, i] += np.where(ligado, t[BITS_BLOCO * p + j, np.minimum(cont, r)], 0)
+    tab = tab.reshape(nb, -1)
+    tab.setflags(write=False)
+    bits.setflags(write=False)
+    return tab, bits
+
+
+def _mascaras(conjuntos):
+    """(n × s) elementos 1..v -> bitset uint64 de cada linha."""
+    c = np.asarray(conjuntos, dtype=np.uint64)
+    return np.bitwise_or.reduce(np.left_shift(np.uint64(1), c - np.uint64(1)), axis=1)
+
+
+def rank_mascaras(mascaras, v, r):
+    """Bitsets (r bits ligados, v ≤ 63) -> rank combinatório, igual a ranking.ranquear."""
+    mascaras = np.asarray(mascaras, dtype=np.uint64)
+    if v <= LIMITE_TABELA_BITS: return _tabela_rank(v, r)[mascaras.astype(np.intp)].astype(np.int64)
+    # Sem tabela de máscaras: o i-ésimo bit ligado (de baixo para cima), no bit b, soma C(b, i);
+    # _tabela_blocos já tem essa soma por bloco de 16 bits: ceil(v/16) consultas por máscara
+    tab, bits = _tabela_blocos(v, r)
+    w = np.uint64((1 << BITS_BLOCO) - 1)
+    rank = np.zeros(mascaras.shape, dtype=np.int64)
+    i = np.zeros(mascaras.shape, dtype=np.intp)
+    for p in range(tab.shape[0]):
+        bloco = ((mascaras >> np.uint64(BITS_BLOCO * p)) & w).astype(np.intp)
+        rank += tab[p].take(np.minimum(i, r) << BITS_BLOCO | bloco)
+        if p + 1 < tab.shape[0]: i += bits.take(bloco)
+    return rank
+
+
+def vizinhos(conjuntos, v, r, t):
+    """
+    Para cada linha de `conjuntos` (s elementos de 1..v, ordenados), os ranks
+    dos r-subconjuntos de 1..v que têm >= t elementos em comum com ela.
+    Retorna (n × tamanho_vizinhanca).
+
+    Cada vizinho é "j elementos de dentro | r - j de fora": as duas metades
+    viram bitsets separados e o vizinho é um OR, sem ordenar nada.
+    """
+    conjuntos = np.asarray(conjuntos, dtype=np.int64)
+    n, s = conjuntos.shape
+    universo = np.arange(1, v + 1)
+    # Complemento de cada linha (v - s elementos, ordenados)
+    dentro = np.zeros((n, v + 1), dtype=bool)
+    dentro[np.arange(n)[:, None], conjuntos] = True
+    fora = np.broadcast_to(universo, (n, v))[~dentro[:, 1:]].reshape(n, v - s)
+    bits_dentro = np.left_shift(np.uint64(1), (conjuntos - 1).astype(np.uint64))
+    bits_fora = np.left_shift(np.uint64(1), (fora - 1).astype(np.uint64))
+    partes = []
+    for j in range(t, min(s, r) + 1):
+        if r - j > v - s: continue
+        a = bits_dentro[:, _posicoes(s, j)].sum(axis=2, dtype=np.uint64)   # (n, |P|)
+        b = bits_fora[:, _posicoes(v - s, r - j)].sum(axis=2, dtype=np.uint64)  # (n, |Q|)
+        partes.append((a[:, :, None] | b[:, None, :]).reshape(n, -1))
+    if not partes: return np.zeros((n, 0), dtype=np.int64)
+    return rank_mascaras(np.concatenate(partes, axis=1), v, r)
+
+
+def _vizinhos_em_lotes(ranks, v, s, r, t):
+    """vizinhos() para uma lista de ranks, em lotes para não estourar a memória; devolve tudo achatado."""
+    por_linha = max(1, tamanho_vizinhanca(v, s, r, t))
+    passo = max(1, MAX_VIZINHOS_LOTE // por_linha)
+    saida = []
+    for i in range(0, len(ranks), passo):
+        saida.append(vizinhos(desranquear(ranks[i:i + passo], v, s), v, r, t).ravel())
+    return np.concatenate(saida) if saida else np.zeros(0, dtype=np.int64)
+
+
+def trabalho(v, k, m, t):
+    """Estimativa do custo de uma rodada: C(v, m) alvos × candidatos que cobrem cada um."""
+    return comb(v, m) * tamanho_vizinhanca(v, m, k, t)
+
+
+def validar(v, k, m, t):
+    if v > MAX_GRUPO: raise ValueError(f"Grupo de {v} dezenas: o limite é {MAX_GRUPO}.")
+    if not (1 <= t <= min(k, m)): raise ValueError(f"Garantia t={t} deve estar entre 1 e min(k, m)={min(k, m)}.")
+    if k > v or m > v: raise ValueError(f"Grupo de {v} dezenas é menor que o jogo ({k}) ou que as sorteadas ({m}).")
+    for nome, r in (("jogos candidatos", k), ("combinações sorteadas", m)):
+        if comb(v, r) > MAX_SUBCONJUNTOS:
+            raise ValueError(f"C({v}, {r}) = {comb(v, r)} {nome}: grande demais (limite {MAX_SUBCONJUNTOS}).")
+    custo = trabalho(v, k, m, t)
+    if custo > MAX_TRABALHO:
+        raise ValueError(f"Desdobramento de {v} dezenas pesado demais: cada uma das {comb(v, m):,} combinações "
+                         f"sorteadas é coberta por {tamanho_vizinhanca(v, m, k, t):,} jogos (~{custo:,} passos, "
+                         f"limite {MAX_TRABALHO:,}). Use um grupo menor.")
+
+
+def cobertura_gulosa(v, k, m, t, seed=None):
+    """
+    Uma rodada do guloso + enxugamento, em índices 1..v.
+    Retorna os ranks (k-subconjuntos de 1..v) dos jogos escolhidos.
+    """
+    validar(v, k, m, t)
+    rng = np.random.default_rng(seed)
+    n_cand, n_alvos = comb(v, k), comb(v, m)
+    ganho = np.full(n_cand, tamanho_vizinhanca(v, k, m, t), dtype=np.int64)
+    coberto = np.zeros(n_alvos, dtype=bool)
+    restantes = n_alvos
+    escolhidos = []
+    # Ganhos só descem: os empatados no máximo atual ficam guardados e só são filtrados
+    # a cada escolha; a varredura de todos os C(v, k) candidatos só volta quando o nível esvazia
+    melhor, empatados = None, np.zeros(0, dtype=np.intp)
+    while restantes:
+        empatados = empatados[ganho[empatados] == melhor]
+        if empatados.size == 0:
+            melhor = ganho.max()
+            empatados = np.flatnonzero(ganho == melhor)
+        c = int(empatados[rng.integers(empatados.size)])
+        escolhidos.append(c)
+        alvos = vizinhos(desranquear([c], v, k), v, m, t)[0]
+        novos = alvos[~coberto[alvos]]
+        coberto[novos] = True
+        restantes -= novos.size
+        # Cada alvo recém-coberto deixa de contar para todos os candidatos que o cobrem
+        if novos.size:
+            afetados = _vizinhos_em_lotes(novos, v, m, k, t)
+            ganho -= np.bincount(afetados, minlength=n_cand)
+    return enxugar(np.array(escolhidos, dtype=np.int64), v, k, m, t, rng)
+
+
+def enxugar(escolhidos, v, k, m, t, rng=None):
+    """Busca local: tira jogos cujos alvos já estão todos cobertos por outros jogos."""
+    if escolhidos.size <= 1: return escolhidos
+    rng = rng or np.random.default_rng(0)
+    viz = vizinhos(desranquear(escolhidos, v, k), v, m, t)
+    contagem = np.bincount(viz.ravel(), minlength=comb(v, m))
+    manter = np.ones(escolhidos.size, dtype=bool)
+    for i in rng.permutation(escolhidos.size):
+        if contagem[viz[i]].min() >= 2:
+            manter[i] = False
+            contagem[viz[i]] -= 1
+    return escolhidos[manter]
+
+
+def _tentativa(v, k, m, t, seed, i):
+    return cobertura_gulosa(v, k, m, t, np.random.SeedSequence(seed, spawn_key=(i,)))
+
+
+def melhor_cobertura(v, k, m, t, tentativas=4, seed=0, workers=None):
+    """
+    Menor cobertura entre `tentativas` rodadas (em paralelo quando tentativas > 1).
+    workers=1 roda tudo no processo atual, como no app (servidor com threads não faz fork).
+    As rodadas em sequência somam no máximo MAX_TRABALHO: sobra de tentativas é cortada.
+    """
+    validar(v, k, m, t)
+    workers = min(tentativas, workers or os.cpu_count() or 1)
+    tentativas = max(1, min(tentativas, workers * (MAX_TRABALHO // trabalho(v, k, m, t))))
+    if tentativas <= 1 or workers <= 1:
+        resultados = [_tentativa(v, k, m, t, seed, i) for i in range(tentativas)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            resultados = list(pool.map(_tentativa, *zip(*[(v, k, m, t, seed, i) for i in range(tentativas)])))
+    return min(resultados, key=len)
+
+
+def desdobrar(dezenas, k, m, t, tentativas=4, seed=0, workers=None, bloco=BLOCO_SAIDA):
+    """
+    Gera o desdobramento em blocos (arrays (≤ bloco × k) uint8 com as dezenas reais).
+    dezenas: o grupo escolhido; k: dezenas por jogo; m: quantas sorteadas caem no
+    grupo; t: acertos garantidos em pelo menos um jogo.
+    """
+    grupo = np.unique(np.asarray(dezenas, dtype=np.int64))
+    escolhidos = np.sort(melhor_cobertura(grupo.size, k, m, t, tentativas, seed, workers))
+    for i in range(0, escolhidos.size, bloco):
+        idx = desranquear(escolhidos[i:i + bloco], grupo.size, k).astype(np.int64) - 1
+        yield grupo[idx].astype(np.uint8)
+
+
+def garantia_ok(jogos, dezenas, m, t):
+    """Confere a garantia por força bruta sobre todos os m-subconjuntos do grupo (validação)."""
+    grupo = np.unique(np.asarray(dezenas, dtype=np.int64))
+    jogos = np.searchsorted(grupo, np.asarray(jogos, dtype=np.int64)) + 1  # dezena -> posição 1..v
+    bits = _mascaras(jogos)
+    alvos = _mascaras(desranquear(np.arange(comb(grupo.size, m)), grupo.size, m))
+    for ini in range(0, alvos.size, 4096):
+        inter = np.bitwise_and(alvos[ini:ini + 4096, None], bits[None, :])
+        if not (popcount(inter[..., None]).max(axis=1) >= t).all(): return False
+    return True
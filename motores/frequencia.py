@@ -0,0 +1,134 @@
+"""
+Contador de frequências incremental sobre a matriz de sorteios.
+
+- total: contagem de todo o histórico, atualizada em O(bolas) por sorteio novo
+- prefixo: contagens acumuladas em ordem cronológica; qualquer faixa de
+  concursos sai de uma subtração (prefixo[fim] - prefixo[ini])
+- decaimento: pesos exponenciais por meia-vida (em concursos), também incrementais
+"""
+import math
+
+import numpy as np
+
+# Teto de memória da tabela de prefixos; acima disso guarda um ponto a cada `passo` sorteios
+MAX_BYTES_PREFIXO = 32 * 1024 * 1024
+
+
+def _anexar(buf, n, linha):
+    """Escreve `linha` na posição n, dobrando a capacidade do buffer quando necessário."""
+    if n >= buf.shape[0]:
+        novo = np.zeros((max(16, 2 * buf.shape[0]),) + buf.shape[1:], dtype=buf.dtype)
+        novo[:n] = buf[:n]
+        buf = novo
+    buf[n] = linha
+    return buf
+
+
+class Frequencias:
+    def __init__(self, matriz, max_dezenas):
+        """`matriz` no formato do motor (linha 0 = mais recente, 0 = vazio)."""
+        self.max_dezenas = max_dezenas
+        # Guardamos em ordem cronológica (mais antigo primeiro) para poder só acrescentar no fim.
+        # Buffers com capacidade extra: append amortizado O(1) em vez de copiar tudo a cada sorteio.
+        self._buf = np.ascontiguousarray(np.asarray(matriz, dtype=np.uint8)[::-1])
+        self._n = self._buf.shape[0]
+        self.total = self._contar(self._crono)
+        self._pref_buf = None
+        self._n_pref = 0
+        self._passo = 1
+        self._decaidas = {}
+
+    @property
+    def _crono(self):
+        return self._buf[:self._n]
+
+    @property
+    def _prefixo(self):
+        return None if self._pref_buf is None else self._pref_buf[:self._n_pref]
+
+    def __len__(self):
+        return self._n
+
+    def linhas(self, ultimos=None):
+        """Sorteios em ordem cronológica (view, mais antigo primeiro); `ultimos`: só os N mais recentes."""
+        if ultimos is None or ultimos >= self._n: return self._crono
+        return self._crono[self._n - ultimos:]
+
+    def _contar(self, linhas):
+        return np.bincount(linhas.ravel(), minlength=self.max_dezenas + 1)[1:self.max_dezenas + 1].astype(np.int64)
+
+    # --- PREFIXOS (construídos sob demanda) ---
+
+    def _construir_prefixo(self):
+        n, m = self._n, self.max_dezenas
+        self._passo = p = max(1, math.ceil((n + 1) * m * 4 / MAX_BYTES_PREFIXO))
+        # Contagem por bloco de `passo` sorteios num único bincount: índice = bloco * (m+1) + dezena
+        blocos = n // p
+        corpo = self._crono[:blocos * p]
+        ids = np.repeat(np.arange(blocos, dtype=np.int64), p * corpo.shape[1]) * (m + 1) + corpo.ravel()
+        por_bloco = np.bincount(ids, minlength=blocos * (m + 1)).reshape(blocos, m + 1)[:, 1:]
+        self._pref_buf = np.zeros((blocos + 1, m), dtype=np.uint32)
+        np.cumsum(por_bloco, axis=0, out=self._pref_buf[1:], dtype=np.uint32)
+        self._n_pref = blocos + 1
+
+    def _ate(self, i):
+        """Contagem acumulada dos sorteios cronológicos [0, i)."""
+        if self._prefixo is None: self._construir_prefixo()
+        k = i // self._passo
+        base = self._prefixo[k].astype(np.int64)
+        resto = i - k * self._passo
+        if resto: base = base + self._contar(self._crono[k * self._passo:i])
+        return base
+
+    def intervalo(self, ini, fim):
+        """Contagem dos sorteios cronológicos [ini, fim) — índice 0 é o mais antigo."""
+        ini, fim = max(0, ini), min(self._n, fim)
+        if fim <= ini: return np.zeros(self.max_dezenas, dtype=np.int64)
+        return self._ate(fim) - self._ate(ini)
+
+    def contagem(self, ultimos=None):
+        """Contagem de todo o histórico ou só dos `ultimos` N sorteios."""
+        if ultimos is None or ultimos >= self._n: return self.total.copy()
+        return self.intervalo(self._n - ultimos, self._n)
+
+    # --- DECAIMENTO EXPONENCIAL ---
+
+    def ponderada(self, meia_vida):
+        """Soma dos sorteios com peso 0.5 ** (idade / meia_vida); o mais recente pesa 1."""
+        if meia_vida not in self._decaidas:
+            fator = 0.5 ** (1.0 / meia_vida)
+            pesos = fator ** np.arange(self._n - 1, -1, -1, dtype=float)
+            acc = np.bincount(self._crono.ravel(), weights=np.repeat(pesos, self._crono.shape[1]),
+                              minlength=self.max_dezenas + 1)
+            self._decaidas[meia_vida] = (fator, acc[1:self.max_dezenas + 1])
+        return self._decaidas[meia_vida][1].copy()
+
+    # --- ATUALIZAÇÃO ---
+
+    def adicionar(self, dezenas):
+        """Registra um sorteio novo em O(bolas) (mais o custo amortizado do append)."""
+        linha = np.zeros(self._crono.shape[1], dtype=np.uint8)
+        d = np.asarray(dezenas, dtype=np.int64)[:linha.size]
+        linha[:d.size] = np.where((d >= 1) & (d <= self.max_dezenas), d, 0)
+        self._buf = _anexar(self._buf, self._n, linha)
+        self._n += 1
+        # Mesma regra de _contar: dezena repetida na linha (ex.: nos dois sorteios da Dupla Sena) conta duas vezes
+        contagem = self._contar(linha[None, :])
+        self.total += contagem
+        if self._pref_buf is not None and self._n % self._passo == 0:
+            novo = self._prefixo[-1].astype(np.int64) + self._contar(self._crono[self._n - self._passo:])
+            self._pref_buf = _anexar(self._pref_buf, self._n_pref, novo.astype(np.uint32))
+            self._n_pref += 1
+        for mv, (fator, acc) in self._decaidas.items():
+            self._decaidas[mv] = (fator, acc * fator + contagem)
+
+    # --- QUENTES / FRIOS ---
+
+    def quentes_frios(self, ultimos=None, meia_vida=None, corte=None):
+        """Ranking a partir dos contadores, sem reler o histórico."""
+        c = self.ponderada(meia_vida) if meia_vida else self.contagem(ultimos)
+        corte = corte or self.max_dezenas // 3
+        return {
+            "quentes": (np.argsort(-c, kind='stable')[:corte] + 1).tolist(),
+            "frios": (np.argsort(c, kind='stable')[:corte] + 1).tolist(),
+        }
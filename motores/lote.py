@@ -0,0 +1,80 @@
+"""
+Geração vetorizada de lotes de palpites.
+
+Cada linha recebe uma chave aleatória por dezena do pool; as `k` menores
+chaves (argpartition) formam o jogo. Isso equivale a sortear k sem reposição,
+mas para n jogos de uma vez.
+"""
+from math import comb
+
+import numpy as np
+
+from .matriz import para_mascaras
+
+MAX_RODADAS = 64  # segurança contra loops quando sobram poucas combinações livres
+TAXA_MIN = 0.02  # pede no máximo ~50x o que falta numa rodada (filtros muito restritivos)
+
+
+def rng_de(seed=None, rng=None):
+    """Aceita um Generator pronto, uma semente ou nada (entropia do sistema)."""
+    if rng is not None: return rng
+    return np.random.default_rng(seed)
+
+
+def sortear(pool, k, n, rng):
+    """(n × k) uint8 ordenado: k dezenas distintas do pool em cada linha."""
+    pool = np.asarray(pool, dtype=np.uint8)
+    if n <= 0: return np.zeros((0, k), dtype=np.uint8)
+    chaves = rng.random((n, pool.size))
+    idx = np.argpartition(chaves, k - 1, axis=1)[:, :k] if k < pool.size else np.argsort(chaves, axis=1)
+    return np.sort(pool[idx], axis=1)
+
+
+def chaves_unicas(jogos):
+    """Uma chave por jogo (bitmask empacotada) para comparar linhas inteiras de uma vez."""
+    m = np.ascontiguousarray(para_mascaras(jogos))
+    return m.view(np.dtype((np.void, m.dtype.itemsize * m.shape[1]))).ravel()
+
+
+def remover_repetidos(jogos, ja_vistos=None):
+    """Mantém a primeira ocorrência de cada jogo (e descarta os que já estão em `ja_vistos`)."""
+    chaves = chaves_unicas(jogos)
+    _, primeiros = np.unique(chaves, return_index=True)
+    manter = np.zeros(len(jogos), dtype=bool)
+    manter[primeiros] = True
+    if ja_vistos is not None and len(ja_vistos):
+        manter &= ~np.isin(chaves, ja_vistos)
+    return jogos[manter], chaves[manter]
+
+
+def completar_lote(gerador, n, k, limite=None, rejeitar=None):
+    """
+    Chama `gerador(faltam)` -> (m × k) até juntar n jogos distintos.
+    `limite` é o número de combinações possíveis (para falhar cedo em vez de girar).
+    `rejeitar(jogos)` -> máscara dos jogos a descartar (ex.: já sorteados ou já salvos).
+    """
+    if limite is not None and n > limite:
+        raise ValueError(f"Pedido de {n} jogos distintos, mas só existem {limite} combinações.")
+    lote = np.zeros((0, k), dtype=np.uint8)
+    vistos = np.zeros(0, dtype=chaves_unicas(lote).dtype)
+    taxa = None
+    for _ in range(MAX_RODADAS):
+        faltam = n - len(lote)
+        if faltam <= 0: break
+        # Pede um pouco a mais para compensar repetidos/filtrados (proporcional à taxa de aproveitamento já vista)
+        pedido = faltam + faltam // 8 + 1 if taxa is None else int(faltam * 1.1 / max(taxa, TAXA_MIN)) + 1
+        novos, chaves = remover_repetidos(gerador(pedido), vistos)
+        if rejeitar is not None and len(novos):
+            manter = ~rejeitar(novos)
+            novos, chaves = novos[manter], chaves[manter]
+        taxa = len(novos) / pedido
+        novos, chaves = novos[:faltam], chaves[:faltam]
+        lote = np.vstack([lote, novos])
+        vistos = np.concatenate([vistos, chaves])
+    if len(lote) < n:
+        raise ValueError(f"Só foi possível gerar {len(lote)} de {n} jogos distintos.")
+    return lote
+
+
+def combinacoes(tamanho_pool, k):
+    return comb(int(tamanho_pool), int(k))
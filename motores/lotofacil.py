@@ -1,33 +1,24 @@
 from .base import MotorBase
+from . import lote
 import numpy as np
-import pandas as pd
 
 class MotorLotofacil(MotorBase):
-    def gerar_palpite(self, estrategia):
+    def _sortear_palpite(self, estrategia):
         """
         Gera palpites específicos para Lotofácil baseados em repetição.
         Estratégia comum: Repetir 9 do anterior e pegar 6 ausentes.
         """
         
         # 1. SEGURANÇA: Se a base estiver vazia, usa o gerador aleatório do pai
-        if self.df is None or self.df.empty:
-            return super().gerar_palpite(estrategia)
+        if self.vazio:
+            return super()._sortear_palpite(estrategia)
 
-        # 2. OBTER NÚMEROS DO ÚLTIMO CONCURSO (Com tratamento de erro)
-        try:
-            # Pega a primeira linha e apenas as colunas de dezenas (self.cols)
-            # CORREÇÃO: Usamos self.cols (nome correto) em vez de self.cols_bolas
-            linha_crua = self.df.iloc[0][self.cols]
-            
-            # Converte para números (força limpeza de strings)
-            ultimos_nums = pd.to_numeric(linha_crua, errors='coerce').dropna().astype(int).tolist()
-            
-            # Se por algum motivo a leitura falhar (ex: planilha vazia), fallback
-            if len(ultimos_nums) < 15:
-                return super().gerar_palpite(estrategia)
-                
-        except Exception:
-            return super().gerar_palpite(estrategia)
+        # 2. OBTER NÚMEROS DO ÚLTIMO CONCURSO (já convertidos na matriz)
+        ultimos_nums = self.ultimo_sorteio()
+        
+        # Se por algum motivo a leitura falhar (ex: planilha vazia), fallback
+        if len(ultimos_nums) < 15:
+            return super()._sortear_palpite(estrategia)
 
         # 3. LÓGICA DA LOTOFÁCIL (Padrão de Repetição)
         # A estatística diz que o mais comum é repetir 9 dezenas do concurso anterior.
@@ -35,7 +26,7 @@ class MotorLotofacil(MotorBase):
         qtd_repetir = 9
         
         # Define o universo de bolas (1 a 25)
-        todos_numeros = set(range(1, 26))
+        todos_numeros = set(range(1, self.max_dezenas + 1))
         
         # Define quem saiu (presentes) e quem não saiu (ausentes)
         presentes = set(ultimos_nums)
@@ -54,8 +45,30 @@ class MotorLotofacil(MotorBase):
                 return sorted(jogo)
             except ValueError:
                 # Se não tiver números suficientes (ex: dados ruins), usa o pai
-                return super().gerar_palpite(estrategia)
+                return super()._sortear_palpite(estrategia)
         
         # Estratégia TENDÊNCIA: Foca nos quentes (usa lógica do pai, mas ajustada)
         else:
-            return super().gerar_palpite(estrategia)
+            return super()._sortear_palpite(estrategia)
+
+    def gerar_lote(self, estrategia, n, seed=None, rng=None, consulta=None):
+        """Lote vetorizado do padrão 9 repetidas + 6 ausentes (Tendência usa o pai)"""
+        ultimos_nums = self.ultimo_sorteio()
+        if estrategia not in ("Mestre", "Equilíbrio") or len(ultimos_nums) < 15:
+            return super().gerar_lote(estrategia, n, seed=seed, rng=rng, consulta=consulta)
+
+        rng = lote.rng_de(seed, rng)
+        qtd_repetir = 9
+        size = self.tamanho_jogo
+        presentes = sorted(set(ultimos_nums))
+        ausentes = sorted(set(range(1, self.max_dezenas + 1)) - set(presentes))
+        if len(presentes) < qtd_repetir or len(ausentes) < size - qtd_repetir:
+            return super().gerar_lote(estrategia, n, seed=seed, rng=rng, consulta=consulta)
+
+        def gerador(m):
+            p1 = lote.sortear(presentes, qtd_repetir, m, rng)
+            p2 = lote.sortear(ausentes, size - qtd_repetir, m, rng)
+            return np.sort(np.hstack([p1, p2]), axis=1)
+
+        limite = lote.combinacoes(len(presentes), qtd_repetir) * lote.combinacoes(len(ausentes), size - qtd_repetir)
+        return lote.completar_lote(gerador, n, size, limite=limite, rejeitar=self._rejeitar(consulta))
@@ -0,0 +1,91 @@
+"""
+Representação compacta do histórico usada pelos motores.
+
+- matriz: uint8 (sorteios × bolas), 0 = célula vazia/inválida, linha 0 = mais recente
+- mascaras: uint64 (sorteios × 2), bit (n-1) ligado quando a dezena n saiu (até 128 dezenas)
+"""
+import numpy as np
+import pandas as pd
+
+PALAVRAS = 2  # 2 × 64 bits cobre até a Lotomania (100 dezenas)
+
+# Tabela de bits por byte para numpy sem np.bitwise_count (< 2.0)
+_BITS_POR_BYTE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def colunas_dezenas(colunas):
+    """Colunas D1, D2... ignorando colunas de Data ou Concurso"""
+    return [c for c in colunas if c.startswith('D') and any(ch.isdigit() for ch in c) and 'Data' not in c]
+
+
+def por_sorteio(linhas, tamanho_jogo):
+    """
+    Uma linha por sorteio: com largura múltipla de tamanho_jogo (Dupla Sena: 2
+    sorteios por concurso), cada linha vira largura / tamanho_jogo linhas, na
+    ordem das colunas (o 1º sorteio antes do 2º). Senão, as linhas como estão.
+    """
+    linhas = np.asarray(linhas)
+    k, largura = tamanho_jogo, linhas.shape[1]
+    if not k or largura <= k or largura % k: return linhas
+    return linhas.reshape(-1, k)
+
+
+def parse_matriz(df, cols, max_dezenas):
+    """Converte as colunas de dezenas (strings da planilha) em uint8 uma única vez."""
+    if df is None or df.empty or not cols:
+        return np.zeros((0, len(cols)), dtype=np.uint8)
+    bruto = df[cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    bruto = np.nan_to_num(bruto, nan=0.0)
+    # Fora do universo (ex.: lixo na planilha) vira "vazio"
+    bruto[(bruto < 1) | (bruto > max_dezenas)] = 0
+    return np.ascontiguousarray(bruto, dtype=np.uint8)
+
+
+def parse_jogos_texto(serie, max_dezenas):
+    """
+    Coluna 'Dezenas' salva como str(lista) -> matriz uint8 (n × maior jogo).
+    Aceita "[4, 13, 30]", "[ 4 13 30]" (numpy) e "[np.int64(4), ...]" sem loop Python por linha.
+    """
+    serie = pd.Series(serie, dtype=object).fillna("").astype(str)
+    limpo = serie.str.replace(r"np\.int\d+\(|[\[\](),;]", " ", regex=True)
+    partes = limpo.str.split(expand=True)
+    if partes.empty or partes.shape[1] == 0:
+        return np.zeros((len(serie), 0), dtype=np.uint8)
+    bruto = partes.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    bruto = np.nan_to_num(bruto, nan=0.0)
+    bruto[(bruto < 1) | (bruto > max_dezenas)] = 0
+    return np.ascontiguousarray(bruto, dtype=np.uint8)
+
+
+def parse_concursos(df):
+    if df is None or df.empty or 'Concurso' not in df.columns:
+        return np.zeros(0, dtype=np.int64)
+    return pd.to_numeric(df['Concurso'], errors='coerce').fillna(-1).to_numpy(dtype=np.int64)
+
+
+# Bitmask de cada dezena (índice 0 = célula vazia, sem bits)
+_BIT_DA_DEZENA = np.zeros((PALAVRAS * 64 + 1, PALAVRAS), dtype=np.uint64)
+for _n in range(1, PALAVRAS * 64 + 1):
+    _BIT_DA_DEZENA[_n, (_n - 1) // 64] = np.uint64(1) << np.uint64((_n - 1) % 64)
+
+
+def para_mascaras(matriz):
+    """(n × bolas) uint8 -> (n × 2) uint64 com um bit por dezena."""
+    matriz = np.asarray(matriz)
+    if matriz.ndim == 1: matriz = matriz[None, :]
+    if matriz.shape[1] == 0: return np.zeros((matriz.shape[0], PALAVRAS), dtype=np.uint64)
+    return np.bitwise_or.reduce(_BIT_DA_DEZENA[matriz], axis=1)
+
+
+def popcount(mascaras):
+    """Conta bits ligados somando as palavras da última dimensão."""
+    mascaras = np.ascontiguousarray(mascaras, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(mascaras).sum(axis=-1, dtype=np.int64)
+    bytes_ = mascaras.view(np.uint8).reshape(mascaras.shape[:-1] + (-1,))
+    return _BITS_POR_BYTE[bytes_].sum(axis=-1, dtype=np.int64)
+
+
+def acertos(mascaras_jogos, mascara_resultado):
+    """Quantas dezenas de cada jogo batem com o resultado (AND + popcount)."""
+    return popcount(np.bitwise_and(mascaras_jogos, mascara_resultado))
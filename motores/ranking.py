@@ -0,0 +1,125 @@
+"""
+Índice combinatório (combinadic) de jogos.
+
+Um jogo ordenado c1 < c2 < ... < ck (dezenas 1..N) vira um único inteiro
+
+    rank = C(c1 - 1, 1) + C(c2 - 1, 2) + ... + C(ck - 1, k)
+
+que é uma bijeção entre os jogos e 0 .. C(N, k) - 1. Enquanto C(N, k) cabe
+em int64 (todas as loterias do config, menos a Lotomania com 50 dezenas), o
+índice guarda só esse inteiro: 8 bytes por jogo num array ordenado, com
+busca vetorizada por searchsorted. Acima disso a chave é a bitmask de
+2 × uint64 (motores/matriz.py), comparada como bytes.
+"""
+from functools import lru_cache
+from math import comb
+
+import numpy as np
+
+from . import lote
+
+INT64_MAX = np.iinfo(np.int64).max
+
+
+def cabe_em_int64(max_dezenas, k):
+    return comb(int(max_dezenas), int(k)) - 1 <= INT64_MAX
+
+
+@lru_cache(maxsize=32)
+def _binomiais(max_dezenas, k):
+    """T[v, i] = C(v, i) para v em 0..N, i em 0..k (saturado em INT64_MAX; essas entradas nunca são usadas)."""
+    t = np.zeros((max_dezenas + 1, k + 1), dtype=np.int64)
+    for v in range(max_dezenas + 1):
+        for i in range(k + 1):
+            t[v, i] = min(comb(v, i), INT64_MAX)
+    t.setflags(write=False)
+    return t
+
+
+def ranquear(jogos, max_dezenas):
+    """(m × k) dezenas 1..N -> rank int64 de cada jogo (linhas não precisam vir ordenadas)."""
+    jogos = np.sort(np.asarray(jogos, dtype=np.int64), axis=1)
+    k = jogos.shape[1]
+    t = _binomiais(int(max_dezenas), k)
+    return t[jogos - 1, np.arange(1, k + 1)].sum(axis=1)
+
+
+def desranquear(ranks, max_dezenas, k):
+    """Inverso de `ranquear`: rank -> (m × k) uint8 ordenado (guloso da maior posição para a menor)."""
+    t = _binomiais(int(max_dezenas), int(k))
+    r = np.asarray(ranks, dtype=np.int64).copy()
+    jogos = np.zeros((r.size, k), dtype=np.uint8)
+    for i in range(k, 0, -1):
+        # Maior c com C(c, i) <= r (a coluna é crescente em c)
+        c = np.searchsorted(t[:, i], r, side='right') - 1
+        jogos[:, i - 1] = c + 1
+        r -= t[c, i]
+    return jogos
+
+
+def validos(jogos, max_dezenas):
+    """Linhas com k dezenas distintas dentro do universo (vazios e repetidas ficam de fora)."""
+    jogos = np.asarray(jogos)
+    if jogos.size == 0: return np.zeros(jogos.shape[0], dtype=bool)
+    ordenadas = np.sort(jogos, axis=1)
+    ok = (ordenadas[:, 0] >= 1) & (ordenadas[:, -1] <= max_dezenas)
+    if jogos.shape[1] > 1: ok &= (np.diff(ordenadas.astype(np.int64), axis=1) > 0).all(axis=1)
+    return ok
+
+
+class IndiceJogos:
+    """
+    Conjunto de jogos de k dezenas para perguntar "já existe?" em lote.
+    As chaves ficam num array ordenado e sem repetição.
+    """
+
+    def __init__(self, max_dezenas, tamanho_jogo, jogos=None):
+        self.max_dezenas = int(max_dezenas)
+        self.k = int(tamanho_jogo)
+        self.exato = cabe_em_int64(self.max_dezenas, self.k)
+        self._chaves = self.chaves(np.zeros((0, self.k), dtype=np.uint8))
+        if jogos is not None: self.adicionar(jogos)
+
+    def chaves(self, jogos):
+        jogos = np.asarray(jogos, dtype=np.uint8).reshape(-1, self.k)
+        if self.exato: return ranquear(jogos, self.max_dezenas)
+        return lote.chaves_unicas(jogos)
+
+    def __len__(self):
+        return self._chaves.size
+
+    @property
+    def nbytes(self):
+        return self._chaves.nbytes
+
+    def adicionar(self, jogos):
+        """Acrescenta jogos (linhas inválidas ou de outro tamanho são ignoradas). Retorna quantos eram novos."""
+        jogos = np.asarray(jogos)
+        if jogos.ndim == 1: jogos = jogos[None, :]
+        if jogos.shape[0] == 0 or jogos.shape[1] != self.k: return 0
+        novas = np.unique(self.chaves(jogos[validos(jogos, self.max_dezenas)]))
+        # Merge no array já ordenado: O(n) por lote em vez de reordenar tudo (union1d)
+        pos = np.searchsorted(self._chaves, novas)
+        existe = np.zeros(novas.size, dtype=bool)
+        dentro = pos < self._chaves.size
+        existe[dentro] = self._chaves[pos[dentro]] == novas[dentro]
+        self._chaves = np.insert(self._chaves, pos[~existe], novas[~existe])
+        return int((~existe).sum())
+
+    def contem(self, jogos):
+        """Máscara booleana: quais linhas de `jogos` já estão no índice."""
+        jogos = np.asarray(jogos)
+        if jogos.ndim == 1: jogos = jogos[None, :]
+        saida = np.zeros(jogos.shape[0], dtype=bool)
+        if self._chaves.size == 0 or jogos.shape[0] == 0 or jogos.shape[1] != self.k: return saida
+        ok = validos(jogos, self.max_dezenas)
+        ch = self.chaves(jogos[ok])
+        if self.exato:
+            pos = np.minimum(np.searchsorted(self._chaves, ch), self._chaves.size - 1)
+            saida[ok] = self._chaves[pos] == ch
+        else:
+            saida[ok] = np.isin(ch, self._chaves)
+        return saida
+
+    def __contains__(self, jogo):
+        return bool(self.contem(jogo)[0])
@@ -0,0 +1,55 @@
+"""
+Registro de motores: nome da loteria (chave do config) -> classe do motor.
+
+Cada módulo de motor só é importado na primeira vez que a loteria é usada.
+O config da loteria pode apontar outro motor com "motor": "modulo:Classe".
+"""
+import importlib
+
+PADRAO = ("motores.base", "MotorBase")
+
+MOTORES = {
+    "Mega Sena": ("motores.mega_sena", "MotorMegaSena"),
+    "Lotofácil": ("motores.lotofacil", "MotorLotofacil"),
+    "Quina": ("motores.quina", "MotorQuina"),
+    "Dia de Sorte": ("motores.dia_de_sorte", "MotorDiaDeSorte"),
+    "Dupla Sena": ("motores.dupla_sena", "MotorDuplaSena"),
+    "Lotomania": PADRAO,
+    "Timemania": PADRAO,
+}
+
+_carregadas = {}
+
+
+def _por_nome_aproximado(nome):
+    """Compatibilidade com nomes fora do registro (mesma regra antiga do obter_motor)"""
+    n = nome.lower()
+    if "mega" in n: return MOTORES["Mega Sena"]
+    elif "facil" in n or "fácil" in n: return MOTORES["Lotofácil"]
+    elif "quina" in n: return MOTORES["Quina"]
+    elif "dia" in n and "sorte" in n: return MOTORES["Dia de Sorte"]
+    elif "dupla" in n: return MOTORES["Dupla Sena"]
+    return PADRAO
+
+
+def _importar(alvo):
+    if alvo not in _carregadas:
+        modulo, classe = alvo
+        try: _carregadas[alvo] = getattr(importlib.import_module(modulo), classe)
+        except (ImportError, AttributeError):
+            # Motor específico ausente: cai no genérico em vez de derrubar o app
+            _carregadas[alvo] = _importar(PADRAO) if alvo != PADRAO else None
+            if _carregadas[alvo] is None: raise
+    return _carregadas[alvo]
+
+
+def classe_motor(nome, cfg=None):
+    if cfg and cfg.get("motor"):
+        modulo, _, classe = cfg["motor"].partition(":")
+        return _importar((modulo, classe))
+    return _importar(MOTORES.get(nome) or _por_nome_aproximado(nome))
+
+
+def obter_motor(nome, df, cfg):
+    """Factory: monta o motor certo para a loteria."""
+    return classe_motor(nome, cfg)(df, cfg)
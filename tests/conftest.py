@@ -0,0 +1,5 @@
+"""Antes de qualquer import de infra: os caches locais dos testes vão para uma pasta temporária, nunca a .cache do app."""
+import os
+import tempfile
+
+os.environ.setdefault("ORACULO_CACHE", tempfile.mkdtemp(prefix="oraculo_testes_"))
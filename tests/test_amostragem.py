@@ -0,0 +1,92 @@
+"""AmostradorRestrito: contagem exata (força bruta em universos pequenos) e sorteio uniforme entre os jogos válidos."""
+import unittest
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+
+from motores.amostragem import AmostradorRestrito, normalizar_filtros
+
+
+def valido(jogo, filtros, n):
+    """Os filtros de motores/amostragem.py, direto na definição."""
+    if "soma" in filtros:
+        lo, hi = filtros["soma"]
+        if not lo <= sum(jogo) <= hi: return False
+    if "max_seq" in filtros:
+        seq = maior = 1
+        for a, b in zip(jogo, jogo[1:]):
+            seq = seq + 1 if b == a + 1 else 1
+            maior = max(maior, seq)
+        if maior > filtros["max_seq"]: return False
+    if "pares" in filtros:
+        lo, hi = filtros["pares"]
+        if not lo <= sum(d % 2 == 0 for d in jogo) <= hi: return False
+    if "faixas" in filtros:
+        tam, lo, hi = filtros["faixas"]
+        for ini in range(1, n + 1, tam):
+            if not lo <= sum(ini <= d < ini + tam for d in jogo) <= hi: return False
+    return True
+
+
+def validos(n, k, filtros, pool=None):
+    pool = sorted(pool or range(1, n + 1))
+    return [c for c in combinations(pool, k) if valido(c, filtros, n)]
+
+
+CASOS = [
+    (14, 4, {"soma": (20, 36), "max_seq": 2}, None),
+    (15, 5, {"pares": (1, 3), "max_seq": 3}, None),
+    (16, 4, {"faixas": (5, 0, 2), "soma": (18, 50)}, None),
+    (13, 4, {"soma": (15, 40), "max_seq": 1, "pares": (2, 2)}, None),
+    (20, 4, {"soma": (30, 60), "max_seq": 2}, [1, 2, 3, 5, 8, 9, 10, 13, 14, 17, 19, 20]),
+    (10, 3, {}, None),
+]
+
+
+class TestContagem(unittest.TestCase):
+    def test_total_igual_a_forca_bruta(self):
+        for n, k, filtros, pool in CASOS:
+            with self.subTest(n=n, k=k, filtros=filtros, pool=pool):
+                self.assertEqual(AmostradorRestrito(n, k, pool, filtros).total(), len(validos(n, k, filtros, pool)))
+
+    def test_sem_jogo_valido(self):
+        a = AmostradorRestrito(10, 3, None, {"soma": (100, 120)})
+        self.assertEqual(a.total(), 0)
+        with self.assertRaises(ValueError): a.sortear(1, np.random.default_rng(0))
+
+    def test_normalizar_filtros(self):
+        self.assertEqual(normalizar_filtros({"soma": [140, 240], "max_seq": "2", "pares": None}),
+                         {"soma": (140, 240), "max_seq": 2})
+        self.assertEqual(normalizar_filtros(None), {})
+
+
+class TestSorteio(unittest.TestCase):
+    def test_so_jogos_validos(self):
+        for n, k, filtros, pool in CASOS:
+            with self.subTest(n=n, k=k, filtros=filtros, pool=pool):
+                jogos = AmostradorRestrito(n, k, pool, filtros).sortear(3000, np.random.default_rng(1))
+                self.assertEqual(jogos.shape, (3000, k))
+                permitidos = set(validos(n, k, filtros, pool))
+                self.assertTrue({tuple(j) for j in jogos.tolist()} <= permitidos)
+
+    def test_uniforme(self):
+        n, k, filtros = 12, 4, {"soma": (18, 30), "max_seq": 2}
+        permitidos = validos(n, k, filtros)
+        m = 400 * len(permitidos)
+        jogos = AmostradorRestrito(n, k, None, filtros).sortear(m, np.random.default_rng(7))
+        contagem = Counter(tuple(j) for j in jogos.tolist())
+        self.assertEqual(set(contagem), set(permitidos))  # todos aparecem
+        esperado = m / len(permitidos)
+        qui2 = sum((contagem[j] - esperado) ** 2 / esperado for j in permitidos)
+        # Graus de liberdade = L - 1; média L - 1, desvio ~sqrt(2(L - 1)): 6 desvios de folga
+        gl = len(permitidos) - 1
+        self.assertLess(qui2, gl + 6 * (2 * gl) ** 0.5)
+
+    def test_reprodutivel(self):
+        a = AmostradorRestrito(60, 6, None, {"soma": (140, 240), "max_seq": 2})
+        np.testing.assert_array_equal(a.sortear(50, np.random.default_rng(3)), a.sortear(50, np.random.default_rng(3)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""gravar_conferencia no Sheets (PlanilhaFake): só as células Acertos/Status das linhas conferidas."""
+import unittest
+
+from infra.armazenamento import CABECALHO_PALPITES, Armazenamento, ArmazenamentoSheets
+from infra.planilha_fake import PlanilhaFake
+
+
+def palpites(n):
+    return [CABECALHO_PALPITES] + [["01/01", "100", f"{i:02d}", "IA", "", "Pendente"] for i in range(n)]
+
+
+class TestGravarConferencia(unittest.TestCase):
+    def setUp(self):
+        self.planilha = PlanilhaFake({"P": palpites(6)})
+        self.armazem = ArmazenamentoSheets(self.planilha)
+        self.aba = self.planilha.worksheet("P")
+
+    def gravar(self, posicoes, acertos):
+        df = self.armazem.ler("P", fresco=True)
+        gravados = []
+        original = self.aba.batch_update
+        self.aba.batch_update = lambda data, **kw: (gravados.extend(data), original(data, **kw))
+        self.armazem.gravar_conferencia("P", df, posicoes, acertos, "Conferido")
+        return gravados
+
+    def test_uma_faixa_por_trecho_contiguo(self):
+        gravados = self.gravar([5, 0, 1], [3, 1, 2])
+        self.assertEqual(gravados, [{"range": "E2:F3", "values": [["1", "Conferido"], ["2", "Conferido"]]},
+                                    {"range": "E7:F7", "values": [["3", "Conferido"]]}])
+        self.assertEqual(self.aba.chamadas["batch_update"], 1)
+
+    def test_linhas_do_meio_nao_sao_reescritas(self):
+        df = self.armazem.ler("P", fresco=True)
+        # Outra sessão confere a linha do meio depois da nossa leitura
+        self.aba.update("E4:F4", [["4", "Conferido"]])
+        self.armazem.gravar_conferencia("P", df, [0, 5], [1, 2], "Conferido")
+        linhas = self.aba.get_all_values()
+        self.assertEqual(linhas[3][4:6], ["4", "Conferido"])
+        self.assertEqual([linhas[1][4], linhas[6][4]], ["1", "2"])
+        self.assertEqual(linhas[2][4:6], ["", "Pendente"])
+
+    def test_colunas_separadas(self):
+        cab = ["Acertos", "Data", "Status"]
+        self.planilha = PlanilhaFake({"P": [cab, ["", "x", "Pendente"], ["", "y", "Pendente"]]})
+        self.armazem = ArmazenamentoSheets(self.planilha)
+        self.aba = self.planilha.worksheet("P")
+        gravados = self.gravar([1], [5])
+        self.assertEqual(gravados, [{"range": "A3:A3", "values": [["5"]]}, {"range": "C3:C3", "values": [["Conferido"]]}])
+
+
+class TestApagar(unittest.TestCase):
+    def setUp(self):
+        linhas = [["01/01", c, f"{i:02d}", "IA", "", "Pendente"] for i, c in enumerate("5 6 5 7 5 5 8 6".split())]
+        self.planilha = PlanilhaFake({"Outra": [["x"]], "P": [CABECALHO_PALPITES] + linhas})
+        self.armazem = ArmazenamentoSheets(self.planilha)
+        self.aba = self.planilha.worksheet("P")
+
+    def concursos(self):
+        return [r[1] for r in self.aba.get_all_values()[1:]]
+
+    def test_concursos_espalhados_num_pedido_so(self):
+        self.assertEqual(self.armazem.apagar("P", "Por Concurso", 5), 4)
+        self.assertEqual(self.concursos(), ["6", "7", "8", "6"])
+        self.assertEqual(self.planilha.pedidos["batch_update"], 1)
+        self.assertNotIn("delete_rows", self.aba.chamadas)
+        self.assertEqual(self.planilha.worksheet("Outra").get_all_values(), [["x"]])
+
+    def test_ultimos_n_e_limpar_tudo(self):
+        self.assertEqual(self.armazem.apagar("P", "Últimos N", 3), 3)
+        self.assertEqual(self.concursos(), ["5", "6", "5", "7", "5"])
+        self.assertEqual(self.armazem.apagar("P", "Limpar Tudo", 0), 5)
+        self.assertEqual(self.aba.get_all_values(), [CABECALHO_PALPITES])
+        self.assertEqual(self.planilha.pedidos["batch_update"], 2)
+
+    def test_nada_a_apagar_nao_chama_a_api(self):
+        self.assertEqual(self.armazem.apagar("P", "Por Concurso", 99), 0)
+        self.assertNotIn("batch_update", self.planilha.pedidos)
+
+
+class TestInterface(unittest.TestCase):
+    def test_backend_incompleto_nao_instancia(self):
+        class SoLeitura(Armazenamento):
+            def ler(self, aba, fresco=False): return None
+        with self.assertRaises(TypeError): SoLeitura()
+
+
+if __name__ == "__main__":
+    unittest.main()
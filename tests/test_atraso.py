@@ -0,0 +1,74 @@
+"""Atrasos: última aparição, atraso atual e intervalos conferidos contra um laço simples, inclusive no incremental."""
+import unittest
+
+import numpy as np
+
+from motores.atraso import Atrasos
+from motores.frequencia import Frequencias
+
+
+def referencia(crono, m):
+    """Laço direto sobre os sorteios em ordem cronológica: (último índice, intervalos) por dezena."""
+    ultimo, intervalos = [-1] * m, [[] for _ in range(m)]
+    for i, linha in enumerate(crono):
+        for d in set(int(x) for x in linha if 1 <= x <= m):
+            if ultimo[d - 1] >= 0: intervalos[d - 1].append(i - ultimo[d - 1])
+            ultimo[d - 1] = i
+    return ultimo, intervalos
+
+
+def historico(n, m=15, k=4, seed=0):
+    """Matriz no formato do motor (linha 0 = mais recente), com um zero de vez em quando."""
+    rng = np.random.default_rng(seed)
+    matriz = np.sort(np.argsort(rng.random((n, m)), axis=1)[:, :k] + 1, axis=1).astype(np.uint8)
+    matriz[rng.random(n) < 0.1, 0] = 0
+    return matriz
+
+
+class TestAtrasos(unittest.TestCase):
+    def conferir(self, atrasos, crono, m):
+        ultimo, intervalos = referencia(crono, m)
+        n = len(crono)
+        self.assertEqual(atrasos.ultimo.tolist(), ultimo)
+        self.assertEqual(atrasos.atual.tolist(), [n - 1 - u if u >= 0 else n for u in ultimo])
+        r = atrasos.resumo()
+        for d, g in enumerate(intervalos):
+            with self.subTest(dezena=d + 1):
+                self.assertEqual(r["intervalos"][d], len(g))
+                self.assertEqual(r["max"][d], max(g, default=0))
+                self.assertAlmostEqual(r["media"][d], np.mean(g) if g else 0.0)
+                for p in (50, 90):
+                    self.assertAlmostEqual(r[f"p{p}"][d], np.percentile(g, p) if g else 0.0)
+
+    def test_passada_vetorizada(self):
+        matriz = historico(200)
+        self.conferir(Atrasos(Frequencias(matriz, 15)), matriz[::-1], 15)
+
+    def test_adicionar_igual_a_recontar(self):
+        matriz = historico(120, seed=3)
+        freq = Frequencias(matriz[60:], 15)
+        atrasos = Atrasos(freq)
+        atrasos.resumo()  # cache tem que ser invalidado
+        for linha in matriz[:60][::-1]:
+            freq.adicionar(linha)
+            atrasos.adicionar(linha)
+        self.conferir(atrasos, matriz[::-1], 15)
+
+    def test_dezena_que_nunca_saiu(self):
+        matriz = np.array([[1, 2, 3], [2, 3, 4], [1, 3, 4]], dtype=np.uint8)
+        a = Atrasos(Frequencias(matriz, 6))
+        self.assertEqual(a.atual.tolist(), [0, 0, 0, 1, 3, 3])
+        self.assertEqual(a.resumo()["intervalos"].tolist(), [1, 1, 2, 1, 0, 0])
+        self.assertEqual(a.razao()[4:].tolist(), [0.0, 0.0])
+
+    def test_atrasadas(self):
+        # Dezena 5 sai a cada 2 sorteios e está há 6 sem sair; as demais estão no ritmo
+        crono = [[1, 2, 5], [3, 4, 6], [1, 2, 5], [3, 4, 6], [1, 2, 5]] + [[1, 2, 3], [4, 6, 1]] * 3
+        a = Atrasos(Frequencias(np.array(crono[::-1], dtype=np.uint8), 6))
+        self.assertEqual(a.atrasadas(), [5])
+        self.assertEqual(a.atrasadas(k=2)[0], 5)
+        self.assertEqual(len(a.atrasadas(k=2)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""Backtest: motor avançado com adicionar_sorteio == motor remontado a cada concurso; Dupla Sena por sorteio."""
+import unittest
+
+import numpy as np
+
+from infra.configuracao import CarregadorConfig
+from motores import backtest
+from motores.matriz import acertos, para_mascaras
+from motores.registro import classe_motor
+from ferramentas.bench import historico_sintetico
+
+ESTRATEGIAS = ["Equilíbrio", "Tendência", "Afinidade", "Atrasadas"]
+
+
+def referencia(classe, cfg, matriz, concursos, alvos, k, seed):
+    """O jeito ingênuo: de_matriz do zero para cada alvo."""
+    hist = {e: np.zeros(max(cfg['tamanho_jogo'], matriz.shape[1]) + 1, dtype=np.int64) for e in ESTRATEGIAS}
+    for i in alvos:
+        motor = classe.de_matriz(matriz[i + 1:], cfg, concursos[i + 1:])
+        sorteios = para_mascaras(motor._jogos_do_sorteio(matriz[i][None, :]))
+        for j, e in enumerate(ESTRATEGIAS):
+            rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(int(i), j)))
+            jogos = motor.gerar_lote(e, k, rng=rng)
+            melhor = np.max([acertos(para_mascaras(jogos), s) for s in sorteios], axis=0)
+            hist[e] += np.bincount(melhor, minlength=hist[e].size)[:hist[e].size]
+    return hist
+
+
+class TestBacktest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.config = CarregadorConfig(caminho_cache=None).atual()
+
+    def comparar(self, nome, largura):
+        cfg = self.config.loterias[nome]
+        classe = classe_motor(nome, cfg)
+        k = cfg['tamanho_jogo']
+        # Dupla Sena (largura 12): cada metade da linha é um sorteio
+        matriz = np.hstack([historico_sintetico(cfg, 90, k, seed=3 + s) for s in range(largura // k)])
+        concursos = np.arange(90, 0, -1, dtype=np.int64)
+        alvos = list(range(40))
+        hist, n, falhas = backtest._rodar_bloco(classe, cfg, matriz, concursos, alvos, ESTRATEGIAS, 40, 7)
+        esperado = referencia(classe, cfg, matriz, concursos, alvos, 40, 7)
+        self.assertEqual(n, len(alvos))
+        self.assertEqual(falhas, {e: 0 for e in ESTRATEGIAS})
+        for e in ESTRATEGIAS: np.testing.assert_array_equal(hist[e], esperado[e], err_msg=e)
+
+    def test_incremental_igual_a_remontar_mega_sena(self):
+        self.comparar("Mega Sena", 6)
+
+    def test_incremental_igual_a_remontar_dupla_sena(self):
+        self.comparar("Dupla Sena", 12)
+
+    def test_dupla_sena_confere_cada_sorteio_separado(self):
+        cfg = self.config.loterias["Dupla Sena"]
+        motor = classe_motor("Dupla Sena", cfg).de_matriz(np.zeros((0, 12), dtype=np.uint8), cfg)
+        resultados = backtest._resultados(motor, np.arange(1, 13, dtype=np.uint8))
+        self.assertEqual(resultados.shape[0], 2)
+        jogo = para_mascaras(np.array([[1, 2, 3, 7, 8, 9]], dtype=np.uint8))
+        # Contra a linha inteira seriam 6 acertos; por sorteio, 3
+        self.assertEqual(acertos(jogo[:, None, :], resultados[None, :, :]).max(axis=1).tolist(), [3])
+
+
+class TestMotorIncremental(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.cfg = CarregadorConfig(caminho_cache=None).atual().loterias["Mega Sena"]
+        cls.classe = classe_motor("Mega Sena", cls.cfg)
+        cls.matriz = historico_sintetico(cls.cfg, 80, 6, seed=11)
+        cls.concursos = np.arange(80, 0, -1, dtype=np.int64)
+
+    def test_adicionar_sorteio_sem_copiar_o_historico(self):
+        motor = self.classe.de_matriz(self.matriz[40:], self.cfg, self.concursos[40:])
+        bases = set()
+        for i in range(39, -1, -1):
+            motor.adicionar_sorteio(self.matriz[i], int(self.concursos[i]))
+            bases.add(id(motor.matriz.base))
+        self.assertLessEqual(len(bases), 3)  # só quando a folga acaba (16, depois dobra)
+        ref = self.classe.de_matriz(self.matriz, self.cfg, self.concursos)
+        np.testing.assert_array_equal(motor.matriz, ref.matriz)
+        np.testing.assert_array_equal(motor.mascaras, ref.mascaras)
+        np.testing.assert_array_equal(motor.concursos, ref.concursos)
+        self.assertTrue(motor.matriz.flags.c_contiguous)
+
+    def test_views_antigas_nao_mudam(self):
+        motor = self.classe.de_matriz(self.matriz[1:], self.cfg, self.concursos[1:])
+        antes = motor.matriz
+        copia = antes.copy()
+        motor.adicionar_sorteio(self.matriz[0], int(self.concursos[0]))
+        np.testing.assert_array_equal(antes, copia)
+        np.testing.assert_array_equal(self.matriz[1:], copia)
+
+    def test_amostradores_em_lru(self):
+        motor = self.classe.de_matriz(self.matriz, self.cfg, self.concursos)
+        pools = [list(range(1 + i, 21 + i)) for i in range(motor.MAX_AMOSTRADORES + 3)]
+        for pool in pools: motor._amostrador(pool)
+        self.assertEqual(len(motor._amostradores), motor.MAX_AMOSTRADORES)
+        self.assertIn(tuple(pools[-1]), motor._amostradores)
+        self.assertNotIn(tuple(pools[0]), motor._amostradores)
+
+
+if __name__ == "__main__":
+    unittest.main()
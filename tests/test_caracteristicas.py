@@ -0,0 +1,97 @@
+"""Características: colunas calculadas, filtros por faixa e consultas em texto (sem eval)."""
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from infra.configuracao import CarregadorConfig
+from motores.caracteristicas import calcular, colunas, interpretar, mascara
+from motores.registro import classe_motor
+
+NOMES = colunas(60)
+
+
+def coluna(tabela, nome):
+    return tabela[:, NOMES.index(nome)].tolist()
+
+
+class TestCalcular(unittest.TestCase):
+    def test_colunas_de_um_jogo(self):
+        t = calcular([[12, 2, 3, 4, 31, 59]], 60)
+        self.assertEqual(coluna(t, "soma"), [111])
+        self.assertEqual(coluna(t, "pares"), [3])
+        self.assertEqual(coluna(t, "primos"), [4])  # 2, 3, 31, 59
+        self.assertEqual(coluna(t, "amplitude"), [57])
+        self.assertEqual(coluna(t, "max_seq"), [3])  # 2-3-4
+        self.assertEqual(coluna(t, "consecutivas"), [2])
+        self.assertEqual(coluna(t, "faixa_1_10"), [3])
+
+    def test_vazios_nao_contam(self):
+        t = calcular([[0, 0, 5, 7]], 60)
+        self.assertEqual((coluna(t, "dezenas"), coluna(t, "soma"), coluna(t, "amplitude")), ([2], [12], [2]))
+
+
+class TestFiltros(unittest.TestCase):
+    def setUp(self):
+        self.tabela = calcular([[1, 2, 3, 4, 5, 6], [10, 20, 30, 40, 50, 60], [5, 16, 27, 38, 49, 60]], 60)
+
+    def test_dict_de_faixas(self):
+        self.assertEqual(mascara(self.tabela, NOMES, {"soma": (100, None), "max_seq": 1}).tolist(), [False, True, True])
+        with self.assertRaises(KeyError): mascara(self.tabela, NOMES, {"sem_coluna": 1})
+
+    def test_expressao_igual_ao_dict(self):
+        por_dict = mascara(self.tabela, NOMES, {"soma": (150, 200), "pares": (None, 3)})
+        por_texto = mascara(self.tabela, NOMES, "soma >= 150 and soma <= 200 and pares <= 3")
+        self.assertEqual(por_texto.tolist(), por_dict.tolist())
+
+    def test_and_antes_de_or(self):
+        r = mascara(self.tabela, NOMES, "soma < 30 or soma > 200 and pares == 6")
+        self.assertEqual(r.tolist(), [True, True, False])
+        self.assertEqual(interpretar("soma < 30 or pares >= 1 and max_seq != 2", NOMES),
+                         [[("soma", "<", 30.0)], [("pares", ">=", 1.0), ("max_seq", "!=", 2.0)]])
+
+    def test_rejeita_metodos_e_atributos(self):
+        alvo = os.path.join(tempfile.mkdtemp(prefix="caract_"), "x.csv")
+        for expressao in [f"soma.to_csv('{alvo}')", f"soma.values.tofile('{alvo}') > 0", "soma.__class__ > 0",
+                          "__import__('os') > 0", "abs(soma) > 3", "soma >= pares", "soma >= 1 and",
+                          "soma >= 1 & pares <= 2", "150 <= soma", "@soma > 1"]:
+            with self.subTest(expressao=expressao), self.assertRaises(ValueError):
+                mascara(self.tabela, NOMES, expressao)
+        self.assertFalse(os.path.exists(alvo))
+
+    def test_coluna_desconhecida(self):
+        with self.assertRaises(KeyError): mascara(self.tabela, NOMES, "soma > 1 and nada < 3")
+
+
+class TestDuplaSena(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.cfg = CarregadorConfig(caminho_cache=None).atual().loterias["Dupla Sena"]
+        cls.classe = classe_motor("Dupla Sena", cls.cfg)
+        # Concurso 2 (mais recente) e 1; cada linha = 1º sorteio | 2º sorteio
+        cls.matriz = np.array([[1, 2, 3, 4, 5, 6, 40, 41, 42, 43, 44, 45],
+                               [10, 20, 30, 40, 45, 50, 1, 2, 3, 7, 8, 9]], dtype=np.uint8)
+
+    def test_uma_linha_por_sorteio(self):
+        motor = self.classe.de_matriz(self.matriz, self.cfg, np.array([2, 1]))
+        r = motor.get_caracteristicas()
+        self.assertEqual(r["concurso"], [2, 2, 1, 1])
+        self.assertEqual(r["sorteio"], [2, 1, 2, 1])
+        self.assertEqual(r["soma"], [255, 21, 30, 195])
+        self.assertEqual(r["dezenas"], [6] * 4)
+        self.assertEqual(r["repetidas"], [0, 3, 0, 0])  # 1º sorteio do 2 contra o 2º do 1: 1, 2, 3
+        self.assertEqual(motor.get_caracteristicas(ultimos=1, filtros="soma >= 150")["sorteio"], [2])
+        # Mesma escala dos palpites de 6 dezenas
+        self.assertEqual(motor.filtrar_jogos(self.matriz[:, :6], "soma >= 150").tolist(), [False, True])
+
+    def test_adicionar_igual_a_recontar(self):
+        motor = self.classe.de_matriz(self.matriz[1:], self.cfg, np.array([1]))
+        motor.caracteristicas
+        motor.adicionar_sorteio(self.matriz[0], concurso=2)
+        ref = self.classe.de_matriz(self.matriz, self.cfg, np.array([2, 1]))
+        self.assertEqual(motor.get_caracteristicas(), ref.get_caracteristicas())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+"""
+Fumaça do teste de carga: poucas sessões AppTest simultâneas contra os
+serviços falsos, só para garantir que o harness roda de ponta a ponta.
+"""
+import importlib.util
+import os
+import unittest
+
+from ferramentas import carga
+from infra import historico_local
+
+TEM_STREAMLIT = importlib.util.find_spec("streamlit") is not None
+
+
+@unittest.skipUnless(TEM_STREAMLIT, "streamlit não instalado")
+class TestCarga(unittest.TestCase):
+    def test_sessoes_simultaneas(self):
+        # Os caches locais do teste não podem cair na .cache do app
+        self.assertEqual(historico_local.RAIZ_CACHE, os.environ["ORACULO_CACHE"])
+
+        r = carga.carga(sessoes=3, reruns=2, sorteios=200, sessoes_memoria=1, timeout=60,
+                        rede_planilha=carga.Rede(0.01), rede_api=carga.Rede(0.01, seed=1))
+        self.assertEqual(r["erros"], [])
+        self.assertEqual(r["latencia"]["primeira"]["n"], 3)
+        self.assertEqual(r["latencia"]["reruns"]["n"], 6)
+        self.assertGreater(r["planilha"]["total"], 0)
+        self.assertGreater(r["api_premios"]["chamadas"], 0)
+        m = r["memoria"]
+        self.assertEqual(m["retida_por_sessao"]["n"], 1)
+        self.assertGreater(m["retida_por_sessao"]["media_kb"], 0)
+        self.assertEqual(m["session_state"]["n"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""carregar_cards: o card sai com o histórico e volta quando o prêmio da API chega depois."""
+import time
+import unittest
+
+import pandas as pd
+
+from infra.carregador import carregar_cards
+
+DF = pd.DataFrame({"Concurso": [1]})
+
+
+def historico(atrasos):
+    def buscar(cfg):
+        time.sleep(atrasos[cfg])
+        return DF
+    return buscar
+
+
+def premio(atrasos, valores):
+    def buscar(nome):
+        time.sleep(atrasos[nome])
+        return valores.get(nome)
+    return buscar
+
+
+class TestCarregarCards(unittest.TestCase):
+    def entregas(self, itens, buscar_historico, buscar_premio, **kwargs):
+        return [(c.nome, c.premio, c.premio_pendente) for c in carregar_cards(itens, buscar_historico, buscar_premio, **kwargs)]
+
+    def test_card_sai_antes_do_premio_e_e_atualizado(self):
+        inicio = time.monotonic()
+        vistos = []
+        for c in carregar_cards([("A", "a")], historico({"a": 0.0}), premio({"A": 0.3}, {"A": 10})):
+            vistos.append((c.nome, c.premio, c.premio_pendente, time.monotonic() - inicio))
+        self.assertEqual([v[:3] for v in vistos], [("A", None, True), ("A", 10, False)])
+        self.assertLess(vistos[0][3], 0.2)  # sem esperar a API
+        self.assertGreaterEqual(vistos[1][3], 0.3)
+
+    def test_premio_antes_do_historico_sai_uma_vez(self):
+        r = self.entregas([("A", "a")], historico({"a": 0.2}), premio({"A": 0.0}, {"A": 10}))
+        self.assertEqual(r, [("A", 10, False)])
+
+    def test_premio_sem_valor_nao_redesenha(self):
+        r = self.entregas([("A", "a")], historico({"a": 0.0}), premio({"A": 0.2}, {}))
+        self.assertEqual(r, [("A", None, True)])
+
+    def test_premio_que_estoura_o_prazo_nao_segura_os_cards(self):
+        r = self.entregas([("A", "a"), ("B", "b")], historico({"a": 0.0, "b": 0.1}),
+                          premio({"A": 1.0, "B": 1.0}, {"A": 1, "B": 2}), prazo=0.3)
+        self.assertEqual(r, [("A", None, True), ("B", None, True)])
+
+    def test_erro_no_historico_sai_degradado(self):
+        def falha(cfg): raise RuntimeError("cota")
+        cards = list(carregar_cards([("A", "a")], falha, premio({"A": 0.1}, {"A": 10})))
+        self.assertEqual(len(cards), 1)
+        self.assertFalse(cards[0].ok)
+        self.assertEqual(cards[0].erro, "cota")
+
+
+if __name__ == "__main__":
+    unittest.main()
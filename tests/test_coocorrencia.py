@@ -0,0 +1,46 @@
+"""Coocorrencias: na Dupla Sena cada sorteio da linha conta separado; adicionar == recontar."""
+import unittest
+
+import numpy as np
+
+from infra.configuracao import CarregadorConfig
+from motores.registro import classe_motor
+from ferramentas.bench import historico_sintetico
+
+
+class TestDuplaSena(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.cfg = CarregadorConfig(caminho_cache=None).atual().loterias["Dupla Sena"]
+        cls.classe = classe_motor("Dupla Sena", cls.cfg)
+
+    def motor(self, matriz):
+        return self.classe.de_matriz(matriz, self.cfg)
+
+    def test_dezena_repetida_nos_dois_sorteios(self):
+        # 5 sai nos dois sorteios: nada de (5, 5, x) nem par 1-7 (um de cada sorteio)
+        linha = np.array([[1, 2, 3, 4, 5, 6, 5, 7, 8, 9, 10, 11]], dtype=np.uint8)
+        cooc = self.motor(linha).coocorrencia
+        trincas = [t for t, _ in cooc.trincas(k=100)]
+        self.assertEqual(len(trincas), 40)  # 2 × C(6, 3)
+        self.assertTrue(all(len(set(t)) == 3 for t in trincas))
+        pares = cooc.pares()
+        self.assertEqual(pares[0, 6], 0)
+        self.assertEqual(pares[4, 4], 2)
+        self.assertEqual(pares[4, 0], 1)
+
+    def test_adicionar_igual_a_recontar(self):
+        matriz = np.hstack([historico_sintetico(self.cfg, 60, 6, seed=s) for s in (1, 2)])
+        motor = self.motor(matriz[1:])
+        cooc = motor.coocorrencia
+        cooc.pares(), cooc.pares(ultimos=20), cooc.pares(meia_vida=10), cooc.trincas()
+        motor.adicionar_sorteio(matriz[0])
+        ref = self.motor(matriz).coocorrencia
+        np.testing.assert_array_equal(cooc.pares(), ref.pares())
+        np.testing.assert_array_equal(cooc.pares(ultimos=20), ref.pares(ultimos=20))
+        np.testing.assert_allclose(cooc.pares(meia_vida=10), ref.pares(meia_vida=10))
+        self.assertEqual(cooc.trincas(k=50), ref.trincas(k=50))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""Desdobramento: garantia conferida por força bruta, rank de bitsets nos dois caminhos e teto de trabalho."""
+import unittest
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from motores import desdobramento
+from motores.ranking import desranquear, ranquear
+
+
+def cobre(jogos, dezenas, m, t):
+    """Força bruta em Python puro: todo m-subconjunto do grupo tem um jogo com >= t em comum."""
+    jogos = [set(j) for j in jogos]
+    return all(any(len(j & set(alvo)) >= t for j in jogos) for alvo in combinations(dezenas, m))
+
+
+class TestCobertura(unittest.TestCase):
+    def test_garantia_em_casos_pequenos(self):
+        casos = [(list(range(1, 9)), 6, 6, 5), ([3, 7, 11, 19, 23, 31, 40, 52, 60], 6, 5, 4),
+                 (list(range(10, 20)), 5, 5, 3), (list(range(1, 13)), 6, 4, 3), (list(range(1, 10)), 4, 3, 3)]
+        for dezenas, k, m, t in casos:
+            with self.subTest(v=len(dezenas), k=k, m=m, t=t):
+                jogos = np.vstack(list(desdobramento.desdobrar(dezenas, k, m, t, tentativas=2, workers=1)))
+                self.assertEqual(jogos.shape[1], k)
+                self.assertTrue(set(jogos.ravel().tolist()) <= set(dezenas))
+                self.assertEqual(len({tuple(j) for j in jogos.tolist()}), len(jogos))
+                self.assertTrue(cobre(jogos.tolist(), dezenas, m, t))
+                self.assertTrue(desdobramento.garantia_ok(jogos, dezenas, m, t))
+
+    def test_garantia_ok_pega_falha(self):
+        dezenas = list(range(1, 9))
+        # Depois do enxugamento nenhum jogo sobra: tirar qualquer um quebra a garantia
+        jogos = np.vstack(list(desdobramento.desdobrar(dezenas, 6, 6, 5, workers=1)))[:-1]
+        self.assertFalse(cobre(jogos.tolist(), dezenas, 6, 5))
+        self.assertFalse(desdobramento.garantia_ok(jogos, dezenas, 6, 5))
+
+    def test_enxugar_nao_quebra_a_cobertura(self):
+        v, k, m, t = 10, 5, 5, 4
+        todos = np.arange(comb(v, k), dtype=np.int64)  # todos os candidatos: bem redundante
+        enxuto = desdobramento.enxugar(todos, v, k, m, t, np.random.default_rng(1))
+        self.assertLess(enxuto.size, todos.size)
+        self.assertTrue(cobre(desranquear(enxuto, v, k).tolist(), range(1, v + 1), m, t))
+
+    def test_mesma_semente_mesmo_resultado(self):
+        a = desdobramento.cobertura_gulosa(12, 6, 6, 4, seed=5)
+        b = desdobramento.cobertura_gulosa(12, 6, 6, 4, seed=5)
+        np.testing.assert_array_equal(a, b)
+
+
+class TestRankMascaras(unittest.TestCase):
+    def conferir(self, v, r):
+        ranks = np.random.default_rng(v).integers(0, comb(v, r), 5000)
+        conjuntos = desranquear(ranks, v, r)
+        np.testing.assert_array_equal(desdobramento.rank_mascaras(desdobramento._mascaras(conjuntos), v, r), ranks)
+        np.testing.assert_array_equal(ranquear(conjuntos, v), ranks)
+
+    def test_caminho_da_tabela(self):
+        for v, r in [(10, 3), (22, 6)]:
+            with self.subTest(v=v, r=r): self.conferir(v, r)
+
+    def test_caminho_por_blocos(self):
+        self.assertGreater(23, desdobramento.LIMITE_TABELA_BITS)
+        for v, r in [(23, 6), (30, 4), (40, 5), (63, 3)]:
+            with self.subTest(v=v, r=r): self.conferir(v, r)
+
+    def test_vizinhos_batem_com_forca_bruta(self):
+        v, s, r, t = 9, 4, 3, 2
+        conjunto = (2, 4, 5, 9)
+        esperado = sorted(ranquear(np.array([c]), v)[0] for c in combinations(range(1, v + 1), r)
+                          if len(set(c) & set(conjunto)) >= t)
+        obtido = desdobramento.vizinhos(np.array([conjunto]), v, r, t)[0]
+        self.assertEqual(sorted(obtido.tolist()), esperado)
+        self.assertEqual(obtido.size, desdobramento.tamanho_vizinhanca(v, s, r, t))
+
+
+class TestLimites(unittest.TestCase):
+    def test_pedido_pesado_e_recusado_com_explicacao(self):
+        # Mega Sena, 30 dezenas, 6 sorteadas, quadra garantida: bilhões de passos
+        with self.assertRaises(ValueError) as ctx: desdobramento.validar(30, 6, 6, 4)
+        self.assertIn("pesado demais", str(ctx.exception))
+        with self.assertRaises(ValueError): list(desdobramento.desdobrar(range(1, 31), 6, 6, 4, workers=1))
+
+    def test_tentativas_cortadas_pelo_orcamento(self):
+        chamadas = []
+        original = desdobramento._tentativa
+        desdobramento._tentativa = lambda *a: chamadas.append(a) or original(*a)
+        self.addCleanup(setattr, desdobramento, "_tentativa", original)
+        maximo = desdobramento.MAX_TRABALHO
+        desdobramento.MAX_TRABALHO = 2 * desdobramento.trabalho(10, 5, 5, 4)
+        self.addCleanup(setattr, desdobramento, "MAX_TRABALHO", maximo)
+        desdobramento.melhor_cobertura(10, 5, 5, 4, tentativas=6, workers=1)
+        self.assertEqual(len(chamadas), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""FilaGravacao: envio em lote, nova tentativa depois de falha e nada duplicado quando o processo cai no meio."""
+import os
+import shutil
+import tempfile
+import unittest
+
+from infra.armazenamento import ArmazenamentoSQLite
+from infra.fila_gravacao import FilaGravacao
+
+
+def palpite(i):
+    return ["18/10/2026", "2800", f"[{i}, {i + 1}, {i + 2}]", "IA", "", "Pendente"]
+
+
+class ArmazemInstavel(ArmazenamentoSQLite):
+    """SQLite que falha no inserir: antes de gravar ("antes") ou depois, sem confirmar ("depois")."""
+    falha = None
+
+    def inserir(self, aba, linhas, cabecalho=None):
+        falha, self.falha = self.falha, None
+        if falha == "antes": raise ConnectionError("cota")
+        n = super().inserir(aba, linhas)
+        if falha == "depois": raise TimeoutError("sem resposta")
+        return n
+
+
+class TestFila(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp(prefix="fila_")
+        self.addCleanup(shutil.rmtree, self.pasta, ignore_errors=True)
+        self.armazem = ArmazemInstavel(os.path.join(self.pasta, "dados.sqlite"))
+        self.fila = self.abrir()
+
+    def abrir(self):
+        fila = FilaGravacao(self.armazem, os.path.join(self.pasta, "fila.sqlite"), iniciar=False)
+        self.addCleanup(fila._db.close)
+        return fila
+
+    def linhas(self):
+        df = self.armazem.ler("P")
+        return [] if df is None else df["Dezenas"].tolist()
+
+    def test_um_inserir_por_aba(self):
+        ids = [self.fila.enfileirar("P", palpite(i)) for i in range(3)]
+        self.assertEqual(set(self.fila.status(ids).values()), {"pendente"})
+        self.assertEqual(self.fila.descarregar(), 3)
+        self.assertEqual(self.linhas(), ["[0, 1, 2]", "[1, 2, 3]", "[2, 3, 4]"])
+        self.assertEqual(set(self.fila.status(ids).values()), {"gravado"})
+        self.assertEqual(self.fila.descarregar(), 0)
+
+    def test_falha_antes_de_gravar_repete(self):
+        self.fila.enfileirar("P", palpite(1))
+        self.armazem.falha = "antes"
+        with self.assertRaises(ConnectionError): self.fila.descarregar()
+        self.assertEqual(self.fila.resumo()["pendentes"], 1)
+        self.assertEqual(self.fila.descarregar(), 1)
+        self.assertEqual(self.linhas(), ["[1, 2, 3]"])
+
+    def test_falha_depois_de_gravar_nao_duplica(self):
+        self.fila.enfileirar("P", palpite(1))
+        self.armazem.falha = "depois"
+        with self.assertRaises(TimeoutError): self.fila.descarregar()
+        self.fila.enfileirar("P", palpite(5))
+        self.assertEqual(self.fila.descarregar(), 1)  # só o novo
+        self.assertEqual(self.linhas(), ["[1, 2, 3]", "[5, 6, 7]"])
+
+    def test_queda_entre_inserir_e_marcar_nao_duplica(self):
+        ids = [self.fila.enfileirar("P", palpite(i)) for i in range(2)]
+        # O processo "cai" logo depois do inserir: a marca de gravado nunca acontece
+        marcar = self.fila._marcar
+
+        def cair(status, ids_):
+            if status == "gravado": raise SystemExit
+            marcar(status, ids_)
+        self.fila._marcar = cair
+        with self.assertRaises(SystemExit): self.fila.descarregar()
+        self.assertEqual(len(self.linhas()), 2)
+        # Conferência no meio do caminho: Acertos/Status mudam, mas a linha continua reconhecida
+        df = self.armazem.ler("P")
+        self.armazem.gravar_conferencia("P", df, [0], [3], "Conferido")
+
+        reaberta = self.abrir()
+        self.assertEqual(reaberta.resumo()["pendentes"], 2)
+        self.assertEqual(reaberta.descarregar(), 0)
+        self.assertEqual(len(self.linhas()), 2)
+        self.assertEqual(set(reaberta.status(ids).values()), {"gravado"})
+
+    def test_linha_igual_ja_salva_nao_engole_a_pendente(self):
+        # Item nunca enviado (pendente, não incerto) é sempre gravado, mesmo igual a uma linha da aba
+        self.armazem.inserir("P", [palpite(1)])
+        self.fila.enfileirar("P", palpite(1))
+        self.assertEqual(self.fila.descarregar(), 1)
+        self.assertEqual(len(self.linhas()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
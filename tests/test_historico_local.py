@@ -0,0 +1,87 @@
+"""HistoricoLocal: delta com as últimas linhas relidas (edições de Status/prêmio) e abrir() entre threads."""
+import shutil
+import tempfile
+import threading
+import unittest
+
+from infra import historico_local
+from infra.armazenamento import ArmazenamentoSheets
+from infra.planilha_fake import AbaFake, PlanilhaFake
+
+CAB = ["Concurso", "D1", "D2", "Status"]
+
+
+def linha(c, status="Pago"):
+    return [str(c), "01", "02", status]
+
+
+class TestSincronizar(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp(prefix="historico_")
+        self.addCleanup(shutil.rmtree, self.pasta, ignore_errors=True)
+
+    def abrir(self, linhas):
+        aba = AbaFake("H", [CAB] + linhas)
+        local = historico_local.HistoricoLocal("H", self.pasta)
+        self.assertEqual(local.sincronizar(aba), len(linhas))
+        return aba, local
+
+    def status(self, local):
+        df = local.carregar()
+        return dict(zip(df["Concurso"], df["Status"]))
+
+    def test_edicao_no_topo_chega_ao_cache(self):
+        aba, local = self.abrir([linha(c) for c in range(10, 0, -1)])
+        versao = local.versao()
+        self.assertEqual(local.sincronizar(aba), 0)  # nada mudou: nada gravado
+        self.assertEqual(local.versao(), versao)
+
+        aba.update("D2", [["ACUMULOU"]])
+        self.assertEqual(local.sincronizar(aba), 1)
+        self.assertEqual(self.status(local)["10"], "ACUMULOU")
+        self.assertNotEqual(local.versao(), versao)
+
+    def test_concurso_novo_e_edicao_juntos(self):
+        aba, local = self.abrir([linha(c) for c in range(10, 0, -1)])
+        aba.update("D2", [["ACUMULOU"]])
+        aba.insert_rows([linha(12, ""), linha(11)], row=2)
+        self.assertEqual(local.sincronizar(aba), 3)
+        st = self.status(local)
+        self.assertEqual((st["12"], st["11"], st["10"]), ("", "Pago", "ACUMULOU"))
+        self.assertEqual(local.total(), 12)
+
+    def test_planilha_crescente(self):
+        aba, local = self.abrir([linha(c) for c in range(1, 11)])
+        aba.update("D11", [["ACUMULOU"]])
+        aba.append_row(linha(11))
+        self.assertEqual(local.sincronizar(aba), 2)
+        self.assertEqual(self.status(local)["10"], "ACUMULOU")
+        self.assertEqual(list(local.carregar()["Concurso"])[-1], "11")
+
+    def test_ler_historico_serve_a_edicao(self):
+        planilha = PlanilhaFake({"Hist": [CAB] + [linha(c) for c in range(5, 0, -1)]})
+        historico_local._abertos.pop((historico_local.PASTA_PADRAO, "Hist"), None)
+        armazem = ArmazenamentoSheets(planilha, sonda_ttl=0)
+        self.assertEqual(armazem.ler_historico("Hist")["Status"].iloc[0], "Pago")
+        planilha.worksheet("Hist").update("D2", [["ACUMULOU"]])
+        self.assertEqual(armazem.ler_historico("Hist")["Status"].iloc[0], "ACUMULOU")
+
+
+class TestAbrir(unittest.TestCase):
+    def test_uma_conexao_por_aba_entre_threads(self):
+        pasta = tempfile.mkdtemp(prefix="historico_")
+        self.addCleanup(shutil.rmtree, pasta, ignore_errors=True)
+        barreira = threading.Barrier(8)
+        abertos = []
+
+        def abrir():
+            barreira.wait()
+            abertos.append(historico_local.abrir("X", pasta))
+        threads = [threading.Thread(target=abrir) for _ in range(8)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        self.assertEqual(len({id(h) for h in abertos}), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+ClientePremios contra um servidor HTTP local (ThreadingHTTPServer) no formato
+da API pública: busca paralela, valor vencido servido durante a renovação,
+TTL curto para erros e backoff em 503/429.
+"""
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from infra.premios import SLUGS, ClientePremios
+
+
+class ApiLocal:
+    """GET /<slug> -> {"valorEstimadoProximoConcurso": valor}; status, valor e atraso mudam durante o teste."""
+
+    def __init__(self):
+        self.status = 200
+        self.valor = 1_000_000
+        self.atraso = 0.0
+        self.chamadas = []
+        self._lock = threading.Lock()
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with api._lock:
+                    api.chamadas.append(self.path.strip("/"))
+                    status, valor, atraso = api.status, api.valor, api.atraso
+                if atraso: time.sleep(atraso)
+                dados = json.dumps({"valorEstimadoProximoConcurso": valor} if status == 200 else {}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(dados)))
+                self.end_headers()
+                self.wfile.write(dados)
+
+            def log_message(self, *args):
+                pass
+
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.servidor.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.servidor.server_address[1]}"
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+
+    def total(self):
+        with self._lock: return len(self.chamadas)
+
+    def fechar(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+
+
+class TestClientePremios(unittest.TestCase):
+    def setUp(self):
+        self.api = ApiLocal()
+        self.clientes = []
+
+    def tearDown(self):
+        for c in self.clientes: c.fechar()
+        self.api.fechar()
+
+    def cliente(self, **kwargs):
+        kwargs.setdefault("timeout", 2.0)
+        c = ClientePremios(self.api.url, **kwargs)
+        self.clientes.append(c)
+        return c
+
+    def test_busca_todas_em_paralelo(self):
+        self.api.atraso = 0.3
+        c = self.cliente(max_workers=len(SLUGS))
+        inicio = time.perf_counter()
+        valores = c.obter_todos()
+        duracao = time.perf_counter() - inicio
+        self.assertEqual(valores, {nome: 1_000_000 for nome in SLUGS})
+        self.assertEqual(sorted(self.api.chamadas), sorted(SLUGS.values()))
+        # Em série seriam 7 × 0,3 s
+        self.assertLess(duracao, 0.3 * len(SLUGS) / 2)
+
+    def test_valor_em_cache_nao_chama_a_api(self):
+        c = self.cliente()
+        self.assertEqual(c.obter("Quina"), 1_000_000)
+        self.assertEqual(c.obter("Quina"), 1_000_000)
+        self.assertEqual(self.api.total(), 1)
+
+    def test_vencido_e_servido_enquanto_renova(self):
+        c = self.cliente(ttl=0.2)
+        self.assertEqual(c.obter("Mega Sena"), 1_000_000)
+        time.sleep(0.25)
+        self.api.valor, self.api.atraso = 2_000_000, 0.5
+        inicio = time.perf_counter()
+        self.assertEqual(c.obter("Mega Sena"), 1_000_000)  # antigo, sem esperar a API
+        self.assertLess(time.perf_counter() - inicio, 0.2)
+        time.sleep(0.8)
+        self.assertEqual(c.obter("Mega Sena"), 2_000_000)
+        self.assertEqual(self.api.total(), 2)
+
+    def test_erro_fica_em_cache_so_pelo_ttl_curto(self):
+        self.api.status = 503
+        c = self.cliente(ttl_erro=0.3)
+        self.assertIsNone(c.obter("Quina"))
+        self.assertIsNone(c.obter("Quina"))
+        self.assertEqual(self.api.total(), 1)  # dentro do TTL de erro, não insiste
+        self.assertIn("503", c.estado()["Quina"]["erro"])
+        self.api.status = 200
+        time.sleep(0.35)
+        self.assertEqual(c.obter("Quina"), 1_000_000)
+        self.assertEqual(self.api.total(), 2)
+        self.assertEqual(c.estado()["Quina"]["falhas"], 0)
+
+    def test_backoff_dobra_ate_o_teto_em_503_e_429(self):
+        c = self.cliente(ttl=0.05, ttl_erro=0.1, backoff_max=0.3)
+        self.assertEqual(c.obter("Lotomania"), 1_000_000)
+        espera_anterior = 0.05
+        for falhas, (status, esperada) in enumerate(((503, 0.1), (429, 0.2), (503, 0.3), (429, 0.3)), 1):
+            self.api.status = status
+            time.sleep(espera_anterior + 0.03)
+            # O último valor bom continua sendo servido durante as falhas
+            self.assertEqual(c.obter("Lotomania"), 1_000_000)
+            limite = time.monotonic() + 2
+            while c.estado()["Lotomania"]["falhas"] < falhas and time.monotonic() < limite: time.sleep(0.01)
+            e = c.estado()["Lotomania"]
+            self.assertEqual(e["falhas"], falhas)
+            self.assertIn(str(status), e["erro"])
+            self.assertAlmostEqual(e["expira_em"], esperada, delta=0.06)
+            espera_anterior = esperada
+        self.assertEqual(self.api.total(), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Índice combinatório: rank <-> jogo nos dois sentidos e IndiceJogos com chave int64 (exato) ou bitmask."""
+import unittest
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from motores.ranking import IndiceJogos, cabe_em_int64, desranquear, ranquear, validos
+
+
+class TestRank(unittest.TestCase):
+    def test_bijecao_num_universo_pequeno(self):
+        todos = np.array(list(combinations(range(1, 11), 4)), dtype=np.uint8)
+        ranks = ranquear(todos, 10)
+        self.assertEqual(sorted(ranks.tolist()), list(range(comb(10, 4))))
+        np.testing.assert_array_equal(desranquear(ranks, 10, 4), todos)
+
+    def test_ida_e_volta_nas_loterias(self):
+        rng = np.random.default_rng(0)
+        for n, k in [(60, 6), (25, 15), (80, 5), (31, 7), (80, 10)]:
+            with self.subTest(n=n, k=k):
+                ranks = rng.integers(0, comb(n, k), 2000)
+                jogos = desranquear(ranks, n, k)
+                self.assertTrue((np.diff(jogos.astype(int), axis=1) > 0).all())
+                np.testing.assert_array_equal(ranquear(jogos, n), ranks)
+
+    def test_ordem_das_dezenas_nao_importa(self):
+        self.assertEqual(ranquear([[5, 1, 60, 33, 2, 17]], 60)[0], ranquear([[1, 2, 5, 17, 33, 60]], 60)[0])
+
+    def test_limite_do_int64(self):
+        self.assertTrue(cabe_em_int64(60, 6))
+        self.assertFalse(cabe_em_int64(100, 50))
+
+    def test_validos(self):
+        jogos = np.array([[1, 2, 3], [1, 1, 3], [0, 2, 3], [4, 2, 61]], dtype=np.uint8)
+        self.assertEqual(validos(jogos, 60).tolist(), [True, False, False, False])
+
+
+class TestIndice(unittest.TestCase):
+    def conferir(self, n, k, exato):
+        rng = np.random.default_rng(n)
+        jogos = np.sort(np.argsort(rng.random((300, n)), axis=1)[:, :k] + 1, axis=1).astype(np.uint8)
+        indice = IndiceJogos(n, k)
+        self.assertEqual(indice.exato, exato)
+        self.assertEqual(indice.adicionar(jogos[:200]), 200)
+        self.assertEqual(indice.adicionar(jogos[150:250]), 50)  # 150..199 já estavam
+        self.assertEqual(len(indice), 250)
+        # Fora de ordem: mesmo jogo
+        embaralhados = rng.permuted(jogos, axis=1)
+        self.assertEqual(indice.contem(embaralhados).tolist(), [True] * 250 + [False] * 50)
+        self.assertIn(jogos[0], indice)
+        self.assertNotIn(jogos[299], indice)
+
+    def test_exato_mega_sena(self):
+        self.conferir(60, 6, True)
+
+    def test_bitmask_lotomania(self):
+        self.conferir(100, 50, False)
+
+    def test_linhas_invalidas_ignoradas(self):
+        indice = IndiceJogos(60, 6, np.array([[1, 2, 3, 4, 5, 6]]))
+        self.assertEqual(indice.adicionar(np.array([[1, 1, 2, 3, 4, 5], [0, 1, 2, 3, 4, 5]])), 0)
+        self.assertEqual(indice.adicionar(np.array([[1, 2, 3, 4, 5]])), 0)  # outro tamanho
+        self.assertEqual(indice.contem(np.array([[1, 1, 2, 3, 4, 5], [6, 5, 4, 3, 2, 1]])).tolist(), [False, True])
+        self.assertEqual(IndiceJogos(60, 6).contem(np.array([[1, 2, 3, 4, 5, 6]])).tolist(), [False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""Snapshots: troca atômica do ATUAL, leitores com a versão antiga e idade/conferência."""
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from ferramentas.bench import historico_sintetico
+from infra import snapshots
+from infra.configuracao import CarregadorConfig
+from motores.registro import classe_motor
+
+NOME = "Mega Sena"
+
+
+class TestSnapshots(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.cfg = CarregadorConfig(caminho_cache=None).atual().loterias[NOME]
+        cls.classe = classe_motor(NOME, cls.cfg)
+        cls.matriz = historico_sintetico(cls.cfg, 50, 6, seed=2)
+
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp(prefix="snapshots_")
+        self.addCleanup(shutil.rmtree, self.pasta, ignore_errors=True)
+        self.leitor = snapshots.LeitorSnapshots(self.pasta)
+
+    def motor(self, n):
+        """Motor com os n sorteios mais antigos (concurso mais recente = n)."""
+        return self.classe.de_matriz(self.matriz[-n:], self.cfg, np.arange(n, 0, -1))
+
+    def publicar(self, n, **kw):
+        return snapshots.publicar(NOME, self.motor(n), premio=n * 1000.0, html=f"<b>{n}</b>", pasta=self.pasta, **kw)
+
+    def test_publicar_e_ler(self):
+        self.assertIsNone(self.leitor.atual(NOME))
+        snap = self.publicar(40)
+        lido = self.leitor.atual(NOME)
+        self.assertEqual((lido.versao, lido.concurso, lido.premio, lido.html), (snap.versao, 40, 40000.0, "<b>40</b>"))
+        self.assertIs(self.leitor.atual(NOME), lido)  # sem versão nova, nada é recarregado
+        motor = lido.motor(self.classe, self.cfg)
+        ref = self.motor(40)
+        np.testing.assert_array_equal(motor.matriz, ref.matriz)
+        self.assertEqual(motor.get_stats(), ref.get_stats())
+        self.assertEqual(lido.stats, ref.get_stats())
+
+    def test_troca_de_ponteiro_preserva_quem_ja_leu(self):
+        antigo = self.publicar(40)
+        visto = self.leitor.atual(NOME)
+        copia = np.array(visto.matriz)
+        for n in (41, 42, 43, 44, 45):
+            self.publicar(n, manter=1)
+        novo = self.leitor.atual(NOME)
+        self.assertEqual(novo.concurso, 45)
+        # A versão velha foi apagada do disco, mas o mmap de quem a pegou continua legível
+        self.assertFalse(os.path.exists(antigo.caminho))
+        np.testing.assert_array_equal(np.array(visto.matriz), copia)
+        versoes = [v for v in os.listdir(snapshots.pasta_loteria(NOME, self.pasta)) if v not in snapshots.MARCADORES]
+        self.assertEqual(len(versoes), 2)  # a em vigor + manter=1
+
+    def test_publicacao_pela_metade_nao_aparece(self):
+        self.publicar(40)
+        base = snapshots.pasta_loteria(NOME, self.pasta)
+        # Job caiu no meio: pasta temporária e ATUAL.tmp ficaram para trás
+        os.makedirs(os.path.join(base, ".000041-x.tmp"))
+        with open(os.path.join(base, "ATUAL.tmp"), "w") as f: f.write("000041-x")
+        self.assertEqual(self.leitor.atual(NOME).concurso, 40)
+        # ATUAL apontando para uma versão que não abre: o leitor fica com a anterior
+        with open(os.path.join(base, "ATUAL.tmp"), "w") as f: f.write("000099-inexistente")
+        os.replace(os.path.join(base, "ATUAL.tmp"), os.path.join(base, "ATUAL"))
+        self.assertEqual(self.leitor.atual(NOME).concurso, 40)
+        self.assertIsNone(snapshots.LeitorSnapshots(self.pasta).atual(NOME))
+
+    def test_mesmo_segundo_nao_colide(self):
+        a = self.publicar(40)
+        b = self.publicar(40)
+        self.assertNotEqual(a.versao, b.versao)
+        self.assertEqual(self.leitor.atual(NOME).versao, b.versao)
+
+    def test_idade_e_conferencia(self):
+        self.publicar(40)
+        snap = self.leitor.atual(NOME, max_idade=60)
+        self.assertIsNotNone(snap)
+        snap.criado_em -= 3600  # job parado há uma hora
+        self.assertIsNone(self.leitor.atual(NOME, max_idade=60))
+        snapshots.confirmar(NOME, self.pasta)  # o precomputar conferiu e não havia concurso novo
+        self.assertIs(self.leitor.atual(NOME, max_idade=60), snap)
+
+
+if __name__ == "__main__":
+    unittest.main()